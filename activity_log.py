@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Activity journal
+Records dashboard activity in an append-only journal (Logs/activity.jsonl) and renders
+the "## Recent Activity" section of Dashboard.md from the newest entries only.
+
+Skills and the orchestrator log in-process through log_activity() / log_many():
+
+    from activity_log import log_many
+    log_many(["Created plan for file a", "Created plan for file b"])
+
+Retention is set in Dashboard.md's frontmatter (activity_keep: N entries, activity_keep_days: D).
+Once the journal passes ROLLOVER_BYTES, entries no longer shown are rolled into
+Logs/Activity_YYYY-MM.md, so both the dashboard and the journal stay a bounded size.
+
+Writers take the vault's "dashboard" lock, so processes sharing a vault never interleave
+a render or a rollover.
+
+Each process keeps one journal per vault, so fsync batching (every 32 events or once a
+second) spans log_many() calls; events still unsynced when the process exits are synced
+then. A process crash loses nothing either way, since every write is flushed to the OS.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from atomic_io import atomic_write_text
+from leases import vault_lock
+
+
+RECENT_ACTIVITY_HEADER = "## Recent Activity"
+JOURNAL_RELATIVE_PATH = Path("Logs") / "activity.jsonl"
+DEFAULT_RECENT_LIMIT = 50
+ROLLOVER_BYTES = 256 * 1024
+MONTHLY_LOG_FORMAT = "Activity_%Y-%m.md"
+
+# Dashboard.md frontmatter keys for the retention policy
+KEEP_ENTRIES_KEY = "activity_keep"
+KEEP_DAYS_KEY = "activity_keep_days"
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+DISPLAY_FORMAT = "%Y-%m-%d %H:%M"
+ENTRY_PREFIX = "   - ["
+
+
+class ActivityJournal:
+    """Append-only JSON-lines journal of activity events with batched fsync."""
+
+    def __init__(self, journal_path, fsync_every=32, fsync_interval=1.0, rollover_bytes=ROLLOVER_BYTES):
+        self.path = Path(journal_path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.rollover_bytes = rollover_bytes
+        self._fh = None
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _open(self):
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, 'a', encoding='utf-8')
+        return self._fh
+
+    def append(self, message, timestamp=None):
+        """Append one event. Cost is independent of journal and dashboard size."""
+        timestamp = timestamp or datetime.now()
+        record = {"ts": timestamp.strftime(TIMESTAMP_FORMAT), "message": message}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+
+        with self._lock:
+            self._write_locked(line, 1)
+
+        return record
+
+    def append_many(self, messages, timestamp=None):
+        """Append a batch of events with a single write, fsynced on the same schedule as append()."""
+        timestamp = timestamp or datetime.now()
+        stamp = timestamp.strftime(TIMESTAMP_FORMAT)
+        records = [{"ts": stamp, "message": message} for message in messages]
+        if not records:
+            return records
+        payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+        with self._lock:
+            self._write_locked(payload, len(records))
+
+        return records
+
+    def _write_locked(self, payload, count):
+        fh = self._open()
+        fh.write(payload)
+        fh.flush()
+        self._unsynced += count
+        if (self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self._sync_locked()
+
+    def _sync_locked(self):
+        if self._unsynced:
+            # fsync covers the whole file, including events written through an earlier handle
+            os.fsync(self._open().fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @property
+    def unsynced(self):
+        """Events written but not yet fsynced."""
+        with self._lock:
+            return self._unsynced
+
+    def sync(self):
+        """Force any buffered events to disk."""
+        with self._lock:
+            self._sync_locked()
+
+    def close(self, sync=True):
+        """Close the file. With sync=False, unsynced events count toward the next fsync instead."""
+        with self._lock:
+            if sync:
+                self._sync_locked()
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def tail(self, count, block_size=8192):
+        """Return the newest `count` events, oldest first, reading backwards from the end."""
+        if count <= 0 or not self.path.exists():
+            return []
+
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b""
+            while position > 0 and data.count(b"\n") <= count:
+                read_size = min(block_size, position)
+                position -= read_size
+                f.seek(position)
+                data = f.read(read_size) + data
+
+        lines = [line for line in data.split(b"\n") if line.strip()]
+        entries = []
+        for raw in lines[-count:]:
+            try:
+                entries.append(json.loads(raw.decode('utf-8')))
+            except (ValueError, UnicodeDecodeError):
+                # Partially written line at the start of the block or a torn write
+                continue
+        return entries
+
+    def needs_rollover(self):
+        """True once the journal has grown past rollover_bytes; a stat() call."""
+        try:
+            return self.path.stat().st_size > self.rollover_bytes
+        except FileNotFoundError:
+            return False
+
+    def rollover(self, keep, keep_days=None, now=None):
+        """
+        Move every entry except the newest `keep` (and, with keep_days, those newer than
+        that many days) into Logs/Activity_YYYY-MM.md, then shrink the journal to the rest.
+
+        Runs only when the journal passes rollover_bytes, so its cost is spread over
+        thousands of appends. Returns the number of entries rolled over.
+        """
+        with self._lock:
+            self._sync_locked()
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if not self.path.exists():
+                return 0
+
+            entries = []
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        # Torn write; nothing to roll over
+                        continue
+
+            kept = select_recent(entries, keep, keep_days, now)
+            rolled = entries[:len(entries) - len(kept)]
+            if not rolled:
+                return 0
+
+            by_month = {}
+            for entry in rolled:
+                by_month.setdefault(_entry_month(entry), []).append(format_entry(entry))
+            for month, lines in by_month.items():
+                _append_monthly_log(self.path.parent / month.strftime(MONTHLY_LOG_FORMAT), month, lines)
+
+            atomic_write_text(self.path, "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in kept))
+            return len(rolled)
+
+    def import_dashboard(self, dashboard_path):
+        """Seed an empty journal with the entries already listed in Dashboard.md."""
+        dashboard_path = Path(dashboard_path)
+        if not dashboard_path.exists():
+            return 0
+
+        content = dashboard_path.read_text(encoding='utf-8')
+        start, end = _find_activity_section(content.split('\n'))
+        if start is None:
+            return 0
+
+        entries = []
+        for line in content.split('\n')[start + 1:end]:
+            parsed = _parse_entry_line(line)
+            if parsed:
+                entries.append(parsed)
+
+        # Older dashboards mix newest-first and newest-last inserts
+        entries.sort(key=lambda item: item[0])
+        for timestamp, message in entries:
+            self.append(message, timestamp)
+        self.sync()
+        return len(entries)
+
+
+def _parse_entry_line(line):
+    """Parse '   - [YYYY-MM-DD HH:MM] message' into (datetime, message)."""
+    stripped = line.strip()
+    if not stripped.startswith("- [") or "]" not in stripped:
+        return None
+    stamp, message = stripped[3:].split("]", 1)
+    try:
+        timestamp = datetime.strptime(stamp.strip(), DISPLAY_FORMAT)
+    except ValueError:
+        return None
+    return timestamp, message.strip()
+
+
+def _entry_time(entry):
+    try:
+        return datetime.strptime(entry["ts"], TIMESTAMP_FORMAT)
+    except (KeyError, ValueError):
+        return None
+
+
+def _entry_month(entry):
+    timestamp = _entry_time(entry) or datetime.now()
+    return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _append_monthly_log(path, month, lines):
+    """Append rendered entries to a monthly activity log, creating it with a heading."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = "" if path.exists() else f"# Activity {month:%Y-%m}\n\n"
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(header + "".join(line + "\n" for line in lines))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def select_recent(entries, keep, keep_days=None, now=None):
+    """The newest `keep` entries, dropping any older than keep_days. Oldest first."""
+    recent = entries[-keep:] if keep > 0 else []
+    if keep_days is not None:
+        cutoff = (now or datetime.now()) - timedelta(days=keep_days)
+        # Journal order is append order, so everything after the first recent entry stays
+        for i, entry in enumerate(recent):
+            timestamp = _entry_time(entry)
+            if timestamp is None or timestamp >= cutoff:
+                return recent[i:]
+        return []
+    return recent
+
+
+def retention_policy(lines, limit=DEFAULT_RECENT_LIMIT):
+    """
+    Read (keep, keep_days) from Dashboard.md's frontmatter lines, falling back to `limit`
+    entries and no age limit. `keep` never exceeds `limit` so the dashboard stays bounded.
+    """
+    keep, keep_days = limit, None
+    if not lines or lines[0].strip() != "---":
+        return keep, keep_days
+
+    for line in lines[1:]:
+        if line.strip() == "---":
+            break
+        key, _, value = line.partition(":")
+        try:
+            if key.strip() == KEEP_ENTRIES_KEY:
+                keep = max(0, min(int(value.strip()), limit))
+            elif key.strip() == KEEP_DAYS_KEY:
+                keep_days = float(value.strip())
+        except ValueError:
+            continue
+    return keep, keep_days
+
+
+def _find_activity_section(lines):
+    """Return (header_index, end_index) for the Recent Activity section, or (None, None)."""
+    for i, line in enumerate(lines):
+        if line.strip() == RECENT_ACTIVITY_HEADER:
+            end = i + 1
+            while end < len(lines) and not lines[end].startswith("## "):
+                end += 1
+            return i, end
+    return None, None
+
+
+def format_entry(entry):
+    """Render a journal record as a dashboard list item."""
+    try:
+        stamp = datetime.strptime(entry["ts"], TIMESTAMP_FORMAT).strftime(DISPLAY_FORMAT)
+    except (KeyError, ValueError):
+        stamp = entry.get("ts", "")
+    return f"{ENTRY_PREFIX}{stamp}] {entry.get('message', '')}"
+
+
+def materialize_dashboard(dashboard_path, journal, limit=DEFAULT_RECENT_LIMIT):
+    """
+    Rewrite the Recent Activity section of Dashboard.md from the journal's newest entries,
+    applying the dashboard's retention policy, and roll the journal over when it is due.
+
+    Returns False if the dashboard has no Recent Activity section.
+    """
+    dashboard_path = Path(dashboard_path)
+    lines = dashboard_path.read_text(encoding='utf-8').split('\n')
+
+    start, end = _find_activity_section(lines)
+    if start is None:
+        return False
+
+    keep, keep_days = retention_policy(lines, limit)
+    now = datetime.now()
+    rendered = [format_entry(entry) for entry in select_recent(journal.tail(keep), keep, keep_days, now)]
+
+    # Keep a blank separator before the next section if there was one
+    trailing = []
+    if end < len(lines):
+        trailing = [""]
+
+    new_lines = lines[:start + 1] + rendered + trailing + lines[end:]
+    atomic_write_text(dashboard_path, '\n'.join(new_lines))
+
+    if journal.needs_rollover():
+        journal.rollover(keep, keep_days, now)
+    return True
+
+
+# Vault root -> this process's journal for it
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def open_journal(project_root):
+    """This process's journal for the vault, seeded from Dashboard.md on first use."""
+    project_root = Path(project_root).absolute()
+    with _journals_lock:
+        journal = _journals.get(project_root)
+        if journal is None:
+            journal = _journals[project_root] = ActivityJournal(project_root / JOURNAL_RELATIVE_PATH)
+    if not journal.path.exists():
+        journal.import_dashboard(project_root / "Dashboard.md")
+    return journal
+
+
+@atexit.register
+def _sync_journals():
+    """fsync the events batching left unsynced before the process exits."""
+    with _journals_lock:
+        journals = list(_journals.items())
+    for project_root, journal in journals:
+        if not journal.unsynced:
+            continue
+        try:
+            with vault_lock(project_root, "dashboard", timeout=5.0):
+                journal.close()
+        except OSError:
+            # Best effort: the events are already in the OS's cache
+            pass
+
+
+def log_many(messages, project_root=None, limit=DEFAULT_RECENT_LIMIT):
+    """
+    Record a batch of activity events and render Dashboard.md once.
+
+    Args:
+        messages (iterable): Activity descriptions, oldest first
+        project_root (Path): Vault root, defaults to the current directory
+        limit (int): Number of newest entries shown under ## Recent Activity
+
+    Returns False if Dashboard.md is missing or has no Recent Activity section;
+    the events are still kept in the journal.
+    """
+    project_root = Path(project_root) if project_root else Path.cwd()
+    dashboard_path = project_root / "Dashboard.md"
+
+    messages = list(messages)
+    if not messages:
+        return True
+
+    with vault_lock(project_root, "dashboard"):
+        journal = open_journal(project_root)
+        try:
+            journal.append_many(messages)
+            if not dashboard_path.exists():
+                return False
+            return materialize_dashboard(dashboard_path, journal, limit)
+        finally:
+            # Another process may roll the journal over once the lock is released
+            journal.close(sync=False)
+
+
+def log_activity(message, project_root=None, limit=DEFAULT_RECENT_LIMIT):
+    """Record a single activity event and render Dashboard.md."""
+    return log_many([message], project_root, limit)
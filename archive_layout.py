@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Archive layout
+Optional date-sharded layout for Archive/ and Done/ (e.g. Archive/2026/10/18/...) with a
+per-shard manifest listing each entry and its metadata, so history can be listed and
+searched from manifests instead of walking huge directories.
+
+Sharding is switched on per folder by a `.sharded` marker file:
+
+    python archive_layout.py enable Archive Done
+    python archive_layout.py list Archive --search invoice
+    python archive_layout.py compact Archive
+"""
+
+import argparse
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from atomic_io import atomic_write_text
+
+
+MARKER_NAME = ".sharded"
+MANIFEST_NAME = "_manifest.jsonl"
+
+
+class ArchiveLayout:
+    """Places files into a flat or date-sharded folder and keeps shard manifests."""
+
+    def __init__(self, base_dir, sharded=None):
+        self.base = Path(base_dir)
+        self.sharded = (self.base / MARKER_NAME).exists() if sharded is None else sharded
+        self._lock = threading.Lock()
+
+    def enable_sharding(self):
+        """Switch the folder to the sharded layout; existing flat files stay where they are."""
+        self.base.mkdir(parents=True, exist_ok=True)
+        (self.base / MARKER_NAME).touch()
+        self.sharded = True
+
+    def shard_dir(self, when=None):
+        when = when or datetime.now()
+        return self.base / f"{when:%Y}" / f"{when:%m}" / f"{when:%d}"
+
+    def destination(self, filename, when=None):
+        """Where `filename` should go, creating the shard directory if needed."""
+        directory = self.shard_dir(when) if self.sharded else self.base
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / filename
+
+    def place(self, source_path, filename=None, metadata=None, when=None):
+        """Move `source_path` into the layout and record it in the shard manifest."""
+        source_path = Path(source_path)
+        dest_path = self.destination(filename or source_path.name, when)
+        shutil.move(str(source_path), str(dest_path))
+        self.record(dest_path, metadata)
+        return dest_path
+
+    def record(self, dest_path, metadata=None, removed=False):
+        """Append an entry (or a removal tombstone) to the manifest of the file's shard."""
+        if not self.sharded:
+            return
+        dest_path = Path(dest_path)
+        entry = {
+            "name": dest_path.name,
+            "path": dest_path.relative_to(self.base).as_posix(),
+            "recorded_at": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        if removed:
+            entry["removed"] = True
+        if metadata:
+            entry["metadata"] = metadata
+
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(dest_path.parent / MANIFEST_NAME, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+    def manifests(self):
+        """Shard manifests, oldest shard first."""
+        return sorted(self.base.glob(f"*/*/*/{MANIFEST_NAME}"))
+
+    @staticmethod
+    def _read_manifest(manifest_path):
+        entries = {}
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("removed"):
+                    entries.pop(entry["path"], None)
+                else:
+                    entries[entry["path"]] = entry
+        return entries
+
+    def iter_entries(self):
+        """Yield every live entry. Sharded folders are read from manifests only."""
+        if self.sharded:
+            for manifest_path in self.manifests():
+                for entry in self._read_manifest(manifest_path).values():
+                    yield entry
+        # Flat files (the whole folder when not sharded, pre-sharding files otherwise)
+        if self.base.exists():
+            with os.scandir(self.base) as entries:
+                for dir_entry in entries:
+                    if dir_entry.is_file() and dir_entry.name.endswith('.md'):
+                        yield {"name": dir_entry.name, "path": dir_entry.name}
+
+    def search(self, text):
+        """Entries whose name or metadata contains `text` (case-insensitive)."""
+        text = text.lower()
+        for entry in self.iter_entries():
+            haystack = entry["name"] + " " + json.dumps(entry.get("metadata", {}), ensure_ascii=False)
+            if text in haystack.lower():
+                yield entry
+
+    def compact(self):
+        """
+        Rewrite each manifest to one line per live entry, dropping tombstones, superseded
+        lines and entries whose file is gone. Returns the number of lines removed.
+        """
+        removed = 0
+        for manifest_path in self.manifests():
+            with self._lock:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    original_lines = sum(1 for _ in f)
+                live = [entry for entry in self._read_manifest(manifest_path).values()
+                        if (self.base / entry["path"]).exists()]
+                atomic_write_text(manifest_path,
+                                  "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in live))
+            removed += original_lines - len(live)
+        return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the Archive/ and Done/ layout")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enable = subparsers.add_parser("enable", help="switch folders to the date-sharded layout")
+    enable.add_argument("folders", nargs="+")
+
+    listing = subparsers.add_parser("list", help="list (or search) entries from the manifests")
+    listing.add_argument("folder")
+    listing.add_argument("--search", help="only entries whose name or metadata contains this text")
+
+    compact = subparsers.add_parser("compact", help="compact the shard manifests")
+    compact.add_argument("folders", nargs="+")
+
+    args = parser.parse_args()
+    project_root = Path.cwd()
+
+    if args.command == "enable":
+        for folder in args.folders:
+            ArchiveLayout(project_root / folder).enable_sharding()
+            print(f"Sharded layout enabled for {folder}/")
+    elif args.command == "list":
+        layout = ArchiveLayout(project_root / args.folder)
+        entries = layout.search(args.search) if args.search else layout.iter_entries()
+        count = 0
+        for entry in entries:
+            print(f"- {args.folder}/{entry['path']}")
+            count += 1
+        print(f"{count} entr{'y' if count == 1 else 'ies'}")
+    elif args.command == "compact":
+        for folder in args.folders:
+            removed = ArchiveLayout(project_root / folder).compact()
+            print(f"Compacted {folder}/ manifests: {removed} line(s) removed")
+
+
+if __name__ == "__main__":
+    main()
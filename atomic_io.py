@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Atomic file writes
+Vault files are written to a hidden temp file in the same folder, flushed to disk, then
+swapped in with os.replace(). Obsidian, the watcher and the other skills see either the
+old file or the new one, never a half-written one, even if the writer crashes.
+
+Temp names start with '.' and end in '.tmp', which the watcher and the task globs ignore.
+"""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+
+
+def temp_path_for(path):
+    """Hidden sibling temp name, unique per process and thread writing it."""
+    path = Path(path)
+    return path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+
+def _replace(tmp_path, path):
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_bytes(path, data, fsync=True):
+    """Replace `path` with `data` in one step."""
+    path = Path(path)
+    tmp_path = temp_path_for(path)
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+    _replace(tmp_path, path)
+
+
+def atomic_write_text(path, text, encoding='utf-8', fsync=True):
+    """Replace `path` with `text` in one step."""
+    atomic_write_bytes(path, text.encode(encoding), fsync)
+
+
+def atomic_copy(source_path, dest_path, fsync=True):
+    """Copy `source_path` (data and timestamps) over `dest_path` in one step."""
+    dest_path = Path(dest_path)
+    tmp_path = temp_path_for(dest_path)
+    try:
+        shutil.copy2(str(source_path), str(tmp_path))
+        if fsync:
+            with open(tmp_path, 'rb+') as f:
+                os.fsync(f.fileno())
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+    _replace(tmp_path, dest_path)
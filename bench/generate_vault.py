@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Synthetic vault generator
+Builds a throwaway vault with a chosen number of Inbox drops, Needs_Action tasks, Plans,
+Archive entries and Dashboard activity entries, in the same formats the watcher and the
+skills write. The same seed always produces the same vault.
+
+    python bench/generate_vault.py /tmp/vault --scale 1000
+    python bench/generate_vault.py /tmp/vault --inbox 50 --archive 100000
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from activity_log import JOURNAL_RELATIVE_PATH, TIMESTAMP_FORMAT, format_entry
+
+
+VAULT_FOLDERS = ("Inbox", "Needs_Action", "Plans", "Done", "Archive", "Logs")
+KINDS = ("inbox", "needs_action", "plans", "archive", "dashboard")
+
+# Every synthetic item is stamped relative to this, so output doesn't depend on the clock
+EPOCH = datetime(2026, 1, 1, 9, 0, 0)
+
+WORDS = ("invoice", "report", "contract", "receipt", "notes", "scan", "draft", "summary",
+         "budget", "minutes", "proposal", "photo", "statement", "agenda", "memo")
+EXTENSIONS = (".pdf", ".txt", ".docx", ".jpg", ".csv", ".png")
+
+
+def _item_name(rng, i):
+    return f"{rng.choice(WORDS)}_{i:07d}{rng.choice(EXTENSIONS)}"
+
+
+def _payload(rng, payload_bytes):
+    # Distinct bytes per file so dedup doesn't collapse the drops
+    header = f"synthetic {rng.getrandbits(64):016x}\n".encode('ascii')
+    return header + b"x" * max(0, payload_bytes - len(header))
+
+
+def _task_metadata(original_name, size, detected):
+    return f"""---
+type: file_drop
+original_name: {original_name}
+size_bytes: {size}
+detected_at: {detected.isoformat()}Z
+ingest_mode: copy
+status: pending
+---
+## Dropped File
+Original: {original_name}
+Copied to: FILE_{original_name}
+
+New item ready for processing.
+"""
+
+
+def _plan(task_name, created, status, checked):
+    box = "x" if checked else " "
+    return f"""---
+task_origin: Needs_Action/{task_name}
+created: {created.strftime("%Y-%m-%dT%H:%M:%SZ")}
+status: {status}
+---
+
+# Plan for {task_name}
+
+- [{box}] Review the content of the dropped file
+- [ ] Decide required actions (e.g., archive, escalate, summarize)
+- [ ] Execute basic next step if safe (no external actions in Bronze)
+- [ ] Move original task file to Done/ when finished
+- [ ] Log activity to Dashboard.md
+"""
+
+
+def _archived_plan(task_name, created, completed):
+    return f"""---
+task_origin: Needs_Action/{task_name}
+created: {created.strftime("%Y-%m-%dT%H:%M:%SZ")}
+status: completed
+completed: {completed.strftime("%Y-%m-%dT%H:%M:%SZ")}
+---
+
+# Plan for {task_name}
+
+- [x] Review the content of the dropped file
+- [x] Move original task file to Done/ when finished
+"""
+
+
+def generate_vault(root, inbox=0, needs_action=0, plans=0, archive=0, dashboard=0,
+                   payload_bytes=256, seed=0, clean=True):
+    """
+    Create a synthetic vault at `root`.
+
+    Args:
+        root (Path): Vault directory, wiped first when `clean` is set
+        inbox (int): Files waiting in Inbox/ for the watcher
+        needs_action (int): file_drop tasks (payload + .md metadata) in Needs_Action/
+        plans (int): Pending plans in Plans/
+        archive (int): Closed plans in Archive/, each with its finished task in Done/
+        dashboard (int): Entries in the activity journal behind Dashboard.md
+        payload_bytes (int): Size of each dropped payload file
+        seed (int): Random seed; the same arguments always build the same vault
+
+    Returns a dict of the counts written.
+    """
+    root = Path(root)
+    rng = random.Random(seed)
+
+    if clean and root.exists():
+        shutil.rmtree(root)
+    for folder in VAULT_FOLDERS:
+        (root / folder).mkdir(parents=True, exist_ok=True)
+
+    for i in range(inbox):
+        (root / "Inbox" / _item_name(rng, i)).write_bytes(_payload(rng, payload_bytes))
+
+    for i in range(needs_action):
+        original_name = _item_name(rng, i)
+        payload = _payload(rng, payload_bytes)
+        (root / "Needs_Action" / f"FILE_{original_name}").write_bytes(payload)
+        (root / "Needs_Action" / f"FILE_{original_name}.md").write_text(
+            _task_metadata(original_name, len(payload), EPOCH + timedelta(seconds=i)), encoding='utf-8')
+
+    for i in range(plans):
+        task_name = f"FILE_{_item_name(rng, i)}.md"
+        status = rng.choice(("pending", "pending", "in_progress"))
+        (root / "Plans" / f"Plan_{task_name[:-3]}.md").write_text(
+            _plan(task_name, EPOCH + timedelta(minutes=i), status, checked=rng.random() < 0.5),
+            encoding='utf-8')
+
+    for i in range(archive):
+        task_name = f"FILE_{_item_name(rng, i)}.md"
+        created = EPOCH - timedelta(days=30, minutes=i)
+        completed = created + timedelta(hours=1)
+        stamp = completed.strftime("%Y%m%d_%H%M%S")
+        (root / "Archive" / f"Plan_{task_name[:-3]}_completed_{stamp}.md").write_text(
+            _archived_plan(task_name, created, completed), encoding='utf-8')
+        (root / "Done" / task_name).write_text(
+            _task_metadata(task_name[5:-3], payload_bytes, created), encoding='utf-8')
+
+    _write_activity(root, dashboard, rng)
+
+    return {"inbox": inbox, "needs_action": needs_action, "plans": plans,
+            "archive": archive, "dashboard": dashboard}
+
+
+def _write_activity(root, count, rng, shown=50):
+    """Write `count` journal entries and a Dashboard.md listing the newest of them."""
+    journal_path = root / JOURNAL_RELATIVE_PATH
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+
+    recent = []
+    with open(journal_path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            stamp = (EPOCH - timedelta(minutes=count - i)).strftime(TIMESTAMP_FORMAT)
+            record = {"ts": stamp, "message": f"Created plan for file {rng.choice(WORDS)} {i} and moved to Done"}
+            f.write(json.dumps(record) + "\n")
+            recent.append(record)
+            if len(recent) > shown:
+                recent.pop(0)
+
+    lines = ["# AI Employee Dashboard", "", "## Recent Activity"]
+    lines.extend(format_entry(record) for record in recent)
+    lines.extend(["", "## Notes", "Synthetic benchmark vault.", ""])
+    (root / "Dashboard.md").write_text("\n".join(lines), encoding='utf-8')
+
+
+def counts_from_args(args):
+    """Resolve --scale plus per-kind overrides into generate_vault() keyword arguments."""
+    counts = {}
+    for kind in KINDS:
+        value = getattr(args, kind)
+        counts[kind] = args.scale if value is None else value
+    return counts
+
+
+def add_count_arguments(parser):
+    parser.add_argument("--scale", type=int, default=10, metavar="N",
+                        help="default count for every kind of item (default 10)")
+    for kind in KINDS:
+        parser.add_argument(f"--{kind.replace('_', '-')}", dest=kind, type=int, metavar="N",
+                            help=f"{kind.replace('_', ' ')} items (overrides --scale)")
+    parser.add_argument("--payload-bytes", type=int, default=256, metavar="N",
+                        help="size of each dropped file (default 256)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default 0)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic vault for benchmarks")
+    parser.add_argument("root", help="vault directory to create (wiped if it exists)")
+    add_count_arguments(parser)
+    args = parser.parse_args()
+
+    counts = generate_vault(args.root, payload_bytes=args.payload_bytes, seed=args.seed,
+                            **counts_from_args(args))
+    summary = ", ".join(f"{count} {kind}" for kind, count in counts.items())
+    print(f"✓ Generated vault at {args.root}: {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite
+Times the orchestrator, the skills and watcher ingestion against synthetic vaults of
+increasing size and writes the results as JSON, so runs can be compared for regressions.
+
+    python bench/run_benchmarks.py --sizes 10,1000,100000
+    python bench/run_benchmarks.py --only orchestrator_scan,watcher_burst --repeat 5
+    python bench/run_benchmarks.py --compare bench/results/bench_20261018_120000.json
+
+Every run gets a freshly generated vault (generation is not timed) and the skills'
+console output is discarded unless --verbose is given.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from generate_vault import generate_vault
+
+
+RESULTS_DIR = BENCH_DIR / "results"
+DEFAULT_SIZES = "10,100,1000"
+DASHBOARD_CALLS = 20
+
+
+@contextmanager
+def _in_vault(root):
+    """Skills resolve the vault from the working directory."""
+    previous = os.getcwd()
+    os.chdir(root)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _load_script(filename, module_name):
+    """Import a script (path relative to the repository root) whose filename isn't a valid module name."""
+    spec = importlib.util.spec_from_file_location(module_name, str(REPO_ROOT / filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Each benchmark: vault(size) -> generate_vault counts, prepare(root, args) runs untimed,
+# run(root, size, args) is timed and returns the number of items handled.
+
+def _bench_orchestrator_scan(root, size, args):
+    from orchestrator import BronzeTierOrchestrator
+    orchestrator = BronzeTierOrchestrator(root, workers=args.workers)
+    try:
+        return orchestrator.scan_and_process()
+    finally:
+        orchestrator.close()
+
+
+def _bench_create_simple_plan(root, size, args):
+    from create_simple_plan import create_simple_plan
+    with _in_vault(root):
+        create_simple_plan()
+    return size
+
+
+def _bench_list_pending_tasks(root, size, args):
+    from list_pending_tasks import list_pending_tasks
+    with _in_vault(root):
+        list_pending_tasks()
+    return size
+
+
+def _prepare_task_index(root, args):
+    from task_index import TaskIndex
+    index = TaskIndex.for_vault(root)
+    index.rebuild()
+    index.close()
+
+
+def _prepare_settled_task_index(root, args):
+    # Backdate every folder so the refresh isn't inside the racy window of a just-written vault
+    past = time.time() - 3600
+    for folder, _, _ in os.walk(root):
+        os.utime(folder, (past, past))
+    _prepare_task_index(root, args)
+
+
+def _bench_task_index_refresh(root, size, args):
+    from task_index import TaskIndex
+    index = TaskIndex.for_vault(root)
+    try:
+        index.refresh()
+    finally:
+        index.close()
+    return size
+
+
+def _bench_close_plan_and_archive(root, size, args):
+    from close_plan_and_archive import close_plan_and_archive
+    with _in_vault(root):
+        close_plan_and_archive()
+    return size
+
+
+def _bench_close_plans_batch(root, size, args):
+    from close_plan_and_archive import close_plans_batch
+    with _in_vault(root):
+        return close_plans_batch(workers=args.workers)
+
+
+def _dashboard_bench(filename, module_name):
+    def run(root, size, args):
+        module = _load_script(filename, module_name)
+        with _in_vault(root):
+            for i in range(DASHBOARD_CALLS):
+                module.update_dashboard_activity(f"Benchmark activity {i}")
+        return DASHBOARD_CALLS
+    return run
+
+
+def _bench_watcher_burst(root, size, args):
+    from filesystem_watcher import InboxFileHandler
+    from dedup_index import DedupIndex
+    from task_index import TaskIndex
+
+    dedup_index = DedupIndex.for_vault(root)
+    task_index = TaskIndex.for_vault(root)
+    handler = InboxFileHandler(root / "Inbox", root / "Needs_Action", workers=args.workers,
+                               dedup_index=dedup_index, task_index=task_index)
+    try:
+        # Hand every file straight to the ingestion queue, as if all writers had just closed them
+        for path in sorted((root / "Inbox").iterdir()):
+            handler.queue.put(path)
+    finally:
+        handler.stop()
+        handler.instrumentation.flush(root)
+        dedup_index.close()
+        task_index.close()
+    return handler.queue.completed
+
+
+BENCHMARKS = {
+    "orchestrator_scan": (lambda n: {"needs_action": n}, None, _bench_orchestrator_scan),
+    "create_simple_plan": (lambda n: {"needs_action": n}, None, _bench_create_simple_plan),
+    "list_pending_tasks_cold": (lambda n: {"needs_action": n, "plans": n}, None, _bench_list_pending_tasks),
+    "list_pending_tasks_warm": (lambda n: {"needs_action": n, "plans": n}, _prepare_task_index,
+                                _bench_list_pending_tasks),
+    "task_index_refresh_unchanged": (lambda n: {"archive": n}, _prepare_settled_task_index,
+                                     _bench_task_index_refresh),
+    "close_plan_and_archive": (lambda n: {"plans": n}, None, _bench_close_plan_and_archive),
+    "close_plans_batch": (lambda n: {"plans": n}, None, _bench_close_plans_batch),
+    "update_dashboard_activity": (lambda n: {"dashboard": n}, None,
+                                  _dashboard_bench("update_dashboard_activity_fixed.py", "bench_dashboard_fixed")),
+    "update_dashboard_activity_baseline": (lambda n: {"dashboard": n}, None,
+                                           _dashboard_bench("bench/baseline_update_dashboard_activity.py",
+                                                            "bench_dashboard_baseline")),
+    "watcher_burst": (lambda n: {"inbox": n}, None, _bench_watcher_burst),
+}
+
+
+def _read_new_metrics(root, offset):
+    """Stage timers the code under test flushed to Logs/metrics.jsonl during the run."""
+    metrics_path = Path(root) / "Logs" / "metrics.jsonl"
+    if not metrics_path.exists():
+        return {}
+    stages = {}
+    with open(metrics_path, 'r', encoding='utf-8') as f:
+        f.seek(offset)
+        for line in f:
+            try:
+                snapshot = json.loads(line)
+            except ValueError:
+                continue
+            stages[snapshot.get("component", "unknown")] = snapshot.get("timers", {})
+    return stages
+
+
+def run_benchmark(name, size, args, workdir):
+    """Generate, prepare and time one benchmark at one size, `args.repeat` times."""
+    vault_counts, prepare, run = BENCHMARKS[name]
+    counts = dict.fromkeys(("inbox", "needs_action", "plans", "archive", "dashboard"), args.background)
+    counts.update(vault_counts(size))
+
+    root = Path(workdir) / f"{name}_{size}"
+    timings = []
+    generate_seconds = []
+    items = 0
+    stages = {}
+
+    for attempt in range(args.repeat):
+        started = time.perf_counter()
+        generate_vault(root, payload_bytes=args.payload_bytes, seed=args.seed + attempt, **counts)
+        generate_seconds.append(time.perf_counter() - started)
+
+        if prepare is not None:
+            prepare(root, args)
+
+        metrics_path = root / "Logs" / "metrics.jsonl"
+        offset = metrics_path.stat().st_size if metrics_path.exists() else 0
+
+        output = sys.stdout if args.verbose else open(os.devnull, 'w', encoding='utf-8')
+        try:
+            with redirect_stdout(output):
+                started = time.perf_counter()
+                items = run(root, size, args)
+                timings.append(time.perf_counter() - started)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+        stages = _read_new_metrics(root, offset)
+
+    if not args.keep:
+        shutil.rmtree(root, ignore_errors=True)
+
+    best = min(timings)
+    return {
+        "benchmark": name,
+        "size": size,
+        "vault": counts,
+        "items": items,
+        "repeat": args.repeat,
+        "seconds": [round(seconds, 6) for seconds in timings],
+        "best_s": round(best, 6),
+        "median_s": round(statistics.median(timings), 6),
+        "items_per_sec": round(items / best, 1) if best > 0 else None,
+        "generate_s": round(min(generate_seconds), 6),
+        "stages": stages,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=str(REPO_ROOT),
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              universal_newlines=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline_path, results):
+    """Print the change in best time for every benchmark/size present in both runs."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(entry["benchmark"], entry["size"]): entry for entry in baseline.get("results", [])}
+
+    print(f"\nCompared with {baseline_path} ({baseline.get('commit') or 'unknown commit'})")
+    print(f"{'benchmark':<34} {'size':>9} {'before':>10} {'after':>10} {'change':>8}")
+    for entry in results:
+        before = previous.get((entry["benchmark"], entry["size"]))
+        if before is None:
+            continue
+        change = (entry["best_s"] - before["best_s"]) / before["best_s"] * 100 if before["best_s"] else 0.0
+        flag = "  ✗ slower" if change > 10 else ""
+        print(f"{entry['benchmark']:<34} {entry['size']:>9} {before['best_s']:>9.4f}s "
+              f"{entry['best_s']:>9.4f}s {change:>+7.1f}%{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the orchestrator, skills and watcher")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"comma-separated item counts, 10 to 1000000 (default {DEFAULT_SIZES})")
+    parser.add_argument("--only", help="comma-separated benchmark names (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, metavar="N",
+                        help="runs per benchmark and size; the best is reported (default 3)")
+    parser.add_argument("--background", type=int, default=10, metavar="N",
+                        help="items of every other kind in each vault (default 10)")
+    parser.add_argument("--workers", type=int, default=4, metavar="N",
+                        help="worker threads for the orchestrator, batch close and watcher (default 4)")
+    parser.add_argument("--payload-bytes", type=int, default=256, metavar="N",
+                        help="size of each synthetic dropped file (default 256)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default 0)")
+    parser.add_argument("--workdir", help="where vaults are generated (default: a temp directory)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated vaults")
+    parser.add_argument("--output", help="results file (default bench/results/bench_<timestamp>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file to compare against")
+    parser.add_argument("--verbose", action="store_true", help="show the output of the code under test")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    names = [name.strip() for name in args.only.split(",")] if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}; choose from {', '.join(BENCHMARKS)}")
+    if "watcher_burst" in names and importlib.util.find_spec("watchdog") is None:
+        print("✗ watchdog is not installed, skipping watcher_burst")
+        names.remove("watcher_burst")
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="ai_employee_bench_"))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    try:
+        for name in names:
+            for size in sizes:
+                entry = run_benchmark(name, size, args, workdir)
+                results.append(entry)
+                print(f"✓ {name:<34} size {size:>8}  best {entry['best_s']:.4f}s  "
+                      f"median {entry['median_s']:.4f}s  ({entry['items_per_sec']} items/sec)")
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {"sizes": sizes, "repeat": args.repeat, "background": args.background,
+                     "workers": args.workers, "payload_bytes": args.payload_bytes, "seed": args.seed},
+        "results": results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,65 @@
 """
 close-plan-and-archive skill
 Marks a plan as completed, updates its status, and archives it to Archive/ folder.
+
+Batch mode closes every plan matching a filter with a thread pool, then records one
+dashboard entry and one index update:
+
+    python close_plan_and_archive.py --batch --all-checked
+    python close_plan_and_archive.py --batch --glob "Plan_FILE_*.md" --status pending
 """
 
-import sys
+import time
+import fnmatch
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-import shutil
+
+# Imported first: the startup stage it records includes the imports below
+from instrumentation import Metrics, profile_call
+from activity_log import log_many
+from archive_layout import ArchiveLayout
+from frontmatter import parse_frontmatter, rewrite_frontmatter
+from metadata_cache import MetadataCache
+from task_index import TaskIndex
+
+
+def archive_plan(plan_path, archive_layout, metrics=None):
+    """Mark one plan completed and move it into Archive/. Returns the archived path."""
+    metrics = metrics or Metrics("close_plan_and_archive")
+
+    # Rewrite only the frontmatter; the body is spliced back unchanged
+    completed_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+    with metrics.timer("frontmatter_rewrite"):
+        rewrite_frontmatter(plan_path, {"status": "completed", "completed": completed_time})
+
+    # Create archived filename with timestamp
+    stem = plan_path.stem
+    suffix = plan_path.suffix
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    archived_filename = f"{stem}_completed_{timestamp}{suffix}"
+
+    # Move the plan to the Archive folder (or today's shard) with new name
+    with metrics.timer("move"):
+        return archive_layout.place(plan_path, archived_filename,
+                                    metadata={"plan": plan_path.name, "status": "completed",
+                                              "completed": completed_time})
+
+
+def plan_is_complete(plan_path):
+    """True if the plan has at least one checkbox and every checkbox is ticked."""
+    with open(plan_path, 'rb') as fh:
+        header = parse_frontmatter(fh)
+        fh.seek(header.body_offset)
+        checked = False
+        for raw in fh:
+            line = raw.strip()
+            if line.startswith(b'- [ ]'):
+                return False
+            if line.startswith(b'- [x]') or line.startswith(b'- [X]'):
+                checked = True
+    return checked
 
 
 def close_plan_and_archive(plan_filename=None):
@@ -20,10 +73,10 @@ def close_plan_and_archive(plan_filename=None):
     project_root = Path.cwd()
     plans_dir = project_root / "Plans"
     archive_dir = project_root / "Archive"
-    dashboard_path = project_root / "Dashboard.md"
 
     # Create archive directory if it doesn't exist
     archive_dir.mkdir(exist_ok=True)
+    archive_layout = ArchiveLayout(archive_dir)
 
     # Determine which plan(s) to process
     plans_to_process = []
@@ -56,122 +109,151 @@ def close_plan_and_archive(plan_filename=None):
             return True
 
     success_count = 0
+    activity = []
+    index = TaskIndex.for_vault(project_root)
+    metrics = Metrics("close_plan_and_archive")
+    metrics.mark_ready()
 
     for plan_path in plans_to_process:
         try:
-            # Read the current plan content
-            with open(plan_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Parse the content to find and update the YAML frontmatter
-            lines = content.split('\n')
-            updated_lines = []
-            in_frontmatter = False
-            frontmatter_started = False
-            frontmatter_ended = False
-            status_updated = False
-            completed_updated = False
-
-            i = 0
-            while i < len(lines):
-                line = lines[i]
-
-                if line.strip() == '---' and not frontmatter_started:
-                    # Start of frontmatter
-                    frontmatter_started = True
-                    in_frontmatter = True
-                    updated_lines.append(line)
-                elif line.strip() == '---' and frontmatter_started and not frontmatter_ended and i > 0:
-                    # End of frontmatter
-                    frontmatter_ended = True
-                    in_frontmatter = False
-                    # Add status and completed fields if they weren't found in the frontmatter
-                    if not status_updated:
-                        updated_lines.append('status: completed')
-                    if not completed_updated:
-                        completed_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
-                        updated_lines.append(f'completed: {completed_time}')
-                    updated_lines.append(line)
-                elif in_frontmatter and line.strip().startswith('status:'):
-                    # Update status to completed
-                    updated_lines.append('status: completed')
-                    status_updated = True
-                elif in_frontmatter and line.strip().startswith('completed:'):
-                    # Update completed timestamp
-                    completed_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
-                    updated_lines.append(f'completed: {completed_time}')
-                    completed_updated = True
-                else:
-                    updated_lines.append(line)
-
-                i += 1
-
-            # If no frontmatter exists, add it at the beginning
-            if not frontmatter_started:
-                completed_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
-                updated_lines = ['---', 'status: completed', f'completed: {completed_time}', '---', ''] + lines
-
-            # Write the updated content back to the file
-            updated_content = '\n'.join(updated_lines)
-
-            # Write the updated content back to the file
-            updated_content = '\n'.join(updated_lines)
-            with open(plan_path, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
-
-            # Create archived filename with timestamp
             stem = plan_path.stem
-            suffix = plan_path.suffix
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            archived_filename = f"{stem}_completed_{timestamp}{suffix}"
-            archived_path = archive_dir / archived_filename
-
-            # Move the plan to the Archive folder with new name
-            shutil.move(str(plan_path), str(archived_path))
+            archived_path = archive_plan(plan_path, archive_layout, metrics)
+            archived_filename = archived_path.name
+            with metrics.timer("index_update"):
+                index.move(plan_path, archived_path, status="completed", kind="plan")
 
             print(f"Plan {plan_path.name} marked as completed and archived to {archived_filename}")
 
-            # Log activity to Dashboard.md
-            log_to_dashboard = project_root / "update_dashboard_activity_fixed.py"
-            if log_to_dashboard.exists():
-                try:
-                    import subprocess
-                    task_name = stem.replace('Plan_', '').replace('_', ' ')
-                    subprocess.run([sys.executable, str(log_to_dashboard), f"Closed and archived plan: {task_name}"],
-                                 check=True, capture_output=True)
-                except subprocess.CalledProcessError:
-                    # If the skill script fails, log manually
-                    with open(dashboard_path, 'a', encoding='utf-8') as f:
-                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-                        task_name = stem.replace('Plan_', '').replace('_', ' ')
-                        f.write(f"\n   - [{timestamp}] Closed and archived plan: {task_name}")
-            else:
-                # Manual logging if the skill script doesn't exist
-                if dashboard_path.exists():
-                    with open(dashboard_path, 'a', encoding='utf-8') as f:
-                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-                        task_name = stem.replace('Plan_', '').replace('_', ' ')
-                        f.write(f"\n   - [{timestamp}] Closed and archived plan: {task_name}")
+            # Queue the activity; all events from this run are logged in one write
+            task_name = stem.replace('Plan_', '').replace('_', ' ')
+            activity.append(f"Closed and archived plan: {task_name}")
 
             success_count += 1
+            metrics.incr("plans_archived")
 
         except PermissionError:
             print(f"Error: Permission denied when processing {plan_path}")
+            metrics.incr("plans_failed")
             continue
         except Exception as e:
             print(f"Error processing {plan_path}: {str(e)}")
+            metrics.incr("plans_failed")
             continue
 
+    index.close()
+
+    # Log activity to Dashboard.md
+    if activity:
+        with metrics.timer("dashboard_update"):
+            logged = log_many(activity, project_root)
+        if not logged:
+            print("Warning: Dashboard.md not updated (missing file or ## Recent Activity section)")
+
+    metrics.flush(project_root)
+
     print(f"Successfully closed and archived {success_count} plan(s)")
     return True
 
 
+def close_plans_batch(pattern="Plan_*.md", status=None, all_checked=False, workers=4):
+    """
+    Close and archive every plan in Plans/ and root matching the filters, concurrently.
+    Only Plan_*.md files are candidates, whatever `pattern` says, so a broad glob can't
+    sweep up Dashboard.md or other notes in the vault root.
+
+    Args:
+        pattern (str): Glob for plan filenames, applied within Plan_*.md
+        status (str): Only plans whose frontmatter status equals this
+        all_checked (bool): Only plans whose checkboxes are all ticked
+        workers (int): Thread pool size for the rewrite + move work
+
+    Returns the number of plans archived.
+    """
+    started = time.perf_counter()
+    project_root = Path.cwd()
+    metrics = Metrics("close_plan_and_archive")
+    plans_dir = project_root / "Plans"
+    archive_dir = project_root / "Archive"
+    archive_dir.mkdir(exist_ok=True)
+    archive_layout = ArchiveLayout(archive_dir)
+    metrics.mark_ready()
+
+    candidates = list(plans_dir.glob("Plan_*.md")) + list(project_root.glob("Plan_*.md"))
+    candidates = sorted(path for path in candidates
+                        if fnmatch.fnmatch(path.name, pattern) and path.is_file())
+
+    if status is not None:
+        cache = MetadataCache.for_vault(project_root)
+        candidates = [path for path in candidates if cache.get(path).get('status') == status]
+        cache.close()
+
+    if all_checked:
+        candidates = [path for path in candidates if plan_is_complete(path)]
+
+    if not candidates:
+        print("No plans matched the batch filter.")
+        return 0
+
+    def close_one(plan_path):
+        try:
+            return plan_path, archive_plan(plan_path, archive_layout, metrics)
+        except Exception as e:
+            print(f"Error processing {plan_path}: {str(e)}")
+            metrics.incr("plans_failed")
+            return plan_path, None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(close_one, candidates))
+
+    archived = [(plan_path, archived_path) for plan_path, archived_path in results if archived_path]
+
+    # One index transaction and one dashboard entry for the whole batch
+    metrics.incr("plans_archived", len(archived))
+    index = TaskIndex.for_vault(project_root)
+    with metrics.timer("index_update"):
+        index.move_many([(plan_path, archived_path, {"status": "completed", "kind": "plan"})
+                         for plan_path, archived_path in archived])
+    index.close()
+
+    if archived:
+        names = [plan_path.stem.replace('Plan_', '').replace('_', ' ') for plan_path, _ in archived]
+        shown = ", ".join(names[:10])
+        if len(names) > 10:
+            shown += f" and {len(names) - 10} more"
+        with metrics.timer("dashboard_update"):
+            logged = log_many([f"Closed and archived {len(archived)} plan(s): {shown}"], project_root)
+        if not logged:
+            print("Warning: Dashboard.md not updated (missing file or ## Recent Activity section)")
+
+    metrics.flush(project_root)
+    elapsed = time.perf_counter() - started
+    print(f"Batch archived {len(archived)}/{len(candidates)} plan(s) in {elapsed:.3f}s")
+    return len(archived)
+
+
 def main():
-    if len(sys.argv) > 1:
-        plan_filename = sys.argv[1]
-        close_plan_and_archive(plan_filename)
+    parser = argparse.ArgumentParser(description="Mark plans completed and archive them")
+    parser.add_argument("plan_filename", nargs="?", help="plan to close (default: all plans)")
+    parser.add_argument("--batch", action="store_true",
+                        help="close all matching plans concurrently with a single dashboard update")
+    parser.add_argument("--glob", default="Plan_*.md", help="batch: plan filename pattern (only Plan_*.md files match)")
+    parser.add_argument("--status", help="batch: only plans with this frontmatter status")
+    parser.add_argument("--all-checked", action="store_true",
+                        help="batch: only plans whose checkboxes are all ticked")
+    parser.add_argument("--workers", type=int, default=4, help="batch: thread pool size (default 4)")
+    parser.add_argument("--profile", action="store_true",
+                        help="run under cProfile and write the stats to Logs/")
+    args = parser.parse_args()
+
+    if args.batch:
+        run, run_args = close_plans_batch, (args.glob, args.status, args.all_checked, args.workers)
+    else:
+        run, run_args = close_plan_and_archive, (args.plan_filename,)
+
+    if args.profile:
+        profile_call(run, Path.cwd(), "close_plan_and_archive", *run_args)
     else:
-        close_plan_and_archive()
+        run(*run_args)
 
 
 if __name__ == "__main__":
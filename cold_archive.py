@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Cold archive
+Packs closed plans in Archive/ and finished tasks in Done/ that are older than a threshold
+into append-only compressed segment files (<folder>/_segments/segment_NNNNNN.pack) with an
+offset index, then removes the loose files. Any packed file can still be read back by name
+with one index lookup and one seek.
+
+    python cold_archive.py pack --older-than 30
+    python cold_archive.py cat Plan_FILE_report_completed_20260218_041237.md
+    python cold_archive.py cat Done/2026/01/02/FILE_x.md
+
+Entries are keyed by their path under the folder, since sharded Done/ can hold the same
+task name on different days; a name packed more than once is read back by its path.
+
+Each entry is compressed on its own (gzip, or zstd when the `zstandard` package is
+installed and requested), so reading one never decompresses its neighbours.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from archive_layout import ArchiveLayout
+from frontmatter import read_metadata
+from leases import vault_lock
+from task_index import TaskIndex
+from vault_state import connect
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+SEGMENTS_DIR_NAME = "_segments"
+INDEX_NAME = "index.db"
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+PACKED_FOLDERS = ("Archive", "Done")
+
+
+def _compress(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data, codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("entry was packed with zstd; install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class AmbiguousName(LookupError):
+    """A bare file name matches more than one packed entry; read it by path instead."""
+
+    def __init__(self, name, paths):
+        super().__init__(f"{name} was packed more than once: {', '.join(paths)}")
+        self.name = name
+        self.paths = paths
+
+
+class ColdArchive:
+    """Segment files plus an SQLite offset index for one folder (Archive/ or Done/)."""
+
+    def __init__(self, base_dir, segment_bytes=DEFAULT_SEGMENT_BYTES):
+        self.base = Path(base_dir)
+        self.segments_dir = self.base / SEGMENTS_DIR_NAME
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.conn = connect(self.segments_dir / INDEX_NAME)
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    name TEXT NOT NULL,
+                    original_path TEXT PRIMARY KEY,
+                    segment TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    codec TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    metadata TEXT,
+                    packed_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_segment ON entries(segment);
+                CREATE INDEX IF NOT EXISTS entries_name ON entries(name);
+            """)
+
+    def _current_segment(self, incoming):
+        """The segment to append to, rolling over to a new one when it would grow too big."""
+        segments = sorted(self.segments_dir.glob("segment_*.pack"))
+        if segments and segments[-1].stat().st_size + incoming <= self.segment_bytes:
+            return segments[-1]
+        number = int(segments[-1].stem.split("_")[1]) + 1 if segments else 1
+        return self.segments_dir / f"segment_{number:06d}.pack"
+
+    def candidates(self, older_than_days):
+        """Loose .md files under the folder (including date shards) older than the threshold."""
+        cutoff = time.time() - older_than_days * 86400
+        for path in sorted(self.base.glob("**/*.md")):
+            if SEGMENTS_DIR_NAME in path.relative_to(self.base).parts:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Packed by another process since the listing
+                continue
+            if stat.st_mtime < cutoff:
+                yield path, stat
+
+    def pack(self, older_than_days=30, codec="gzip", on_packed=None):
+        """
+        Pack old loose files into segments and delete them.
+
+        Each file is appended and fsynced, and its index row committed, before the loose
+        copy is removed, so a crash never loses an entry. A file whose path is already in
+        the index (restored after packing) is left loose rather than replacing the packed
+        copy. Packers on the same folder take turns per file through a vault lock. Returns
+        the number packed.
+        """
+        if codec == "zstd" and zstandard is None:
+            print("zstandard not installed, packing with gzip")
+            codec = "gzip"
+
+        packed = 0
+        # Taken per file rather than for the whole run, so a long pack never outlives the lock's ttl
+        lock = vault_lock(self.base.parent, f"cold_archive:{self.base.name}")
+        for path, stat in self.candidates(older_than_days):
+            original_path = path.relative_to(self.base).as_posix()
+            try:
+                raw = path.read_bytes()
+            except FileNotFoundError:
+                continue
+            blob = _compress(raw, codec)
+            try:
+                metadata = read_metadata(path)
+            except (OSError, UnicodeDecodeError):
+                metadata = {}
+
+            # Two packers must neither interleave appends to a segment nor pack a file twice
+            with lock:
+                if not path.exists():
+                    # Packed and removed by another process since it was listed
+                    continue
+                if self.conn.execute("SELECT 1 FROM entries WHERE original_path = ?",
+                                     (original_path,)).fetchone():
+                    print(f"↷ {original_path} is already packed, left in place")
+                    continue
+
+                segment = self._current_segment(len(blob))
+                with open(segment, 'ab') as f:
+                    offset = f.tell()
+                    f.write(blob)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (path.name, original_path, segment.name, offset,
+                         len(blob), codec, len(raw), stat.st_mtime,
+                         json.dumps(metadata, ensure_ascii=False),
+                         datetime.now().strftime("%Y-%m-%dT%H:%M:%S")),
+                    )
+                path.unlink()
+            if on_packed:
+                on_packed(path)
+            packed += 1
+        return packed
+
+    def matches(self, name):
+        """Original paths of the entries packed as `name` (a file name or a path under the folder)."""
+        column = "original_path" if "/" in name else "name"
+        rows = self.conn.execute(
+            f"SELECT original_path FROM entries WHERE {column} = ? ORDER BY original_path", (name,))
+        return [row["original_path"] for row in rows]
+
+    def read_bytes(self, name):
+        """
+        Contents of a packed file by name or path, or None if it isn't in this archive.
+        Raises AmbiguousName if a bare name was packed from more than one path.
+        """
+        paths = self.matches(name)
+        if not paths:
+            return None
+        if len(paths) > 1:
+            raise AmbiguousName(name, paths)
+        row = self.conn.execute(
+            "SELECT segment, offset, length, codec FROM entries WHERE original_path = ?", (paths[0],)
+        ).fetchone()
+        with open(self.segments_dir / row["segment"], 'rb') as f:
+            f.seek(row["offset"])
+            return _decompress(f.read(row["length"]), row["codec"])
+
+    def read(self, name):
+        data = self.read_bytes(name)
+        return data.decode('utf-8') if data is not None else None
+
+    def iter_entries(self, prefix=""):
+        """Packed entries (name, original path, metadata) whose name starts with `prefix`."""
+        rows = self.conn.execute(
+            "SELECT name, original_path, metadata FROM entries WHERE name >= ? AND name < ? ORDER BY name",
+            (prefix, prefix + "\U0010ffff"),
+        )
+        for row in rows:
+            yield {"name": row["name"], "path": row["original_path"],
+                   "metadata": json.loads(row["metadata"] or "{}")}
+
+    def close(self):
+        self.conn.close()
+
+
+def read_archived(project_root, name):
+    """
+    Fetch a packed plan or task from Archive/ or Done/ (None if not packed).
+
+    `name` is a file name, or a vault path such as Done/2026/01/02/FILE_x.md. A name packed
+    from more than one path raises AmbiguousName listing those paths.
+    """
+    folders = PACKED_FOLDERS
+    folder, _, rest = name.partition("/")
+    if folder in PACKED_FOLDERS and rest:
+        folders, name = (folder,), rest
+
+    found = []
+    for folder in folders:
+        segments_dir = Path(project_root) / folder / SEGMENTS_DIR_NAME
+        if not (segments_dir / INDEX_NAME).exists():
+            continue
+        archive = ColdArchive(Path(project_root) / folder)
+        try:
+            found.extend((folder, path) for path in archive.matches(name))
+        finally:
+            archive.close()
+
+    if not found:
+        return None
+    if len(found) > 1:
+        raise AmbiguousName(name, [f"{folder}/{path}" for folder, path in found])
+    folder, path = found[0]
+    archive = ColdArchive(Path(project_root) / folder)
+    try:
+        return archive.read(path)
+    finally:
+        archive.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack old Archive/ and Done/ files into compressed segments")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pack = subparsers.add_parser("pack", help="pack closed items older than a threshold")
+    pack.add_argument("--older-than", type=float, default=30, metavar="DAYS",
+                      help="only pack files not modified for this many days (default 30)")
+    pack.add_argument("--folder", action="append", choices=PACKED_FOLDERS,
+                      help="folder to pack (default: Archive and Done)")
+    pack.add_argument("--codec", choices=("gzip", "zstd"), default="gzip")
+    pack.add_argument("--segment-mb", type=int, default=DEFAULT_SEGMENT_BYTES // (1024 * 1024),
+                      help="roll over to a new segment file at this size (default 64)")
+
+    cat = subparsers.add_parser("cat", help="print a packed file by name (or by path, e.g. Done/2026/01/02/FILE_x.md)")
+    cat.add_argument("name")
+
+    listing = subparsers.add_parser("list", help="list packed files")
+    listing.add_argument("--prefix", default="")
+
+    args = parser.parse_args()
+    project_root = Path.cwd()
+
+    if args.command == "pack":
+        index = TaskIndex.for_vault(project_root)
+        for folder in args.folder or PACKED_FOLDERS:
+            base = project_root / folder
+            if not base.exists():
+                continue
+            layout = ArchiveLayout(base)
+            archive = ColdArchive(base, segment_bytes=args.segment_mb * 1024 * 1024)
+
+            def forget(path):
+                # Packed files are no longer loose: drop them from the manifests and task index
+                if layout.sharded and path.parent != base:
+                    layout.record(path, removed=True)
+                index.remove(path)
+
+            started = time.perf_counter()
+            packed = archive.pack(args.older_than, args.codec, on_packed=forget)
+            archive.close()
+            print(f"Packed {packed} file(s) from {folder}/ in {time.perf_counter() - started:.3f}s")
+        index.close()
+
+    elif args.command == "cat":
+        try:
+            content = read_archived(project_root, args.name)
+        except AmbiguousName as e:
+            print(f"Error: {args.name} was packed more than once; pass one of these paths:")
+            for path in e.paths:
+                print(f"- {path}")
+            return
+        if content is None:
+            print(f"Error: {args.name} not found in the cold archive")
+            return
+        print(content)
+
+    elif args.command == "list":
+        for folder in PACKED_FOLDERS:
+            if not (project_root / folder / SEGMENTS_DIR_NAME / INDEX_NAME).exists():
+                continue
+            archive = ColdArchive(project_root / folder)
+            for entry in archive.iter_entries(args.prefix):
+                print(f"- {folder}/{entry['path']}")
+            archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,26 @@
 """
 create-simple-plan skill
 Reads .md files from Needs_Action/, creates Plan_[filename].md files with basic steps, then moves originals to Done/.
+Tasks that fail are retried with backoff and moved to Failed/ after repeated failures (see retry_policy.py).
 """
 
 import sys
 import os
+import time
 from datetime import datetime
 from pathlib import Path
-import shutil
+
+# Imported first: the startup stage it records includes the imports below
+from instrumentation import Metrics, profile_call
+from activity_log import log_many
+from atomic_io import atomic_write_text
+from dir_scanner import matching_files
+from frontmatter import read_metadata
+from archive_layout import ArchiveLayout
+from leases import LeaseManager
+from retry_policy import RetryPolicy
+from scheduler import parse_timestamp
+from task_index import TaskIndex
 
 
 def create_simple_plan():
@@ -19,27 +32,52 @@ def create_simple_plan():
     project_root = Path.cwd()
     needs_action_dir = project_root / "Needs_Action"
     done_dir = project_root / "Done"
-    dashboard_path = project_root / "Dashboard.md"
+    metrics = Metrics("create_simple_plan")
 
     # Ensure directories exist
     needs_action_dir.mkdir(exist_ok=True)
     done_dir.mkdir(exist_ok=True)
+    done_layout = ArchiveLayout(done_dir)
 
     # Find all .md files in Needs_Action/
-    md_files = list(needs_action_dir.glob("*.md"))
+    md_files = [Path(entry.path) for entry in matching_files(needs_action_dir, "*.md")]
 
     if not md_files:
         print("No pending tasks in Needs_Action/.")
         return True
 
     success_count = 0
+    skipped = 0
+    waiting = 0
+    retry = RetryPolicy(project_root)
+    activity = []
+    index = TaskIndex.for_vault(project_root)
+    # Orchestrators and other skill runs on the same vault claim tasks through the same leases
+    leases = LeaseManager.for_vault(project_root)
+    metrics.mark_ready()
 
     for file_path in md_files:
+        task_key = file_path.relative_to(project_root).as_posix()
+        if not leases.claim(task_key):
+            skipped += 1
+            continue
+        if not file_path.exists():
+            # Finished by another process between our listing and the claim
+            leases.release(task_key)
+            skipped += 1
+            continue
+        next_attempt = parse_timestamp(read_metadata(file_path).get('next_attempt_at'))
+        if next_attempt is not None and next_attempt > time.time():
+            # Failed before; still backing off
+            leases.release(task_key)
+            waiting += 1
+            continue
+
         try:
             print(f"Processing: {file_path.name}")
 
             # Read the content of the file
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with metrics.timer("task_read"), open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
 
             # Determine a short task name from filename
@@ -76,52 +114,81 @@ status: pending
 """
 
             # Write the plan file
-            with open(plan_path, 'w', encoding='utf-8') as f:
-                f.write(plan_content)
+            with metrics.timer("plan_write"):
+                atomic_write_text(plan_path, plan_content)
 
+            with metrics.timer("index_update"):
+                index.upsert(plan_path, {"created": created_time, "status": "pending"}, kind="plan")
             print(f"Created plan: {plan_path.name}")
 
             # Move the original file to Done/
-            done_file_path = done_dir / original_filename
-            shutil.move(str(file_path), str(done_file_path))
+            with metrics.timer("move"):
+                done_file_path = done_layout.place(file_path, metadata={"plan": plan_path.name})
+            with metrics.timer("index_update"):
+                index.move(file_path, done_file_path)
 
             print(f"Moved original task to Done/: {original_filename}")
 
-            # Log activity to Dashboard.md
-            log_to_dashboard = project_root / "update_dashboard_activity_fixed.py"
-            if log_to_dashboard.exists():
-                try:
-                    import subprocess
-                    subprocess.run([sys.executable, str(log_to_dashboard), f"Created plan for {task_name} and moved to Done"],
-                                 check=True, capture_output=True)
-                except subprocess.CalledProcessError:
-                    # If the skill script fails, log manually
-                    with open(dashboard_path, 'a', encoding='utf-8') as f:
-                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-                        f.write(f"\n   - [{timestamp}] Created plan for {task_name} and moved to Done")
-            else:
-                # Manual logging if the skill script doesn't exist
-                if dashboard_path.exists():
-                    with open(dashboard_path, 'a', encoding='utf-8') as f:
-                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-                        f.write(f"\n   - [{timestamp}] Created plan for {task_name} and moved to Done")
-
-            print(f"Logged activity for: {task_name}")
+            # Queue the activity; all events from this run are logged in one write
+            activity.append(f"Created plan for {task_name} and moved to Done")
+            print(f"Queued activity for: {task_name}")
             success_count += 1
+            metrics.incr("tasks_processed")
 
-        except PermissionError:
+        except PermissionError as e:
             print(f"Error: Permission denied when processing {file_path}")
+            metrics.incr("tasks_failed")
+            record_failure(retry, index, file_path, e, activity)
             continue
         except Exception as e:
             print(f"Error processing {file_path}: {str(e)}")
+            metrics.incr("tasks_failed")
+            record_failure(retry, index, file_path, e, activity)
             continue
 
+        finally:
+            leases.release(task_key)
+
+    index.close()
+    if skipped:
+        print(f"Skipped {skipped} file(s) claimed or finished by another process")
+    if waiting:
+        print(f"Skipped {waiting} failed task(s) waiting to retry")
+
+    # Log activity to Dashboard.md
+    if activity:
+        with metrics.timer("dashboard_update"):
+            logged = log_many(activity, project_root)
+        if logged:
+            print(f"Logged {len(activity)} activity entries to Dashboard.md")
+        else:
+            print("Warning: Dashboard.md not updated (missing file or ## Recent Activity section)")
+
+    metrics.flush(project_root)
     print(f"Successfully processed {success_count} file(s)")
     return True
 
 
+def record_failure(retry, index, file_path, error, activity):
+    """Count a failed attempt; after too many, the task is moved to Failed/."""
+    if not file_path.exists():
+        return
+    try:
+        new_path = retry.record_failure(file_path, error)
+    except Exception as e:
+        print(f"Error recording failure of {file_path.name}: {e}")
+        return
+    if new_path != file_path:
+        index.move(file_path, new_path, status="failed")
+        activity.append(f"Gave up on {file_path.name} after {retry.max_attempts} attempts, moved to Failed")
+        print(f"Moved to Failed/ after {retry.max_attempts} failed attempts: {file_path.name}")
+
+
 def main():
-    create_simple_plan()
+    if "--profile" in sys.argv[1:]:
+        profile_call(create_simple_plan, Path.cwd(), "create_simple_plan")
+    else:
+        create_simple_plan()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Content deduplication index
+Remembers the size and SHA-256 of every file ingested from Inbox/ so re-sent bytes under a
+new name are recorded as a reference to the original task instead of becoming a new one.
+
+Files are keyed by size first: a file is only hashed when another ingested file has the
+same size, so most drops are never read at all.
+"""
+
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from vault_state import connect, state_dir
+
+
+DB_NAME = "dedup.db"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path, chunk_size=HASH_CHUNK_SIZE):
+    """Streaming SHA-256 of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DedupIndex:
+    """Persistent size + SHA-256 index of ingested files."""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        # Re-entrant: check_and_record records while holding it
+        self._lock = threading.RLock()
+        self.conn = connect(self.db_path)
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS files (
+                    task_name TEXT PRIMARY KEY,
+                    original_name TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    sha256 TEXT,
+                    payload_path TEXT,
+                    source_path TEXT,
+                    recorded_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS files_size ON files(size);
+                CREATE INDEX IF NOT EXISTS files_sha256 ON files(sha256);
+
+                CREATE TABLE IF NOT EXISTS duplicates (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    original_name TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    duplicate_of TEXT NOT NULL,
+                    detected_at TEXT NOT NULL
+                );
+            """)
+
+    @classmethod
+    def for_vault(cls, project_root):
+        """Open the vault's index, seeding it from payloads already in Needs_Action/."""
+        project_root = Path(project_root)
+        db_path = state_dir(project_root) / DB_NAME
+        is_new = not db_path.exists()
+        index = cls(db_path)
+        if is_new:
+            index.seed(project_root / "Needs_Action")
+        return index
+
+    def seed(self, needs_action_dir):
+        """Record the FILE_* payloads already sitting in Needs_Action/ (sizes only)."""
+        count = 0
+        if not Path(needs_action_dir).exists():
+            return count
+        for payload in Path(needs_action_dir).glob("FILE_*"):
+            if payload.suffix == '.md' or not payload.is_file():
+                continue
+            original_name = payload.name[len("FILE_"):]
+            self.record(f"{payload.name}.md", original_name, payload.stat().st_size, payload_path=payload)
+            count += 1
+        return count
+
+    def _stored_hash(self, row):
+        """Hash of an indexed file, computing and saving it on first need."""
+        if row["sha256"]:
+            return row["sha256"]
+        for candidate in (row["payload_path"], row["source_path"]):
+            if candidate and Path(candidate).is_file():
+                try:
+                    digest = hash_file(candidate)
+                except OSError:
+                    continue
+                with self.conn:
+                    self.conn.execute("UPDATE files SET sha256 = ? WHERE task_name = ?",
+                                      (digest, row["task_name"]))
+                return digest
+        return None
+
+    def check_and_record(self, source_path, task_name, payload_path):
+        """
+        Look up `source_path` and either reserve it under `task_name` or report a duplicate.
+
+        Returns (duplicate_of, sha256): duplicate_of is the task name of the earlier
+        ingest with identical bytes, or None if the file is new (and now recorded). If the
+        task then can't be created, forget(task_name) must undo the reservation.
+        """
+        source_path = Path(source_path)
+        size = source_path.stat().st_size
+
+        # One decision at a time so two identical drops can't both look new
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM files WHERE size = ? AND task_name != ?", (size, task_name)
+            ).fetchall()
+
+            digest = None
+            if rows:
+                digest = hash_file(source_path)
+                for row in rows:
+                    if self._stored_hash(row) == digest:
+                        return row["task_name"], digest
+
+            self.record(task_name, source_path.name, size, digest, payload_path, source_path)
+            return None, digest
+
+    def record(self, task_name, original_name, size, sha256=None, payload_path=None, source_path=None):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (task_name, original_name, size, sha256,
+                 str(payload_path) if payload_path else None,
+                 str(source_path) if source_path else None,
+                 datetime.utcnow().isoformat() + 'Z'),
+            )
+
+    def forget(self, task_name):
+        """Drop a reservation whose task was never created."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM files WHERE task_name = ?", (task_name,))
+
+    def record_duplicate(self, original_name, size, sha256, duplicate_of):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO duplicates (original_name, size, sha256, duplicate_of, detected_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (original_name, size, sha256, duplicate_of, datetime.utcnow().isoformat() + 'Z'),
+            )
+
+    def duplicates_of(self, task_name):
+        """Names of files that were dropped again after `task_name` was ingested."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT original_name FROM duplicates WHERE duplicate_of = ? ORDER BY id", (task_name,)
+            ).fetchall()
+        return [row["original_name"] for row in rows]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Directory scanner
+Incremental listing of vault folders with os.scandir. The scanner remembers what it saw on
+the previous pass (each file's mtime, size and inode, and each folder's own mtime) and
+reports only the files added, changed or removed since.
+
+Creating, deleting or renaming a file bumps its folder's mtime, so a folder whose mtime
+hasn't moved is not listed again: a pass over an unchanged 100k-entry folder costs one
+stat(). In a folder that did change, files whose inode is unchanged are not stat()ed
+either. The vault's own writers replace files by rename (atomic_io), which gives them a
+new inode. An edit made in place by another program (Obsidian, most editors) keeps both
+the inode and the folder mtime, so only scan(full=True) sees it; folders whose files are
+edited by hand should be scanned that way.
+
+walk_files() lists a whole tree once, with several folders read in parallel; it is used
+for folders dropped into Inbox/.
+
+Snapshots live in memory by default. Pass a connection from open_snapshots() to keep them
+in .state/snapshots.db, so a short-lived process (a skill run) starts from the last pass.
+
+    scanner = DirectoryScanner(project_root / "Needs_Action", "*.md")
+    changes = scanner.scan()
+    for path in changes.added:
+        ...
+"""
+
+import fnmatch
+import os
+import posixpath
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from vault_state import connect, state_dir
+
+
+DB_NAME = "snapshots.db"
+
+# A folder listed within this many seconds of its last change is listed again next pass:
+# on filesystems with coarse timestamps (FAT, SMB, some NFS) a second change in the same
+# tick would not move the mtime.
+RACY_SECONDS = 2.0
+
+# Where entry.inode() is free (no extra system call) it decides whether a file needs a stat()
+INODE_IS_FREE = os.name != 'nt'
+
+
+def open_snapshots(project_root):
+    """Connection to the vault's persistent snapshot store."""
+    return connect(state_dir(project_root) / DB_NAME)
+
+
+def matching_files(directory, pattern="*"):
+    """DirEntry objects for the visible files in `directory` whose names match `pattern`."""
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') or not fnmatch.fnmatch(entry.name, pattern):
+                    continue
+                try:
+                    if entry.is_file():
+                        yield entry
+                except OSError:
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def _list_dir(path):
+    """(files, subfolders) of one folder, skipping hidden entries and symlinked folders."""
+    files, dirs = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry)
+                except OSError:
+                    continue
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        pass
+    return files, dirs
+
+
+def walk_files(root, workers=4):
+    """
+    Yield a DirEntry for every visible file under `root`, listing up to `workers` folders at
+    once (scandir and stat release the GIL). Files come in no particular order, as soon as
+    their folder has been read.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="walk") as pool:
+        pending = {pool.submit(_list_dir, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, dirs = future.result()
+                pending.update(pool.submit(_list_dir, path) for path in dirs)
+                for entry in files:
+                    yield entry
+
+
+class ScanResult:
+    """Files added, changed and removed since the previous pass, plus the folders that were listed."""
+
+    __slots__ = ("added", "changed", "removed", "listed")
+
+    def __init__(self):
+        self.added = []
+        self.changed = []
+        self.removed = []
+        self.listed = []
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+    def __repr__(self):
+        return (f"ScanResult(added={len(self.added)}, changed={len(self.changed)}, "
+                f"removed={len(self.removed)}, listed={len(self.listed)})")
+
+
+class DirectoryScanner:
+    """Snapshot of the files under `root` matching `pattern`, updated by scan()."""
+
+    def __init__(self, root, pattern="*", recursive=False, conn=None, scope=None):
+        self.root = os.path.abspath(root)
+        self.pattern = pattern
+        self.recursive = recursive
+        self.scope = scope or f"{self.root}|{pattern}|{int(recursive)}"
+        self._lock = threading.Lock()
+        self._owns_conn = conn is None
+        self.conn = connect(":memory:") if conn is None else conn
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS scan_dirs (
+                    scope TEXT NOT NULL,
+                    dir TEXT NOT NULL,
+                    parent TEXT,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    listed_at REAL NOT NULL,
+                    PRIMARY KEY (scope, dir)
+                );
+                CREATE TABLE IF NOT EXISTS scan_entries (
+                    scope TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    dir TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    PRIMARY KEY (scope, path)
+                );
+                CREATE INDEX IF NOT EXISTS scan_entries_dir ON scan_entries(scope, dir);
+            """)
+
+    def _absolute(self, relative):
+        return os.path.join(self.root, *relative.split('/')) if relative else self.root
+
+    def _path(self, relative):
+        return Path(self._absolute(relative))
+
+    def scan(self, full=False):
+        """
+        Bring the snapshot up to date and return what changed. full=True lists every folder
+        and stat()s every file, catching edits made in place.
+        """
+        result = ScanResult()
+        with self._lock, self.conn:
+            known = {row["dir"]: row for row in self.conn.execute(
+                "SELECT dir, parent, mtime_ns, inode, listed_at FROM scan_dirs WHERE scope = ?",
+                (self.scope,))}
+            children = {}
+            for row in known.values():
+                children.setdefault(row["parent"], []).append(row["dir"])
+
+            visited = set()
+            pending = [""]
+            while pending:
+                relative = pending.pop()
+                try:
+                    st = os.stat(self._absolute(relative))
+                except OSError:
+                    continue
+                visited.add(relative)
+
+                previous = known.get(relative)
+                if (not full and previous is not None
+                        and previous["mtime_ns"] == st.st_mtime_ns and previous["inode"] == st.st_ino
+                        and previous["listed_at"] - st.st_mtime_ns / 1e9 >= RACY_SECONDS):
+                    pending.extend(children.get(relative, ()))
+                    continue
+
+                listed_at = time.time()
+                pending.extend(self._list(relative, full, result))
+                result.listed.append(relative)
+                parent = posixpath.dirname(relative) if relative else None
+                self.conn.execute("INSERT OR REPLACE INTO scan_dirs VALUES (?, ?, ?, ?, ?, ?)",
+                                  (self.scope, relative, parent, st.st_mtime_ns, st.st_ino, listed_at))
+
+            for relative in set(known) - visited:
+                self._drop_dir(relative, result)
+        return result
+
+    def _list(self, relative, full, result):
+        """List one folder, diff it against its snapshot and return its subfolders."""
+        old = {row["path"]: (row["mtime_ns"], row["size"], row["inode"]) for row in self.conn.execute(
+            "SELECT path, mtime_ns, size, inode FROM scan_entries WHERE scope = ? AND dir = ?",
+            (self.scope, relative))}
+        subdirs = []
+        updates = []
+        try:
+            with os.scandir(self._absolute(relative)) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    path = posixpath.join(relative, entry.name) if relative else entry.name
+                    before = None
+                    try:
+                        if self.recursive and entry.is_dir(follow_symlinks=False):
+                            subdirs.append(path)
+                            continue
+                        if not fnmatch.fnmatch(entry.name, self.pattern) or not entry.is_file():
+                            continue
+                        before = old.pop(path, None)
+                        if (before is not None and not full and INODE_IS_FREE
+                                and before[2] == entry.inode()):
+                            continue
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        # Deleted while we were listing
+                        if before is not None:
+                            old[path] = before
+                        continue
+                    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+                    if before is None:
+                        result.added.append(self._path(path))
+                    elif before != signature:
+                        result.changed.append(self._path(path))
+                    else:
+                        continue
+                    updates.append((self.scope, path, relative) + signature)
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+        self.conn.executemany("INSERT OR REPLACE INTO scan_entries VALUES (?, ?, ?, ?, ?, ?)", updates)
+        self.conn.executemany("DELETE FROM scan_entries WHERE scope = ? AND path = ?",
+                              [(self.scope, path) for path in old])
+        result.removed.extend(self._path(path) for path in old)
+        return subdirs
+
+    def _drop_dir(self, relative, result):
+        """Forget a folder that no longer exists, reporting its files as removed."""
+        rows = self.conn.execute("SELECT path FROM scan_entries WHERE scope = ? AND dir = ?",
+                                 (self.scope, relative)).fetchall()
+        result.removed.extend(self._path(row["path"]) for row in rows)
+        self.conn.execute("DELETE FROM scan_entries WHERE scope = ? AND dir = ?", (self.scope, relative))
+        self.conn.execute("DELETE FROM scan_dirs WHERE scope = ? AND dir = ?", (self.scope, relative))
+
+    def paths(self):
+        """Every file in the snapshot, as of the last scan()."""
+        with self._lock:
+            rows = self.conn.execute("SELECT path FROM scan_entries WHERE scope = ? ORDER BY path",
+                                     (self.scope,)).fetchall()
+        return [self._path(row["path"]) for row in rows]
+
+    def names_in(self, relative=""):
+        """File names the snapshot holds for one folder (relative to root, '' for root itself)."""
+        with self._lock:
+            rows = self.conn.execute("SELECT path FROM scan_entries WHERE scope = ? AND dir = ?",
+                                     (self.scope, relative)).fetchall()
+        return {posixpath.basename(row["path"]) for row in rows}
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM scan_entries WHERE scope = ?",
+                                     (self.scope,)).fetchone()[0]
+
+    def reset(self):
+        """Forget the snapshot; the next scan() reports every file as added."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM scan_entries WHERE scope = ?", (self.scope,))
+            self.conn.execute("DELETE FROM scan_dirs WHERE scope = ?", (self.scope,))
+
+    def close(self):
+        with self._lock:
+            if self._owns_conn and self.conn is not None:
+                self.conn.close()
+                self.conn = None
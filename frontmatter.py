@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Frontmatter parser
+Shared `key: value` frontmatter reader for vault markdown files. It reads from a file handle,
+stops at the closing '---' and reports the byte offset where the body starts, so callers
+never load the body. rewrite_frontmatter() replaces only the header and splices the
+untouched body bytes after it.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+from atomic_io import temp_path_for
+
+
+DELIMITER = '---'
+
+
+class Frontmatter:
+    """Parsed frontmatter: ordered raw lines, key/value view, and where the body starts."""
+
+    def __init__(self, lines=None, body_offset=0, newline='\n'):
+        self.lines = lines or []
+        self.body_offset = body_offset
+        self.newline = newline
+
+    @property
+    def present(self):
+        return self.body_offset > 0
+
+    @property
+    def metadata(self):
+        metadata = {}
+        for line in self.lines:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                metadata[key.strip()] = value.strip()
+        return metadata
+
+
+def parse_frontmatter(fh):
+    """
+    Read frontmatter from a binary file handle positioned at the start of the file.
+
+    Returns a Frontmatter; body_offset is 0 when the file has no (closed) frontmatter.
+    """
+    first = fh.readline()
+    if first.strip() != DELIMITER.encode():
+        return Frontmatter()
+
+    newline = '\r\n' if first.endswith(b'\r\n') else '\n'
+    lines = []
+    for raw in iter(fh.readline, b''):
+        line = raw.decode('utf-8').rstrip('\r\n')
+        if line.strip() == DELIMITER:
+            return Frontmatter(lines, fh.tell(), newline)
+        lines.append(line)
+
+    # No closing delimiter: not frontmatter
+    return Frontmatter()
+
+
+def read_frontmatter(path):
+    """Parse the frontmatter of `path`, reading only the header."""
+    with open(path, 'rb') as fh:
+        return parse_frontmatter(fh)
+
+
+def read_metadata(path):
+    """Frontmatter of `path` as a dict ({} if there is none)."""
+    return read_frontmatter(path).metadata
+
+
+def render_frontmatter(lines, newline='\n'):
+    return newline.join([DELIMITER] + list(lines) + [DELIMITER]) + newline
+
+
+def rewrite_frontmatter(path, updates):
+    """
+    Set `updates` (key -> value) in the frontmatter of `path`.
+
+    Existing keys are replaced in place, new keys are appended before the closing '---',
+    and a file without frontmatter gets one (followed by a blank line). The body is copied
+    byte for byte from its original offset; the file is replaced atomically.
+    """
+    path = Path(path)
+    tmp_path = temp_path_for(path)
+
+    with open(path, 'rb') as src:
+        header = parse_frontmatter(src)
+
+        remaining = dict(updates)
+        new_lines = []
+        for line in header.lines:
+            key = line.split(':', 1)[0].strip() if ':' in line else None
+            if key in remaining:
+                new_lines.append(f"{key}: {remaining.pop(key)}")
+            else:
+                new_lines.append(line)
+        new_lines.extend(f"{key}: {value}" for key, value in remaining.items())
+
+        rendered = render_frontmatter(new_lines, header.newline)
+        if not header.present:
+            rendered += header.newline
+
+        src.seek(header.body_offset)
+        with open(tmp_path, 'wb') as dst:
+            dst.write(rendered.encode('utf-8'))
+            shutil.copyfileobj(src, dst)
+            dst.flush()
+            os.fsync(dst.fileno())
+
+    shutil.copymode(path, tmp_path)
+    os.replace(tmp_path, path)
+    return header
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Inbox ledger
+Remembers every Inbox/ file the watcher has turned into a task, with the file's inode,
+mtime and size at the time (.state/inbox.db). When the watcher starts, reconcile() diffs
+Inbox/ against the ledger in one os.scandir pass, so files that arrived or changed while
+it was down are ingested without being dropped again, and files already ingested are not
+ingested twice.
+
+A ledger created for a vault that already has tasks is seeded from them: an Inbox file
+whose FILE_<name>.md task exists in Needs_Action/, Done/ or Failed/ counts as ingested.
+
+Files from folders dropped into Inbox/ are recorded under their Inbox-relative path
+(`photos/2026/a.jpg`), so an interrupted folder ingestion resumes where it stopped.
+"""
+
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from dir_scanner import matching_files
+from vault_state import connect, state_dir
+
+
+DB_NAME = "inbox.db"
+TASK_FOLDERS = ("Needs_Action", "Done", "Failed")
+
+
+def signature(stat_result):
+    return stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size
+
+
+def entry_signature(entry):
+    """signature() of a DirEntry; entry.stat() has no inode on Windows, entry.inode() does."""
+    stat_result = entry.stat()
+    return entry.inode(), stat_result.st_mtime_ns, stat_result.st_size
+
+
+class InboxLedger:
+    """Inbox file name -> (inode, mtime_ns, size) when it was ingested, and the task it became."""
+
+    def __init__(self, db_path):
+        self._lock = threading.Lock()
+        self.conn = connect(db_path)
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingested (
+                    name TEXT PRIMARY KEY,
+                    inode INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    task_name TEXT NOT NULL,
+                    ingested_at TEXT NOT NULL
+                )
+            """)
+
+    @classmethod
+    def for_vault(cls, project_root, task_index=None):
+        """Open the vault's ledger, seeding a new one from the tasks already in the vault."""
+        project_root = Path(project_root)
+        db_path = state_dir(project_root) / DB_NAME
+        is_new = not db_path.exists()
+        ledger = cls(db_path)
+        if is_new:
+            ledger.seed(project_root, task_index)
+        return ledger
+
+    def seed(self, project_root, task_index=None):
+        """Record the Inbox files that already have a FILE_<name>.md task."""
+        project_root = Path(project_root)
+        known = {row["name"] for row in task_index.query()} if task_index is not None else set()
+        count = 0
+        for entry in matching_files(project_root / "Inbox"):
+            task_name = f"FILE_{entry.name}.md"
+            if task_name in known or any((project_root / folder / task_name).exists() for folder in TASK_FOLDERS):
+                self.record(entry.name, entry_signature(entry), task_name)
+                count += 1
+        return count
+
+    def record(self, name, file_signature, task_name):
+        """Note that Inbox file `name`, with signature() `file_signature`, became `task_name`."""
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO ingested VALUES (?, ?, ?, ?, ?, ?)",
+                              (name,) + tuple(file_signature) +
+                              (task_name, datetime.utcnow().isoformat() + 'Z'))
+
+    def is_ingested(self, name, file_signature):
+        """True if this exact version of the file (same inode, mtime and size) was ingested."""
+        with self._lock:
+            row = self.conn.execute("SELECT inode, mtime_ns, size FROM ingested WHERE name = ?",
+                                    (name,)).fetchone()
+        return row is not None and tuple(row) == tuple(file_signature)
+
+    def task_for(self, name):
+        """The task `name` was ingested as, or None."""
+        with self._lock:
+            row = self.conn.execute("SELECT task_name FROM ingested WHERE name = ?", (name,)).fetchone()
+        return row["task_name"] if row is not None else None
+
+    def reconcile(self, inbox_dir, ignore=None):
+        """
+        Diff Inbox/ against the ledger.
+
+        Returns the files that are new or changed since they were ingested, plus every folder
+        in Inbox/ (its files are checked against the ledger one by one when it is walked).
+        Ledger entries for files no longer in Inbox/ are dropped, which keeps the ledger as
+        small as the Inbox.
+        """
+        with self._lock:
+            ingested = {row["name"]: tuple(row)[1:] for row in
+                        self.conn.execute("SELECT name, inode, mtime_ns, size FROM ingested")}
+
+        missing = []
+        trees = set()
+        try:
+            with os.scandir(inbox_dir) as entries:
+                for entry in entries:
+                    path = Path(entry.path)
+                    if entry.name.startswith('.') or (ignore is not None and ignore(path)):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            trees.add(entry.name)
+                            missing.append((entry.stat().st_mtime_ns, path))
+                            continue
+                        if not entry.is_file():
+                            continue
+                        current = entry_signature(entry)
+                    except FileNotFoundError:
+                        continue
+                    if ingested.pop(entry.name, None) != current:
+                        missing.append((current[1], path))
+        except FileNotFoundError:
+            pass
+
+        # Rows for files inside folders that are still there stay
+        for name in [name for name in ingested if name.split('/', 1)[0] in trees]:
+            del ingested[name]
+        if ingested:
+            with self._lock, self.conn:
+                self.conn.executemany("DELETE FROM ingested WHERE name = ?", [(name,) for name in ingested])
+        # Oldest first, the order they would have been ingested in
+        return [path for _, path in sorted(missing)]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Instrumentation
+Lightweight per-stage timers and counters for the skills, orchestrator and watcher.
+Recording costs a perf_counter() call and a dict update, so it stays on in production.
+
+Each component flushes its totals to:
+    Logs/metrics.jsonl               one JSON line per flush with anything new since the last
+    Logs/metrics_<component>.prom    Prometheus text format (node_exporter textfile collector)
+
+metrics.jsonl is rotated once it passes ROTATE_BYTES (metrics.jsonl.1, .2, ...), keeping
+ROTATE_KEEP old files, so a long-running watcher or orchestrator uses bounded disk.
+
+Cold start is recorded as the `startup` stage: from the moment this module is imported
+until the component calls mark_ready(), usually once its indexes are open. Entry points
+import it ahead of the other vault modules so their imports (sqlite3 and friends) count.
+
+profile_call() wraps a run in cProfile for the --profile flags.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from atomic_io import atomic_write_text
+
+
+LOGS_DIR_NAME = "Logs"
+METRICS_JSONL = "metrics.jsonl"
+PROM_PREFIX = "ai_employee"
+ROTATE_BYTES = 8 * 1024 * 1024
+ROTATE_KEEP = 3
+
+# Start of the startup stage
+IMPORTED_AT = time.perf_counter()
+
+
+def rotate_if_large(path, max_bytes=ROTATE_BYTES, keep=ROTATE_KEEP):
+    """Shift path -> path.1 -> path.2 ... once it passes max_bytes, dropping the oldest."""
+    try:
+        if path.stat().st_size <= max_bytes:
+            return False
+    except FileNotFoundError:
+        return False
+    for number in range(keep - 1, 0, -1):
+        older = path.with_name(f"{path.name}.{number}")
+        if older.exists():
+            os.replace(older, path.with_name(f"{path.name}.{number + 1}"))
+    try:
+        os.replace(path, path.with_name(f"{path.name}.1"))
+    except FileNotFoundError:
+        # Another process rotated it first
+        pass
+    return True
+
+
+class Metrics:
+    """Cumulative stage timings and counters for one component (e.g. "orchestrator")."""
+
+    def __init__(self, component):
+        self.component = component
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.counters = {}
+        # stage -> [calls, total seconds, max seconds]
+        self.timers = {}
+        # Counts as of the last flush; an idle component doesn't write the same totals again
+        self._flushed = None
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            timer = self.timers.get(stage)
+            if timer is None:
+                self.timers[stage] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+
+    def mark_ready(self):
+        """Record the startup stage: imports and setup since this module was imported."""
+        self.observe("startup", time.perf_counter() - IMPORTED_AT)
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "ts": datetime.utcnow().isoformat() + 'Z',
+                "component": self.component,
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started, 3),
+                "counters": dict(self.counters),
+                "timers": {
+                    stage: {"count": calls, "total_ms": round(total * 1000, 3), "max_ms": round(peak * 1000, 3)}
+                    for stage, (calls, total, peak) in self.timers.items()
+                },
+            }
+
+    def to_prometheus(self):
+        with self._lock:
+            labels = f'component="{self.component}"'
+            lines = [
+                f"# TYPE {PROM_PREFIX}_stage_seconds_total counter",
+                f"# TYPE {PROM_PREFIX}_stage_calls_total counter",
+                f"# TYPE {PROM_PREFIX}_stage_max_seconds gauge",
+            ]
+            for stage, (calls, total, peak) in sorted(self.timers.items()):
+                stage_labels = f'{labels},stage="{stage}"'
+                lines.append(f"{PROM_PREFIX}_stage_seconds_total{{{stage_labels}}} {total:.6f}")
+                lines.append(f"{PROM_PREFIX}_stage_calls_total{{{stage_labels}}} {calls}")
+                lines.append(f"{PROM_PREFIX}_stage_max_seconds{{{stage_labels}}} {peak:.6f}")
+            lines.append(f"# TYPE {PROM_PREFIX}_events_total counter")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'{PROM_PREFIX}_events_total{{{labels},event="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def flush(self, project_root):
+        """Append a JSON line (rotating the file when it is full) and refresh the Prometheus text file under Logs/."""
+        logs_dir = Path(project_root) / LOGS_DIR_NAME
+        logs_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            state = (dict(self.counters), {stage: timer[0] for stage, timer in self.timers.items()})
+        if state == self._flushed:
+            return
+        self._flushed = state
+
+        rotate_if_large(logs_dir / METRICS_JSONL)
+        with open(logs_dir / METRICS_JSONL, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.snapshot()) + "\n")
+
+        # Scrapers must never read a partial file; losing one flush on a crash is fine
+        atomic_write_text(logs_dir / f"metrics_{self.component}.prom", self.to_prometheus(), fsync=False)
+
+
+def profile_call(func, project_root, component, *args, **kwargs):
+    """Run func under cProfile, dump stats to Logs/ and print the top entries."""
+    logs_dir = Path(project_root) / LOGS_DIR_NAME
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    output = logs_dir / f"profile_{component}_{datetime.now():%Y%m%d_%H%M%S}.prof"
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        profiler.dump_stats(str(output))
+        print(f"\nProfile written to {output}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Intent log
+Write-ahead log for the orchestrator's task pipeline (.state/intents.jsonl). Before a batch
+touches any file, one fsynced "begin" line per task records what it is about to do:
+which task, which plan it will write. Steps (the task's handler starting, the Done/
+destination) are appended as they happen, and one fsynced "commit" line per task follows
+the dashboard update.
+
+After a crash, pending() lists exactly the tasks that were in flight, so startup recovery
+finishes or rolls back those instead of re-examining every folder. The log is emptied
+whenever nothing is in flight, so it stays a few lines long.
+
+Several orchestrators may share the log; begin records and truncation take the vault's
+"intents" lock so one process never truncates another's open intents.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from leases import vault_lock
+from vault_state import state_dir
+
+
+INTENT_LOG_NAME = "intents.jsonl"
+
+
+class IntentLog:
+    """Begin/step/commit records per task, keyed by the task's vault-relative path."""
+
+    def __init__(self, path, file_lock=None):
+        self.path = Path(path)
+        self._file_lock = file_lock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._fh = open(self.path, 'a', encoding='utf-8')
+        self._open = 0
+
+    @classmethod
+    def for_vault(cls, project_root):
+        return cls(state_dir(project_root) / INTENT_LOG_NAME, vault_lock(project_root, "intents"))
+
+    @contextmanager
+    def _shared(self):
+        """Hold the cross-process lock, if any, around a read-modify-write of the log."""
+        if self._file_lock is None:
+            yield
+        else:
+            with self._file_lock:
+                yield
+
+    def _write(self, records, durable):
+        payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        self._fh.write(payload)
+        self._fh.flush()
+        if durable:
+            os.fsync(self._fh.fileno())
+
+    def begin_many(self, intents):
+        """Durably record a batch of intents, e.g. {"task": ..., "plan": ...}, with one fsync."""
+        stamp = datetime.utcnow().isoformat() + 'Z'
+        records = [dict(intent, op="begin", ts=stamp) for intent in intents]
+        if not records:
+            return
+        with self._shared(), self._lock:
+            self._write(records, durable=True)
+            self._open += len(records)
+
+    def step(self, task, **fields):
+        """Note progress on a task. Not fsynced: recovery re-checks the filesystem anyway."""
+        with self._lock:
+            self._write([dict(fields, op="step", task=task)], durable=False)
+
+    def _close_many(self, tasks, op):
+        records = [{"op": op, "task": task} for task in tasks]
+        if not records:
+            return
+        with self._lock:
+            self._write(records, durable=True)
+            self._open = max(0, self._open - len(records))
+
+    def commit_many(self, tasks):
+        self._close_many(tasks, "commit")
+
+    def abort_many(self, tasks):
+        self._close_many(tasks, "abort")
+
+    def pending(self):
+        """Intents begun but never committed or aborted, with their steps merged in."""
+        with self._lock:
+            self._fh.flush()
+        return self._read_pending()
+
+    def _read_pending(self):
+        open_intents = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn final line from the crash; its intent was never durable
+                    continue
+                task = record.get("task")
+                op = record.pop("op", None)
+                if op == "begin":
+                    open_intents[task] = record
+                elif op == "step" and task in open_intents:
+                    open_intents[task].update(record)
+                elif op in ("commit", "abort"):
+                    open_intents.pop(task, None)
+        return list(open_intents.values())
+
+    def reset_if_idle(self):
+        """Empty the log once no intent in it, from any process, is still open."""
+        with self._lock:
+            if self._open:
+                return False
+        with self._shared(), self._lock:
+            self._fh.flush()
+            if self._read_pending():
+                return False
+            self._fh.truncate(0)
+            self._fh.seek(0)
+            return True
+
+    def close(self):
+        with self._lock:
+            self._fh.close()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Leases
+Coordination between processes, on one machine or several sharing the vault, through lease
+files under .state/leases/. A lease is claimed by creating its file with O_CREAT | O_EXCL,
+which is atomic on local filesystems and NFS and needs no fcntl, so it works on Windows too.
+
+The file records its owner and an expiry time. If the owner crashes, the lease can be taken
+over once it expires, or straight away from the same host once its process is gone. Expiry
+uses wall-clock time, so hosts sharing a vault need roughly synchronized clocks (NTP). A holder whose work may outlast the ttl keeps its leases alive
+with renew(), or with start_heartbeat(), which renews every held lease from a thread.
+
+    leases = LeaseManager.for_vault(project_root)
+    if leases.claim("Needs_Action/FILE_report.pdf.md"):
+        ...
+        leases.release("Needs_Action/FILE_report.pdf.md")
+
+    with vault_lock(project_root, "dashboard"):
+        ...  # single writer across all processes
+"""
+
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from atomic_io import atomic_write_text
+from vault_state import state_dir
+
+
+LEASES_DIR_NAME = "leases"
+DEFAULT_TTL = 600.0
+LOCK_TTL = 30.0
+LOCK_TIMEOUT = 60.0
+# A guard file is held for one read and one write, so one this old was left by a crash
+GUARD_STALE = 10.0
+
+HOST = socket.gethostname()
+OWNER = f"{HOST}:{os.getpid()}"
+
+
+def owner_is_dead(owner):
+    """True if `owner` ("host:pid") is a process on this host that no longer exists."""
+    host, _, pid = str(owner).rpartition(':')
+    # On Windows os.kill(pid, 0) sends CTRL_C_EVENT instead of probing, so rely on expiry there
+    if host != HOST or not pid.isdigit() or os.name == 'nt':
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        # EPERM: it exists, under another user
+        return False
+    return False
+
+
+class LeaseManager:
+    """Claims, renews and releases named leases for one owner (this process by default)."""
+
+    def __init__(self, lease_dir, ttl=DEFAULT_TTL, owner=None):
+        self.lease_dir = Path(lease_dir)
+        self.lease_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.owner = owner or OWNER
+        # Distinguishes this manager's claims from other threads of the same process
+        self.token = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._held = {}
+        self._heartbeat = None
+        self._heartbeat_stop = threading.Event()
+
+    @classmethod
+    def for_vault(cls, project_root, ttl=DEFAULT_TTL):
+        return cls(state_dir(project_root) / LEASES_DIR_NAME, ttl)
+
+    def _path(self, key):
+        return self.lease_dir / (hashlib.sha1(key.encode('utf-8')).hexdigest() + ".lease")
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _record(self, key):
+        return {"key": key, "owner": self.owner, "token": self.token,
+                "claimed_at": time.time(), "expires": time.time() + self.ttl}
+
+    def _is_live(self, path, record):
+        if record is None:
+            # Being written right now, or torn by a crash: judge by age
+            try:
+                return time.time() - path.stat().st_mtime < self.ttl
+            except FileNotFoundError:
+                return False
+        return record.get("expires", 0) > time.time() and not owner_is_dead(record.get("owner"))
+
+    @contextmanager
+    def _guarded(self, path, timeout=1.0):
+        """
+        Hold the O_EXCL guard file next to lease `path`. Breaking, renewing and releasing a
+        lease all read it, check it and then change it; the guard keeps one process from
+        doing that while another does, so an expiring lease can't be broken and claimed
+        anew between a renew's check and its write. Yields False if the guard stayed busy.
+        """
+        guard = path.with_name(path.name + ".guard")
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                os.close(os.open(str(guard), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+                break
+            except FileExistsError:
+                pass
+            try:
+                if time.time() - guard.stat().st_mtime > GUARD_STALE:
+                    guard.unlink()
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() >= deadline:
+                yield False
+                return
+            time.sleep(0.005)
+        try:
+            yield True
+        finally:
+            try:
+                guard.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _break(self, path, seen):
+        """Remove an expired lease. False if it was renewed or replaced by a fresh one meanwhile."""
+        with self._guarded(path) as guarded:
+            if not guarded:
+                return False
+            if not path.exists():
+                # Someone else broke it first
+                return True
+            if self._read(path) != seen:
+                return False
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            return True
+
+    def claim(self, key):
+        """Claim `key`. True if this manager now holds it, False if someone else does."""
+        path = self._path(key)
+        for _ in range(2):
+            try:
+                fd = os.open(str(path), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                current = self._read(path)
+                if self._is_live(path, current) or not self._break(path, current):
+                    return False
+                continue
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._record(key), f)
+            with self._lock:
+                self._held[key] = path
+            return True
+        return False
+
+    def holds(self, key):
+        with self._lock:
+            return key in self._held
+
+    def renew(self, key):
+        """
+        Push the expiry of a held lease out by another ttl. False if this manager no longer
+        holds it, in which case it is forgotten: once a lease has expired another process may
+        be taking it over, so it is not revived.
+        """
+        if not self.holds(key):
+            return False
+        path = self._path(key)
+        # Wait out a crashed process's guard rather than give the lease up
+        with self._guarded(path, timeout=GUARD_STALE + 1) as guarded:
+            current = self._read(path)
+            if (guarded and current is not None and current.get("token") == self.token
+                    and self._is_live(path, current)):
+                current["expires"] = time.time() + self.ttl
+                atomic_write_text(path, json.dumps(current), fsync=False)
+                return True
+        with self._lock:
+            self._held.pop(key, None)
+        return False
+
+    def renew_all(self):
+        """Renew every held lease; returns the keys that were lost."""
+        with self._lock:
+            keys = list(self._held)
+        return [key for key in keys if not self.renew(key)]
+
+    def start_heartbeat(self, interval=None):
+        """Renew held leases every `interval` seconds (a third of the ttl by default) until stopped."""
+        if self._heartbeat is not None:
+            return
+        interval = interval or self.ttl / 3
+
+        def beat():
+            while not self._heartbeat_stop.wait(interval):
+                try:
+                    for key in self.renew_all():
+                        print(f"✗ Lost lease on {key}: it expired and was taken over")
+                except OSError as e:
+                    print(f"✗ Error renewing leases: {e}")
+
+        self._heartbeat_stop.clear()
+        self._heartbeat = threading.Thread(target=beat, name="lease-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def stop_heartbeat(self):
+        if self._heartbeat is None:
+            return
+        self._heartbeat_stop.set()
+        self._heartbeat.join()
+        self._heartbeat = None
+
+    def release(self, key):
+        with self._lock:
+            path = self._held.pop(key, None)
+        if path is None:
+            return
+        with self._guarded(path) as guarded:
+            current = self._read(path)
+            # Without the guard, leave the lease to expire rather than risk removing a new holder's
+            if guarded and current is not None and current.get("token") == self.token:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def release_all(self):
+        with self._lock:
+            keys = list(self._held)
+        for key in keys:
+            self.release(key)
+
+    def holder(self, key):
+        """The live lease record for `key`, or None if it is free."""
+        path = self._path(key)
+        current = self._read(path)
+        return current if current is not None and self._is_live(path, current) else None
+
+
+class VaultLock:
+    """Blocking single-writer lock on top of a lease; a crashed holder's lock expires."""
+
+    def __init__(self, manager, name, timeout=LOCK_TIMEOUT, poll_interval=0.01):
+        self.manager = manager
+        self.name = name
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        delay = self.poll_interval
+        while not self.manager.claim(self.name):
+            if time.monotonic() >= deadline:
+                holder = self.manager.holder(self.name) or {}
+                raise TimeoutError(f"lock '{self.name}' held by {holder.get('owner', 'unknown')}")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    def release(self):
+        self.manager.release(self.name)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def vault_lock(project_root, name, ttl=LOCK_TTL, timeout=LOCK_TIMEOUT):
+    """A cross-process lock named `name` for the vault at `project_root`."""
+    return VaultLock(LeaseManager.for_vault(project_root, ttl), f"lock:{name}", timeout)
@@ -2,28 +2,51 @@
 """
 list-pending-tasks skill
 Lists all pending tasks in Needs_Action/ folder and all pending plans in Plans/ folder and root.
+Answers from the task index in .state/tasks.db, first applying any files changed since the last run
+(only folders that changed are listed); pass --rebuild to reconcile it with every folder from scratch.
+Pass --profile to run under cProfile.
 """
 
 import sys
 from pathlib import Path
 
+# Imported first: the startup stage it records includes the imports below
+from instrumentation import Metrics, profile_call
+from task_index import TaskIndex
 
-def list_pending_tasks():
+
+def list_pending_tasks(rebuild=False):
     """
     Lists all pending tasks in Needs_Action/ folder and all pending plans in Plans/ folder and root.
+
+    Args:
+        rebuild (bool): Rebuild the task index from a full listing instead of refreshing it
     """
     project_root = Path.cwd()
-    needs_action_dir = project_root / "Needs_Action"
-    plans_dir = project_root / "Plans"
+    metrics = Metrics("list_pending_tasks")
+    index = TaskIndex.for_vault(project_root)
+    metrics.mark_ready()
+
+    # First run (or explicit request): build the index from the folders
+    if rebuild or not index.is_built():
+        with metrics.timer("index_rebuild"):
+            indexed, removed = index.rebuild()
+        print(f"Task index rebuilt: {indexed} file(s) indexed, {removed} stale entries removed")
+        print()
+    else:
+        # Files created, edited or deleted by hand since the last run
+        with metrics.timer("index_refresh"):
+            index.refresh()
 
     print("## Pending Tasks in Needs_Action/")
     print()
 
     # List all .md files in Needs_Action/
-    needs_action_files = list(needs_action_dir.glob("*.md"))
+    with metrics.timer("index_query"):
+        needs_action_files = index.query(folders=["Needs_Action"], kind="task")
     if needs_action_files:
-        for file_path in needs_action_files:
-            print(f"- {file_path.name}")
+        for row in needs_action_files:
+            print(f"- {row['name']}")
         print()
     else:
         print("No pending tasks in Needs_Action/ folder.")
@@ -33,50 +56,48 @@ def list_pending_tasks():
     print()
 
     # List all plan files in Plans/ folder and root
-    plan_files = []
-    plan_files.extend(list(plans_dir.glob("Plan_*.md")))
-    plan_files.extend(list(project_root.glob("Plan_*.md")))
+    with metrics.timer("index_query"):
+        plan_files = index.query(folders=["Plans", ""], kind="plan")
 
     if plan_files:
         print("Pending plans found:")
-        for file_path in plan_files:
-            # Try to read the plan to check its status
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # Extract status from YAML frontmatter if available
-                status = "unknown"
-                lines = content.split('\n')
-                in_frontmatter = False
-                for line in lines:
-                    if line.strip() == '---' and not in_frontmatter:
-                        in_frontmatter = True
-                    elif line.strip() == '---' and in_frontmatter:
-                        break
-                    elif in_frontmatter and line.startswith('status:'):
-                        status = line.split(':', 1)[1].strip()
-                        break
-
-                status_display = f" (status: {status})" if status != "unknown" else ""
-                print(f"- {file_path.name}{status_display}")
-            except:
-                print(f"- {file_path.name} (could not read status)")
+        for row in plan_files:
+            status = row["status"]
+            status_display = f" (status: {status})" if status else ""
+            print(f"- {row['name']}{status_display}")
 
         print()
     else:
         print("No pending plans found.")
         print()
 
+    # Dead-lettered tasks, only mentioned when there are any
+    with metrics.timer("index_query"):
+        failed_files = index.query(folders=["Failed"], kind="task")
+    if failed_files:
+        print("## Failed Tasks")
+        print()
+        for row in failed_files:
+            print(f"- {row['name']}")
+        print()
+
     print("## Summary")
     print(f"- Tasks in Needs_Action/: {len(needs_action_files)}")
     print(f"- Plans in system: {len(plan_files)}")
+    if failed_files:
+        print(f"- Failed tasks (gave up after repeated errors): {len(failed_files)}")
 
+    index.close()
+    metrics.flush(project_root)
     return True
 
 
 def main():
-    list_pending_tasks()
+    rebuild = "--rebuild" in sys.argv[1:]
+    if "--profile" in sys.argv[1:]:
+        profile_call(list_pending_tasks, Path.cwd(), "list_pending_tasks", rebuild)
+    else:
+        list_pending_tasks(rebuild)
 
 
 if __name__ == "__main__":
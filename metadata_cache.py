@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Frontmatter metadata cache
+Caches the parsed frontmatter of vault markdown files in memory and in .state/metadata.db,
+keyed by path and validated against (st_mtime_ns, st_size, st_ino). Unchanged files are
+never reopened; changed files only have their frontmatter prefix read, not the body.
+"""
+
+import json
+import os
+import threading
+
+from frontmatter import read_metadata
+from vault_state import connect, state_dir
+
+
+DB_NAME = "metadata.db"
+
+
+class MetadataCache:
+    """Two-level (memory + SQLite) cache of frontmatter metadata."""
+
+    def __init__(self, db_path=None):
+        self._lock = threading.Lock()
+        self._memory = {}
+        self.hits = 0
+        self.misses = 0
+        self.conn = None
+        if db_path is not None:
+            self.conn = connect(db_path)
+            with self.conn:
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS metadata (
+                        path TEXT PRIMARY KEY,
+                        mtime_ns INTEGER NOT NULL,
+                        size INTEGER NOT NULL,
+                        inode INTEGER NOT NULL,
+                        data TEXT NOT NULL
+                    )
+                """)
+
+    @classmethod
+    def for_vault(cls, project_root):
+        return cls(state_dir(project_root) / DB_NAME)
+
+    @staticmethod
+    def _key(path):
+        return os.path.abspath(path)
+
+    def get(self, path, stat_result=None):
+        """Return the frontmatter of `path` as a dict (a fresh copy each call)."""
+        key = self._key(path)
+        stat_result = stat_result or os.stat(key)
+        signature = (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and cached[0] == signature:
+                self.hits += 1
+                return dict(cached[1])
+
+            if self.conn is not None:
+                row = self.conn.execute(
+                    "SELECT mtime_ns, size, inode, data FROM metadata WHERE path = ?", (key,)
+                ).fetchone()
+                if row and (row["mtime_ns"], row["size"], row["inode"]) == signature:
+                    metadata = json.loads(row["data"])
+                    self._memory[key] = (signature, metadata)
+                    self.hits += 1
+                    return dict(metadata)
+
+        metadata = read_metadata(key)
+
+        with self._lock:
+            self.misses += 1
+            self._memory[key] = (signature, metadata)
+            if self.conn is not None:
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?)",
+                        (key, signature[0], signature[1], signature[2], json.dumps(metadata)),
+                    )
+        return dict(metadata)
+
+    def forget(self, path):
+        """Drop a path that was moved or deleted."""
+        key = self._key(path)
+        with self._lock:
+            self._memory.pop(key, None)
+            if self.conn is not None:
+                with self.conn:
+                    self.conn.execute("DELETE FROM metadata WHERE path = ?", (key,))
+
+    def close(self):
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
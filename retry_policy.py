@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Retry policy
+Bookkeeping for tasks that fail. Each failed attempt is recorded in the task's own
+frontmatter, so the count survives restarts, is shared by every process on the vault and is
+visible in Obsidian:
+
+    attempts: 2
+    last_error: Permission denied: 'Plans/Plan_FILE_report.pdf.md'
+    next_attempt_at: 2026-10-18T14:03:00Z
+
+The scheduler holds a task back until next_attempt_at. The delay doubles with every
+attempt (30s, 1m, 2m, ... capped at 6h), with a little jitter so tasks that failed together
+don't all retry in the same second. Once a task has used up its attempts it is moved to
+Failed/ (the dead-letter folder) and stops consuming capacity; move it back to
+Needs_Action/ and delete the `attempts` line to try again.
+"""
+
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+
+from archive_layout import ArchiveLayout
+from frontmatter import read_metadata, rewrite_frontmatter
+
+
+FAILED_DIR_NAME = "Failed"
+DEFAULT_MAX_ATTEMPTS = 5
+BASE_DELAY = 30.0
+MAX_DELAY = 6 * 60 * 60.0
+JITTER = 0.1
+MAX_ERROR_LENGTH = 200
+
+
+def format_utc(timestamp):
+    return datetime.utcfromtimestamp(timestamp).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def error_summary(error):
+    """One frontmatter-safe line describing `error` (an exception or a message)."""
+    if isinstance(error, BaseException):
+        text = str(error) or type(error).__name__
+    else:
+        text = str(error or "task handler reported failure")
+    text = " ".join(text.split())
+    return text if len(text) <= MAX_ERROR_LENGTH else text[:MAX_ERROR_LENGTH - 1] + "…"
+
+
+class RetryPolicy:
+    """Counts failed attempts per task, schedules the next one, dead-letters after max_attempts."""
+
+    def __init__(self, project_root, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=BASE_DELAY,
+                 max_delay=MAX_DELAY, jitter=JITTER, clock=time.time):
+        self.project_root = Path(project_root)
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.clock = clock
+        self.failed_dir = self.project_root / FAILED_DIR_NAME
+        self._failed_layout = None
+
+    @property
+    def failed_layout(self):
+        if self._failed_layout is None:
+            self.failed_dir.mkdir(exist_ok=True)
+            self._failed_layout = ArchiveLayout(self.failed_dir)
+        return self._failed_layout
+
+    def delay(self, attempts):
+        """Seconds to wait after the `attempts`-th failure."""
+        delay = min(self.max_delay, self.base_delay * 2 ** max(0, attempts - 1))
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return delay
+
+    @staticmethod
+    def attempts(metadata):
+        try:
+            return int(metadata.get('attempts') or 0)
+        except ValueError:
+            return 0
+
+    def record_failure(self, task_path, error=None, metadata=None):
+        """
+        Count a failed attempt at `task_path`.
+
+        Returns the new path: the same file with its retry time set, or its place in Failed/
+        once it has failed max_attempts times.
+        """
+        task_path = Path(task_path)
+        if metadata is None:
+            metadata = read_metadata(task_path)
+        attempts = self.attempts(metadata) + 1
+        now = self.clock()
+        updates = {"attempts": attempts, "last_error": error_summary(error), "last_failed_at": format_utc(now)}
+
+        if attempts >= self.max_attempts:
+            updates["status"] = "failed"
+            rewrite_frontmatter(task_path, updates)
+            return self.failed_layout.place(task_path, metadata=dict(metadata, **updates))
+
+        updates["next_attempt_at"] = format_utc(now + self.delay(attempts))
+        rewrite_frontmatter(task_path, updates)
+        return task_path
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Task scheduler
+Orders Needs_Action/ tasks by urgency instead of directory order, using a heap.
+
+Each task gets a deadline: its `due` frontmatter field, or its arrival time (`detected_at`,
+`created`, or the file's mtime) plus the SLA of its priority, whichever is earlier:
+
+    priority   SLA
+    urgent     5 minutes
+    high       1 hour
+    normal     24 hours (default; task types can default differently)
+    low        7 days
+
+Tasks are dispatched earliest-deadline-first. A waiting task's deadline never moves while
+newer arrivals get later ones, so low-priority work ages its way to the front instead of
+starving behind a stream of urgent tasks, and the heap keys never need rebuilding.
+
+A task whose `next_attempt_at` (set by retry_policy.py after a failure) is still in the
+future waits in a second heap, ordered by that time, and joins the queue once it is due.
+
+Queue latency (arrival -> dispatch) and SLA misses are tracked per priority.
+"""
+
+import calendar
+import heapq
+import itertools
+import os
+import threading
+import time
+from datetime import datetime
+
+
+PRIORITIES = ("urgent", "high", "normal", "low")
+DEFAULT_PRIORITY = "normal"
+DEFAULT_SLA = {"urgent": 5 * 60, "high": 60 * 60, "normal": 24 * 60 * 60, "low": 7 * 24 * 60 * 60}
+
+# Latency samples kept per priority for percentiles
+MAX_SAMPLES = 10000
+
+TIMESTAMP_FORMATS = ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d")
+
+
+def parse_timestamp(value):
+    """Frontmatter date/datetime -> epoch seconds. A trailing Z means UTC, otherwise local time."""
+    if not value:
+        return None
+    value = value.strip().strip('"\'')
+    utc = value.endswith('Z')
+    value = value.rstrip('Z')
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return calendar.timegm(parsed.timetuple()) + parsed.microsecond / 1e6 if utc else parsed.timestamp()
+    return None
+
+
+def normalize_priority(value, default=DEFAULT_PRIORITY):
+    """Accept 'urgent'/'high'/'normal'/'low' or 0-3 (0 most urgent)."""
+    if value is None or value == "":
+        return default
+    value = str(value).strip().lower()
+    if value in PRIORITIES:
+        return value
+    if value.isdigit():
+        return PRIORITIES[min(int(value), len(PRIORITIES) - 1)]
+    return default
+
+
+class ScheduledTask:
+    __slots__ = ("path", "priority", "arrival", "due", "not_before", "dispatched")
+
+    def __init__(self, path, priority, arrival, due, not_before=None):
+        self.path = path
+        self.priority = priority
+        self.arrival = arrival
+        self.due = due
+        self.not_before = not_before
+        self.dispatched = None
+
+
+class TaskScheduler:
+    """Heap of pending task files, dispatched earliest-deadline-first."""
+
+    def __init__(self, read_metadata, type_priorities=None, sla=None, clock=time.time):
+        self.read_metadata = read_metadata
+        self.type_priorities = dict(type_priorities or {})
+        self.sla = dict(DEFAULT_SLA, **(sla or {}))
+        self.clock = clock
+        self._heap = []
+        self._delayed = []
+        self._queued = set()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._latencies = {priority: [] for priority in PRIORITIES}
+        self._dispatched = dict.fromkeys(PRIORITIES, 0)
+        self._late = dict.fromkeys(PRIORITIES, 0)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._heap)
+
+    @property
+    def delayed(self):
+        """Tasks waiting for their retry time."""
+        with self._lock:
+            return len(self._delayed)
+
+    def next_release(self):
+        """When the earliest delayed task becomes due, or None."""
+        with self._lock:
+            return self._delayed[0][0] if self._delayed else None
+
+    def classify(self, path, metadata=None):
+        """Work out a task's priority, arrival time and deadline from its frontmatter."""
+        if metadata is None:
+            metadata = self.read_metadata(path)
+        default = self.type_priorities.get(metadata.get('type'), DEFAULT_PRIORITY)
+        priority = normalize_priority(metadata.get('priority'), default)
+
+        arrival = parse_timestamp(metadata.get('detected_at')) or parse_timestamp(metadata.get('created'))
+        if arrival is None:
+            try:
+                arrival = os.stat(path).st_mtime
+            except OSError:
+                arrival = self.clock()
+
+        due = arrival + self.sla[priority]
+        explicit_due = parse_timestamp(metadata.get('due'))
+        if explicit_due is not None:
+            due = min(due, explicit_due)
+        return ScheduledTask(path, priority, arrival, due, parse_timestamp(metadata.get('next_attempt_at')))
+
+    def push(self, path, metadata=None):
+        """Queue a task file; a file already queued is ignored."""
+        with self._lock:
+            if path in self._queued:
+                return None
+            self._queued.add(path)
+        task = self.classify(path, metadata)
+        with self._lock:
+            if task.not_before is not None and task.not_before > self.clock():
+                heapq.heappush(self._delayed, (task.not_before, next(self._counter), task))
+            else:
+                self._enqueue(task)
+        return task
+
+    def _enqueue(self, task):
+        heapq.heappush(self._heap, (task.due, PRIORITIES.index(task.priority), task.arrival,
+                                    next(self._counter), task))
+
+    def push_many(self, paths):
+        for path in paths:
+            self.push(path)
+
+    def pop_batch(self, size):
+        """Dispatch up to `size` tasks, most urgent first, recording their queue latency."""
+        now = self.clock()
+        batch = []
+        with self._lock:
+            while self._delayed and self._delayed[0][0] <= now:
+                self._enqueue(heapq.heappop(self._delayed)[-1])
+            while self._heap and len(batch) < size:
+                task = heapq.heappop(self._heap)[-1]
+                self._queued.discard(task.path)
+                task.dispatched = now
+                self._record(task, now)
+                batch.append(task)
+        return batch
+
+    def _record(self, task, now):
+        samples = self._latencies[task.priority]
+        samples.append(max(0.0, now - task.arrival))
+        if len(samples) > MAX_SAMPLES:
+            del samples[:len(samples) - MAX_SAMPLES]
+        self._dispatched[task.priority] += 1
+        if now > task.due:
+            self._late[task.priority] += 1
+
+    def report(self, reset=False):
+        """Per-priority dispatch counts, queue latency percentiles (seconds) and SLA misses."""
+        with self._lock:
+            report = {}
+            for priority in PRIORITIES:
+                samples = sorted(self._latencies[priority])
+                if not samples:
+                    continue
+                report[priority] = {
+                    "dispatched": self._dispatched[priority],
+                    "p50_s": round(_percentile(samples, 50), 3),
+                    "p95_s": round(_percentile(samples, 95), 3),
+                    "max_s": round(samples[-1], 3),
+                    "sla_s": self.sla[priority],
+                    "late": self._late[priority],
+                }
+            if reset:
+                for priority in PRIORITIES:
+                    self._latencies[priority] = []
+                    self._dispatched[priority] = 0
+                    self._late[priority] = 0
+            return report
+
+
+def _percentile(sorted_samples, percent):
+    index = min(len(sorted_samples) - 1, int(round(percent / 100.0 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def format_duration(seconds):
+    if seconds < 120:
+        return f"{seconds:.1f}s"
+    if seconds < 2 * 3600:
+        return f"{seconds / 60:.1f}m"
+    if seconds < 2 * 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
+
+
+def format_report(report):
+    """Render report() as console lines."""
+    lines = ["Queue latency by priority (arrival -> dispatch):"]
+    for priority, stats in report.items():
+        lines.append(f"  {priority:<7} {stats['dispatched']:>6} task(s)  "
+                     f"p50 {format_duration(stats['p50_s']):>6}  p95 {format_duration(stats['p95_s']):>6}  "
+                     f"max {format_duration(stats['max_s']):>6}  "
+                     f"SLA {format_duration(stats['sla_s'])}: {stats['late']} late")
+    return lines
@@ -2,79 +2,822 @@
 """
 Bronze Tier Filesystem Watcher
 Monitors Inbox/ folder and processes new files automatically.
+On startup it first catches up on files that arrived while it was not running.
+Folders dropped into Inbox/ are walked in parallel and ingested file by file or as one task.
 """
 
+import os
 import sys
 import time
+import errno
+import queue
+import argparse
+import threading
 from pathlib import Path
 from datetime import datetime
+from functools import partial
 import shutil
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Imported first: the startup stage it records includes the imports below
+from instrumentation import Metrics
+from atomic_io import atomic_copy, atomic_write_text, temp_path_for
+from dedup_index import DedupIndex
+from dir_scanner import walk_files
+from frontmatter import rewrite_frontmatter
+from inbox_ledger import InboxLedger, signature
+from leases import LeaseManager
+from task_index import TaskIndex
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no reflink support
+    fcntl = None
+
+
+INGEST_MODES = ("copy", "hardlink", "reflink", "move", "auto")
+TREE_MODES = ("files", "group")
+
+# Files listed under a grouped folder task; the rest are summarized
+GROUP_LISTING_LIMIT = 50
+
+# How long a handed-off file's signature is kept to absorb late events for it; after that
+# the Inbox ledger alone keeps it from being ingested twice
+HANDED_OFF_TTL = 60.0
+
+# ioctl request number for FICLONE (linux/fs.h), supported by btrfs, xfs and others
+FICLONE = 0x40049409
+
+INGEST_LABELS = {
+    "copy": "Copied",
+    "hardlink": "Linked",
+    "reflink": "Cloned",
+    "move": "Moved",
+}
+
+
+def _reflink(source_path, dest_path):
+    if fcntl is None or not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "reflink not supported on this platform")
+    # Clone under a temporary name so a crash never leaves a partial payload
+    tmp_path = temp_path_for(dest_path)
+    with open(source_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.unlink(tmp_path)
+            raise
+    shutil.copystat(source_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+
+
+def _hardlink(source_path, dest_path):
+    # Link under a temporary name so an existing task payload is replaced atomically
+    tmp_path = dest_path.with_name(f".{dest_path.name}.link")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    os.link(source_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+
+
+def _move(source_path, dest_path):
+    """Rename into place; across devices, copy and then delete the original (shutil.move semantics)."""
+    try:
+        os.replace(source_path, dest_path)
+        return "move"
+    except OSError:
+        pass
+    atomic_copy(source_path, dest_path)
+    try:
+        os.unlink(source_path)
+    except OSError:
+        # Not allowed to remove it from Inbox/: it was copied after all
+        return "copy"
+    return "move"
+
+
+def place_file(source_path, dest_path, mode="copy"):
+    """
+    Put an Inbox file into Needs_Action/ using the cheapest strategy the filesystem allows.
+
+    Modes:
+        copy     - full byte copy to a temp file, renamed into place
+        hardlink - second name for the same inode, metadata-only
+        reflink  - copy-on-write clone (FICLONE), metadata-only where supported
+        move     - atomic rename; the file leaves Inbox/
+        auto     - reflink, then hardlink, then copy
+
+    Hardlink and reflink fall back to a copy when the filesystem refuses them (e.g. across
+    devices). Move falls back to a copy followed by deleting the original, so the file
+    still leaves Inbox/. Returns the mode that was actually used.
+    """
+    if mode == "auto":
+        attempts = ["reflink", "hardlink"]
+    elif mode == "copy":
+        attempts = []
+    else:
+        attempts = [mode]
+
+    for attempt in attempts:
+        try:
+            if attempt == "reflink":
+                _reflink(source_path, dest_path)
+            elif attempt == "hardlink":
+                _hardlink(source_path, dest_path)
+            elif attempt == "move":
+                return _move(source_path, dest_path)
+            return attempt
+        except (OSError, NotImplementedError):
+            # EXDEV across devices, EOPNOTSUPP/EINVAL without reflink, EPERM for links...
+            continue
+
+    atomic_copy(source_path, dest_path)
+    return "copy"
+
+
+class PendingFileTracker:
+    """
+    Tracks files that may still be being written and hands each one off once it is quiet.
+
+    A file is stable when its size and mtime have not changed for `quiet_period` seconds,
+    or as soon as the OS reports the writer closed it. All checks and hand-offs run on
+    the tracker's own thread so the watchdog dispatch thread never blocks.
+    """
+
+    def __init__(self, on_stable, quiet_period=0.5, poll_interval=0.1, handed_off_ttl=HANDED_OFF_TTL):
+        self.on_stable = on_stable
+        self.quiet_period = quiet_period
+        self.poll_interval = poll_interval
+        # path -> ((size, mtime_ns), last change time)
+        self._pending = {}
+        # paths whose writer closed them, handed off on the next pass
+        self._closed = set()
+        # path -> ((size, mtime_ns) at hand-off, when), so late events don't re-ingest it;
+        # oldest first, pruned after handed_off_ttl so a long-running watcher stays small
+        self._handed_off = {}
+        self.handed_off_ttl = handed_off_ttl
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pending-file-tracker", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _signature(path):
+        stat = path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def touch(self, path):
+        """Record activity on a file (created / modified)."""
+        with self._lock:
+            previous = self._pending.get(path)
+            signature = previous[0] if previous else None
+            self._pending[path] = (signature, time.monotonic())
+
+    def closed(self, path):
+        """The writer closed the file: hand it off without waiting for the quiet period."""
+        with self._lock:
+            self._pending.pop(path, None)
+            self._closed.add(path)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending) + len(self._closed)
+
+    def _hand_off(self, path):
+        try:
+            signature = self._signature(path)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            previous = self._handed_off.get(path)
+            if previous is not None and previous[0] == signature:
+                return
+            # Re-inserted at the end, keeping the map ordered by hand-off time
+            self._handed_off.pop(path, None)
+            # A folder's mtime doesn't see files added deeper down; walking it again is harmless
+            if not path.is_dir():
+                self._handed_off[path] = (signature, time.monotonic())
+        try:
+            self.on_stable(path)
+        except Exception as e:
+            print(f"✗ Error processing {path.name}: {e}", file=sys.stderr)
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            now = time.monotonic()
+            ready = []
+
+            with self._lock:
+                items = list(self._pending.items())
+                ready.extend(self._closed)
+                self._closed.clear()
+
+            for path, (signature, last_change) in items:
+                try:
+                    current = self._signature(path)
+                except FileNotFoundError:
+                    with self._lock:
+                        self._pending.pop(path, None)
+                    continue
+
+                with self._lock:
+                    if path not in self._pending:
+                        continue
+                    if current != signature:
+                        self._pending[path] = (current, now)
+                    elif now - self._pending[path][1] >= self.quiet_period:
+                        del self._pending[path]
+                        ready.append(path)
+
+            for path in ready:
+                self._hand_off(path)
+            self._prune_handed_off(now)
+
+    def _prune_handed_off(self, now):
+        with self._lock:
+            while self._handed_off:
+                path, (_, handed_off_at) = next(iter(self._handed_off.items()))
+                if now - handed_off_at < self.handed_off_ttl:
+                    break
+                del self._handed_off[path]
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class IngestionQueue:
+    """
+    Bounded queue of stable Inbox files consumed by a pool of ingestion workers.
+
+    When the queue is full, `put` blocks the pending-file tracker rather than the
+    watchdog thread, so a slow copy delays hand-off without losing events.
+    """
+
+    def __init__(self, ingest, workers=2, maxsize=1000, instrumentation=None):
+        self.ingest = ingest
+        self.maxsize = maxsize
+        self.instrumentation = instrumentation
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stats_lock = threading.Lock()
+        self.enqueued = 0
+        self.completed = 0
+        self._threads = []
+        for i in range(max(1, workers)):
+            thread = threading.Thread(target=self._worker, name=f"ingest-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def put(self, path, job=None):
+        """Queue `path` for ingest(), or for `job` (a callable taking the path) if given."""
+        self._queue.put((path, time.monotonic(), job))
+        with self._stats_lock:
+            self.enqueued += 1
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self.instrumentation is not None:
+                    self.instrumentation.observe("queue_wait", time.monotonic() - item[1])
+                (item[2] or self.ingest)(item[0])
+            finally:
+                if item is not None:
+                    with self._stats_lock:
+                        self.completed += 1
+                self._queue.task_done()
+
+    def metrics(self):
+        """Backpressure metrics: queue depth, age of the oldest waiting file, totals."""
+        with self._queue.mutex:
+            depth = len(self._queue.queue)
+            oldest = self._queue.queue[0][1] if depth else None
+        with self._stats_lock:
+            enqueued, completed = self.enqueued, self.completed
+        return {
+            "queue_depth": depth,
+            "queue_capacity": self.maxsize,
+            "oldest_age_seconds": round(time.monotonic() - oldest, 3) if oldest is not None else 0.0,
+            "enqueued": enqueued,
+            "completed": completed,
+            "in_flight": enqueued - completed - depth,
+        }
+
+    def stop(self):
+        """Drain queued files, then stop the workers."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+class TreeProgress:
+    """Progress of one folder dropped into Inbox/."""
+
+    def __init__(self, root):
+        self.root = root
+        self.task_stem = f"FILE_{root.name}"
+        self.started = time.monotonic()
+        self.found = 0
+        self.done = 0
+        self.failed = 0
+        self.placed = 0
+        self.total_bytes = 0
+        self.listing = []
+        self.modes = set()
+        self.seen = set()
+        self.walking = True
+        self.rewalk = False
+        self._lock = threading.Lock()
+
+    def found_one(self):
+        with self._lock:
+            self.found += 1
+
+    def finish_one(self, ok):
+        with self._lock:
+            self.done += 1
+            if not ok:
+                self.failed += 1
+
+    def placed_one(self, relative, size, mode):
+        with self._lock:
+            self.total_bytes += size
+            if mode is not None:
+                self.placed += 1
+                self.modes.add(mode)
+            if len(self.listing) < GROUP_LISTING_LIMIT:
+                self.listing.append(relative)
+
+    def summary(self):
+        with self._lock:
+            state = "walking" if self.walking else "listed"
+            return (f"{self.root.name}/: {self.done}/{self.found} file(s) ingested ({state}), "
+                    f"{self.failed} failed, {time.monotonic() - self.started:.1f}s")
+
+
+class TreeIngestor:
+    """
+    Ingests folders dropped into Inbox/.
+
+    Each folder is listed by parallel os.scandir workers (dir_scanner.walk_files) and its
+    files are fed to the shared ingestion queue, at most `max_in_flight` at a time per
+    folder. A 10k-file drop therefore takes turns with single files instead of filling the
+    queue ahead of them, and Needs_Action/ fills steadily rather than in one burst.
+
+    mode "files": every file becomes its own task, FILE_<folder>__<sub>__<name>.md.
+    mode "group": the tree is placed under Needs_Action/FILE_<folder>/ and gets one
+    folder_drop task, FILE_<folder>.md, once all its files are in.
+    """
+
+    def __init__(self, handler, mode="files", walkers=4, max_in_flight=100):
+        self.handler = handler
+        self.mode = mode
+        self.walkers = max(1, walkers)
+        self.max_in_flight = max(1, max_in_flight)
+        self._active = {}
+        self._threads = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def submit(self, root):
+        """Start ingesting the folder `root`; if it is already being ingested, walk it again after."""
+        with self._lock:
+            if self._stop.is_set():
+                return False
+            if root in self._active:
+                self._active[root].rewalk = True
+                return False
+            progress = self._active[root] = TreeProgress(root)
+            thread = threading.Thread(target=self._run, args=(progress,), name=f"tree-{root.name}", daemon=True)
+            self._threads = [t for t in self._threads if t.is_alive()] + [thread]
+        thread.start()
+        return True
+
+    def progress(self):
+        with self._lock:
+            return list(self._active.values())
+
+    def _run(self, progress):
+        handler = self.handler
+        ingest = self._ingest_grouped if self.mode == "group" else self._ingest_file
+        limit = threading.BoundedSemaphore(self.max_in_flight)
+        print(f"↳ Walking folder: {progress.root.name}/ ({self.walkers} worker(s))")
+        try:
+            while True:
+                with self._lock:
+                    progress.rewalk = False
+                with handler.instrumentation.timer("tree_walk"):
+                    self._walk(progress, ingest, limit)
+                # Files were added to the folder while it was being walked
+                with self._lock:
+                    if not progress.rewalk or self._stop.is_set():
+                        break
+        except Exception as e:
+            print(f"✗ Error walking {progress.root.name}/: {e}", file=sys.stderr)
+        finally:
+            progress.walking = False
+            # Wait for the files still in the queue
+            for _ in range(self.max_in_flight):
+                limit.acquire()
+
+        try:
+            if self.mode == "group" and not self._stop.is_set():
+                self._write_group_task(progress)
+            if handler.ingest_mode == "move":
+                _remove_empty_dirs(progress.root)
+        except Exception as e:
+            print(f"✗ Error finishing {progress.root.name}/: {e}", file=sys.stderr)
+
+        if self._stop.is_set():
+            print(f"↷ Folder {progress.summary()}; the rest is ingested on the next start")
+        else:
+            handler.instrumentation.observe("tree_total", time.monotonic() - progress.started)
+            handler.instrumentation.incr("trees_ingested")
+            print(f"✓ Folder {progress.summary()}")
+        with self._lock:
+            self._active.pop(progress.root, None)
+
+    def _walk(self, progress, ingest, limit):
+        handler = self.handler
+        for entry in walk_files(progress.root, self.walkers):
+            if self._stop.is_set():
+                # Resumed from the Inbox ledger on the next start
+                return
+            path = Path(entry.path)
+            if path in progress.seen or handler._is_ignored(path):
+                continue
+            progress.seen.add(path)
+            progress.found_one()
+            # At most max_in_flight files of this folder wait in the queue at once
+            limit.acquire()
+            handler.queue.put(path, job=partial(self._job, ingest, progress, limit))
+
+    @staticmethod
+    def _job(ingest, progress, limit, path):
+        try:
+            ok = ingest(progress, path)
+        except Exception as e:
+            print(f"✗ Error processing {path}: {e}", file=sys.stderr)
+            ok = False
+        finally:
+            limit.release()
+        progress.finish_one(ok)
+
+    def _ingest_file(self, progress, path):
+        name = path.relative_to(self.handler.inbox_path).as_posix()
+        return self.handler.ingest(path, name=name, tree=progress.root.name)
+
+    def _ingest_grouped(self, progress, path):
+        handler = self.handler
+        relative = path.relative_to(progress.root)
+        name = path.relative_to(handler.inbox_path).as_posix()
+        file_signature = signature(path.stat())
+
+        if handler.ledger is not None and handler.ledger.is_ingested(name, file_signature):
+            # Placed before a restart
+            progress.placed_one(relative.as_posix(), file_signature[2], None)
+            return True
+
+        dest_path = handler.needs_action_path / progress.task_stem / relative
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        with handler.instrumentation.timer("place"):
+            used_mode = place_file(path, dest_path, handler.ingest_mode)
+        handler.instrumentation.incr(f"placed_{used_mode}")
+        progress.placed_one(relative.as_posix(), file_signature[2], used_mode)
+        if handler.ledger is not None and used_mode != "move":
+            handler.ledger.record(name, file_signature, f"{progress.task_stem}.md")
+        return True
+
+    def _write_group_task(self, progress):
+        """One folder_drop task for the whole tree, written after its last file is placed."""
+        handler = self.handler
+        metadata_filename = f"{progress.task_stem}.md"
+        ledger_name = f"{progress.root.name}/"
+        if not progress.found:
+            return
+        # Re-walked after a restart with nothing new: the task was already written
+        if not progress.placed and handler.ledger is not None and handler.ledger.task_for(ledger_name):
+            return
+
+        detected_time = datetime.utcnow().isoformat() + 'Z'
+        used_mode = ",".join(sorted(progress.modes)) or handler.ingest_mode
+        label = INGEST_LABELS.get(used_mode, "Placed")
+        listing = "\n".join(f"- {relative}" for relative in sorted(progress.listing))
+        if progress.found > len(progress.listing):
+            listing += f"\n- … and {progress.found - len(progress.listing)} more"
+
+        metadata_content = f"""---
+type: folder_drop
+original_name: {progress.root.name}
+file_count: {progress.found}
+size_bytes: {progress.total_bytes}
+detected_at: {detected_time}
+ingest_mode: {used_mode}
+status: pending
+---
+## Dropped Folder
+Original: {progress.root.name}/
+{label} to: {progress.task_stem}/ ({progress.found} files)
+
+{listing}
+
+New item ready for processing.
+"""
+
+        metadata_path = handler.needs_action_path / metadata_filename
+        with handler.instrumentation.timer("metadata_write"):
+            atomic_write_text(metadata_path, metadata_content)
+        if handler.task_index is not None:
+            with handler.instrumentation.timer("index_update"):
+                handler.task_index.upsert(metadata_path, {"type": "folder_drop", "status": "pending",
+                                                          "detected_at": detected_time}, kind="task")
+        if handler.ledger is not None and progress.root.exists():
+            handler.ledger.record(ledger_name, signature(progress.root.stat()), metadata_filename)
+        handler.instrumentation.incr("files_ingested")
+        print(f"✓ Created metadata: {metadata_filename} ({progress.found} files)")
+
+    def stop(self):
+        """Stop walking; files already queued are still ingested."""
+        self._stop.set()
+        with self._lock:
+            threads = list(self._threads)
+        for thread in threads:
+            thread.join()
+
+
+def _remove_empty_dirs(root):
+    """Remove the folders a move-mode ingestion emptied, deepest first."""
+    for folder, _, _ in os.walk(root, topdown=False):
+        try:
+            os.rmdir(folder)
+        except OSError:
+            pass
+
 
 class InboxFileHandler(FileSystemEventHandler):
-    """Handles new file events in the Inbox folder."""
+    """Handles new file events in the Inbox folder, and in folders dropped into it."""
 
-    def __init__(self, inbox_path, needs_action_path):
+    def __init__(self, inbox_path, needs_action_path, quiet_period=0.5, workers=2, queue_size=1000,
+                 ingest_mode="copy", dedup_index=None, task_index=None, ledger=None,
+                 tree_mode="files", tree_walkers=4, tree_in_flight=100, leases=None):
         self.inbox_path = Path(inbox_path)
         self.needs_action_path = Path(needs_action_path)
+        self.ingest_mode = ingest_mode
+        self.dedup_index = dedup_index
+        self.task_index = task_index
+        self.ledger = ledger
+        # Task leases shared with the orchestrators, taken before touching a queued task
+        self.leases = leases
         self.needs_action_path.mkdir(parents=True, exist_ok=True)
+        self.instrumentation = Metrics("filesystem_watcher")
+        self.queue = IngestionQueue(self.ingest, workers=workers, maxsize=queue_size,
+                                    instrumentation=self.instrumentation)
+        self.trees = TreeIngestor(self, mode=tree_mode, walkers=tree_walkers, max_in_flight=tree_in_flight)
+        self.tracker = PendingFileTracker(self.hand_off, quiet_period=quiet_period)
+
+    def _relative_parts(self, source_path):
+        try:
+            return source_path.relative_to(self.inbox_path).parts
+        except ValueError:
+            return (source_path.name,)
+
+    def _is_ignored(self, source_path):
+        # Ignore temporary files and metadata files, and anything inside hidden folders
+        return (any(part.startswith('.') for part in self._relative_parts(source_path))
+                or source_path.suffix == '.tmp')
+
+    def _tree_root(self, source_path):
+        """The folder dropped into Inbox/ that `source_path` is inside, or None for a top-level entry."""
+        parts = self._relative_parts(source_path)
+        return self.inbox_path / parts[0] if len(parts) > 1 else None
+
+    def _activity(self, source_path, closed=False):
+        if self._is_ignored(source_path) or source_path == self.inbox_path:
+            return
+        tree_root = self._tree_root(source_path)
+        if tree_root is not None:
+            # A dropped folder is handed off once nothing in it has changed for the quiet period
+            self.tracker.touch(tree_root)
+        elif closed:
+            self.tracker.closed(source_path)
+        else:
+            self.tracker.touch(source_path)
+
+    def hand_off(self, path):
+        """Called by the tracker once `path` is stable: files are queued, folders are walked."""
+        if path.is_dir():
+            self.trees.submit(path)
+        else:
+            self.queue.put(path)
 
     def on_created(self, event):
-        """Called when a file is created in the watched directory."""
+        """Called when a file or folder is created in the watched directory."""
+        self._activity(Path(event.src_path))
+
+    def on_modified(self, event):
+        """Called when a file in the watched directory is written to."""
         if event.is_directory:
             return
 
-        source_path = Path(event.src_path)
+        self._activity(Path(event.src_path))
+
+    def on_moved(self, event):
+        """Files and folders renamed into place (e.g. from a .tmp name) are complete."""
+        self._activity(Path(event.dest_path), closed=True)
 
-        # Ignore temporary files and metadata files
-        if source_path.name.startswith('.') or source_path.suffix == '.tmp':
+    def on_closed(self, event):
+        """Called when a writer closes a file (inotify only)."""
+        if event.is_directory:
             return
 
+        self._activity(Path(event.src_path), closed=True)
+
+    def catch_up(self):
+        """
+        Queue the Inbox files that arrived or changed while the watcher was down, and walk
+        every folder in Inbox/ (files ingested before the restart are skipped by the ledger).
+        Returns (files, folders) queued.
+        """
+        if self.ledger is None:
+            return 0, 0
+        with self.instrumentation.timer("catch_up_scan"):
+            missing = self.ledger.reconcile(self.inbox_path, ignore=self._is_ignored)
+        # The queue is bounded, so a large backlog is fed in as the workers keep up
+        files = folders = 0
+        for path in missing:
+            if path.is_dir():
+                folders += self.trees.submit(path)
+            else:
+                self.queue.put(path)
+                files += 1
+        self.instrumentation.incr("caught_up", files)
+        return files, folders
+
+    def note_duplicate(self, task_name, duplicate_name, detected_time):
+        """
+        Record a re-drop in the frontmatter of the task it duplicates, while that task is
+        still waiting in Needs_Action/. The task's lease keeps an orchestrator from moving
+        it mid-rewrite; if one holds it, the duplicate stays in .state/dedup.db only.
+        """
+        task_path = self.needs_action_path / task_name
+        key = f"{self.needs_action_path.name}/{task_name}"
+        if self.leases is None or not task_path.is_file() or not self.leases.claim(key):
+            return False
         try:
-            # Wait a moment to ensure file is fully written
-            time.sleep(0.5)
+            # Processed between the check and the claim
+            if not task_path.is_file():
+                return False
+            rewrite_frontmatter(task_path, {
+                "duplicates": len(self.dedup_index.duplicates_of(task_name)),
+                "last_duplicate": duplicate_name,
+                "last_duplicate_at": detected_time,
+            })
+            return True
+        except OSError as e:
+            print(f"✗ Error noting duplicate on {task_name}: {e}")
+            return False
+        finally:
+            self.leases.release(key)
+
+    def metrics(self):
+        metrics = self.queue.metrics()
+        metrics["pending_writes"] = self.tracker.pending_count()
+        metrics["trees_active"] = len(self.trees.progress())
+        return metrics
+
+    def stop(self):
+        self.tracker.stop()
+        # Folder walks feed the queue, so they stop first
+        self.trees.stop()
+        self.queue.stop()
+
+    def ingest(self, source_path, name=None, tree=None):
+        """
+        Place a stable Inbox file into Needs_Action/ and write its metadata task.
 
+        `name` is the file's path relative to Inbox/ (its name, unless it is inside the
+        dropped folder `tree`). Returns False if the file could not be ingested.
+        """
+        metrics = self.instrumentation
+        reserved = None
+        try:
             # Get file info
             original_name = source_path.name
-            file_size = source_path.stat().st_size
+            name = name or original_name
+            file_signature = signature(source_path.stat())
+            file_size = file_signature[2]
+
+            # Caught up at startup and also reported by an event: ingest it once
+            if self.ledger is not None and self.ledger.is_ingested(name, file_signature):
+                return True
+
             detected_time = datetime.utcnow().isoformat() + 'Z'
 
-            # Copy file to Needs_Action with FILE_ prefix
-            dest_filename = f"FILE_{original_name}"
+            # Copy (or link / move) file to Needs_Action with FILE_ prefix;
+            # photos/2026/a.jpg becomes FILE_photos__2026__a.jpg
+            dest_filename = f"FILE_{name.replace('/', '__')}"
             dest_path = self.needs_action_path / dest_filename
+            metadata_filename = f"{dest_filename}.md"
+            tree_fields = f"source_tree: {tree}\nrelative_path: {name}\n" if tree else ""
+
+            # Same bytes already ingested under another name: reference it, don't re-task it
+            if self.dedup_index is not None:
+                with metrics.timer("dedup_check"):
+                    duplicate_of, digest = self.dedup_index.check_and_record(source_path, metadata_filename, dest_path)
+                if duplicate_of:
+                    self.dedup_index.record_duplicate(original_name, file_size, digest, duplicate_of)
+                    if self.ledger is not None:
+                        self.ledger.record(name, file_signature, duplicate_of)
+                    metrics.incr("duplicates_skipped")
+                    print(f"↺ Duplicate: {name} has the same content as {duplicate_of}, skipped")
+                    if self.note_duplicate(duplicate_of, name, detected_time):
+                        print(f"  ↳ Noted on {duplicate_of}")
+                    return True
+                reserved = metadata_filename
 
-            shutil.copy2(source_path, dest_path)
-            print(f"✓ Copied: {original_name} -> {dest_filename}")
+            with metrics.timer("place"):
+                used_mode = place_file(source_path, dest_path, self.ingest_mode)
+            metrics.incr(f"placed_{used_mode}")
+            label = INGEST_LABELS[used_mode]
+            print(f"✓ {label}: {name} -> {dest_filename}")
 
             # Create metadata file
-            metadata_filename = f"FILE_{original_name}.md"
             metadata_path = self.needs_action_path / metadata_filename
 
             metadata_content = f"""---
 type: file_drop
 original_name: {original_name}
-size_bytes: {file_size}
+{tree_fields}size_bytes: {file_size}
 detected_at: {detected_time}
+ingest_mode: {used_mode}
 status: pending
 ---
 ## Dropped File
-Original: {original_name}
-Copied to: {dest_filename}
+Original: {name}
+{label} to: {dest_filename}
 
 New item ready for processing.
 """
 
-            metadata_path.write_text(metadata_content, encoding='utf-8')
+            with metrics.timer("metadata_write"):
+                atomic_write_text(metadata_path, metadata_content)
+            # The task exists now; its dedup record stands whatever happens next
+            reserved = None
+            if self.task_index is not None:
+                with metrics.timer("index_update"):
+                    self.task_index.upsert(metadata_path, {"type": "file_drop", "status": "pending",
+                                                           "detected_at": detected_time}, kind="task")
+            if self.ledger is not None and used_mode != "move":
+                self.ledger.record(name, file_signature, metadata_filename)
+            metrics.incr("files_ingested")
             print(f"✓ Created metadata: {metadata_filename}")
+            return True
 
         except Exception as e:
+            metrics.incr("ingest_failed")
             print(f"✗ Error processing {source_path.name}: {e}", file=sys.stderr)
+            # Otherwise the same bytes sent again would be skipped as a duplicate of a task that doesn't exist
+            if reserved is not None:
+                try:
+                    self.dedup_index.forget(reserved)
+                except Exception as undo_error:
+                    print(f"✗ Error undoing dedup record for {reserved}: {undo_error}", file=sys.stderr)
+            return False
 
 
 def main():
     """Main entry point for the filesystem watcher."""
+    parser = argparse.ArgumentParser(description="Watch Inbox/ and turn dropped files into tasks")
+    parser.add_argument("--workers", type=int, default=2, metavar="N",
+                        help="number of ingestion worker threads (default 2)")
+    parser.add_argument("--queue-size", type=int, default=1000, metavar="N",
+                        help="maximum files waiting for ingestion (default 1000)")
+    parser.add_argument("--metrics-interval", type=float, default=10.0, metavar="SECONDS",
+                        help="how often to report a backlog while files are waiting (default 10)")
+    parser.add_argument("--ingest-mode", choices=INGEST_MODES, default="copy",
+                        help="how dropped files reach Needs_Action/ (default copy; "
+                             "hardlink/reflink/move fall back to copy across devices)")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="create a task even when the same bytes were already ingested")
+    parser.add_argument("--no-catch-up", action="store_true",
+                        help="don't ingest files that arrived in Inbox/ while the watcher was down")
+    parser.add_argument("--tree-mode", choices=TREE_MODES, default="files",
+                        help="folders dropped into Inbox/: one task per file (files, default) "
+                             "or one task for the whole folder (group)")
+    parser.add_argument("--tree-workers", type=int, default=4, metavar="N",
+                        help="folders of a dropped tree listed in parallel (default 4)")
+    parser.add_argument("--tree-in-flight", type=int, default=100, metavar="N",
+                        help="files per dropped folder queued for ingestion at once (default 100)")
+    args = parser.parse_args()
+
     # Get paths relative to script location
     script_dir = Path(__file__).parent.parent
     inbox_path = script_dir / "Inbox"
@@ -88,26 +831,65 @@ def main():
     print("=" * 60)
     print(f"Watching: {inbox_path.absolute()}")
     print(f"Output:   {needs_action_path.absolute()}")
+    print(f"Ingest:   {args.ingest_mode} (folders: {args.tree_mode})")
     print("Press Ctrl+C to stop")
     print("=" * 60)
 
     # Set up watchdog observer
-    event_handler = InboxFileHandler(inbox_path, needs_action_path)
+    dedup_index = None if args.no_dedup else DedupIndex.for_vault(script_dir)
+    task_index = TaskIndex.for_vault(script_dir)
+    ledger = InboxLedger.for_vault(script_dir, task_index)
+    leases = LeaseManager.for_vault(script_dir)
+    event_handler = InboxFileHandler(inbox_path, needs_action_path,
+                                     workers=args.workers, queue_size=args.queue_size,
+                                     ingest_mode=args.ingest_mode, dedup_index=dedup_index,
+                                     task_index=task_index, ledger=ledger, tree_mode=args.tree_mode,
+                                     tree_walkers=args.tree_workers, tree_in_flight=args.tree_in_flight,
+                                     leases=leases)
     observer = Observer()
-    observer.schedule(event_handler, str(inbox_path), recursive=False)
+    observer.schedule(event_handler, str(inbox_path), recursive=True)
 
     try:
         observer.start()
+        event_handler.instrumentation.mark_ready()
         print("✓ Watcher started successfully\n")
 
+        # After start(), so nothing dropped during the pass is missed
+        if not args.no_catch_up:
+            started = time.perf_counter()
+            files, folders = event_handler.catch_up()
+            if files or folders:
+                print(f"↻ Catching up: {files} file(s) arrived in Inbox/ while the watcher was down, "
+                      f"{folders} folder(s) to check (scanned in {time.perf_counter() - started:.3f}s)\n")
+
+        last_report = time.monotonic()
         while True:
             time.sleep(1)
 
+            # Report backpressure only while ingestion is behind
+            if time.monotonic() - last_report >= args.metrics_interval:
+                last_report = time.monotonic()
+                event_handler.instrumentation.flush(script_dir)
+                metrics = event_handler.metrics()
+                if metrics["queue_depth"] or metrics["pending_writes"]:
+                    print(f"… Ingestion backlog: {metrics['queue_depth']}/{metrics['queue_capacity']} queued, "
+                          f"oldest {metrics['oldest_age_seconds']:.1f}s, "
+                          f"{metrics['pending_writes']} still being written")
+                for progress in event_handler.trees.progress():
+                    print(f"… Folder {progress.summary()}")
+
     except KeyboardInterrupt:
         print("\n\nStopping watcher...")
         observer.stop()
 
     observer.join()
+    event_handler.stop()
+    event_handler.instrumentation.flush(script_dir)
+    if dedup_index is not None:
+        dedup_index.close()
+    task_index.close()
+    ledger.close()
+    leases.release_all()
     print("✓ Watcher stopped")
 
 
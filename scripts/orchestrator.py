@@ -4,19 +4,100 @@ Bronze Tier Orchestrator
 Processes tasks from Needs_Action/ using AI Agent Skills logic.
 """
 
+import os
 import sys
 import time
+import queue
+import argparse
+import importlib
+import threading
 from pathlib import Path
 from datetime import datetime
-import shutil
 import re
 
+try:
+    from watchdog.observers import Observer
+    from watchdog.observers.polling import PollingObserver
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # --watch falls back to polling Needs_Action/ when watchdog isn't installed
+    Observer = None
+    PollingObserver = None
+    FileSystemEventHandler = object
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Imported first: the startup stage it records includes the imports below
+from instrumentation import Metrics, profile_call
+from activity_log import log_many
+from archive_layout import ArchiveLayout
+from atomic_io import atomic_write_text
+from dir_scanner import DirectoryScanner
+from intent_log import IntentLog
+from leases import DEFAULT_TTL, LeaseManager
+from metadata_cache import MetadataCache
+from retry_policy import DEFAULT_MAX_ATTEMPTS, RetryPolicy
+from scheduler import TaskScheduler, format_report
+from task_index import TaskIndex
+from task_engine import DEFAULT_TYPE, HandlerRegistry, TaskEngine, TaskHandler, registry as plugin_handlers
+
+
+# How often an idle watch-mode orchestrator checks for tasks abandoned by crashed peers
+RECOVERY_INTERVAL = 60.0
+# Tasks dispatched from the priority queue per batch; urgent arrivals wait at most one batch
+DEFAULT_BATCH_SIZE = 100
+
+
+class NeedsActionHandler(FileSystemEventHandler):
+    """Feeds task files appearing in Needs_Action/ into the orchestrator's queue."""
+
+    def __init__(self, task_queue):
+        self.task_queue = task_queue
+
+    def _enqueue(self, path):
+        path = Path(path)
+        if path.suffix == '.md' and not path.name.startswith('.'):
+            self.task_queue.put(path)
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._enqueue(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._enqueue(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._enqueue(event.dest_path)
+
+
+class FileDropHandler(TaskHandler):
+    """Files dropped into Inbox/ by the watcher (task-analyzer + basic-file-handler logic)."""
+
+    task_type = "file_drop"
+
+    def handle(self, orchestrator, md_file, metadata):
+        return orchestrator.process_file_drop(md_file, metadata)
+
+
+class GenericTaskHandler(TaskHandler):
+    """Any task type without a handler of its own: plan, move to Done, log."""
+
+    task_type = DEFAULT_TYPE
+
+    def handle(self, orchestrator, md_file, metadata):
+        return orchestrator.process_generic(md_file)
+
 
 class BronzeTierOrchestrator:
     """Orchestrates task processing using agent skills."""
 
-    def __init__(self, project_root):
+    def __init__(self, project_root, workers=1, lease_ttl=DEFAULT_TTL, batch_size=DEFAULT_BATCH_SIZE,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS):
         self.project_root = Path(project_root)
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
         self.needs_action = self.project_root / "Needs_Action"
         self.done = self.project_root / "Done"
         self.plans = self.project_root / "Plans"
@@ -27,32 +108,64 @@ class BronzeTierOrchestrator:
         self.done.mkdir(exist_ok=True)
         self.plans.mkdir(exist_ok=True)
 
+        # Frontmatter cache shared with the skills, keyed by path + mtime + size + inode
+        self.metadata_cache = MetadataCache.for_vault(self.project_root)
+        self.task_index = TaskIndex.for_vault(self.project_root)
+        # Flat Done/ unless it was switched to the date-sharded layout
+        self.done_layout = ArchiveLayout(self.done)
+
+        # Per-stage timers and counters, flushed to Logs/ after every scan
+        self.metrics = Metrics("orchestrator")
+        # Write-ahead record of in-flight tasks, replayed by recover() after a crash
+        self.intent_log = IntentLog.for_vault(self.project_root)
+        # Per-task leases let several orchestrators (and skills) share one vault; the
+        # heartbeat keeps them from expiring under a slow batch or handler
+        self.leases = LeaseManager.for_vault(self.project_root, lease_ttl)
+        self.leases.start_heartbeat()
+
+        # Task type -> handler; plugins registered through task_engine override the built-ins
+        self.handlers = HandlerRegistry()
+        self.handlers.register(GenericTaskHandler())
+        self.handlers.register(FileDropHandler())
+        self.handlers.extend(plugin_handlers)
+        self.engine = TaskEngine(self.handlers, self, self.read_metadata, workers=self.workers,
+                                 metrics=self.metrics, before_task=self.start_task)
+        # Failed tasks back off exponentially, then go to Failed/
+        self.retry = RetryPolicy(self.project_root, max_attempts)
+        # Earliest-deadline-first queue over priority/due frontmatter
+        self.scheduler = TaskScheduler(self.read_metadata, self.handlers.priorities())
+        # Snapshot of Needs_Action/; a pass where nothing arrived doesn't relist the folder
+        self.needs_action_scanner = DirectoryScanner(self.needs_action, "*.md")
+        # Tasks the last scan left in Needs_Action/ (failed, or claimed by another process)
+        self.unfinished = 0
+
+        # Activity queued during a scan, flushed to Dashboard.md in one write.
+        # Workers only append; flush_dashboard is the single writer.
+        self.pending_activity = []
+        self._activity_lock = threading.Lock()
+        self.metrics.mark_ready()
+
     def read_metadata(self, file_path):
         """Extract frontmatter metadata from a markdown file."""
         try:
-            content = file_path.read_text(encoding='utf-8')
-
-            # Extract frontmatter
-            if content.startswith('---'):
-                parts = content.split('---', 2)
-                if len(parts) >= 3:
-                    frontmatter = parts[1].strip()
-                    metadata = {}
-                    for line in frontmatter.split('\n'):
-                        if ':' in line:
-                            key, value = line.split(':', 1)
-                            metadata[key.strip()] = value.strip()
-                    return metadata
+            with self.metrics.timer("metadata_read"):
+                return self.metadata_cache.get(file_path)
         except Exception as e:
             print(f"✗ Error reading metadata from {file_path.name}: {e}")
 
         return {}
 
+    def _relative(self, path):
+        return Path(os.path.relpath(path, self.project_root)).as_posix()
+
+    def plan_path_for(self, task_file):
+        return self.plans / f"Plan_{task_file.stem}.md"
+
     def create_plan(self, task_file):
         """Create a plan file for the given task (basic-file-handler skill logic)."""
         try:
-            plan_name = f"Plan_{task_file.stem}.md"
-            plan_path = self.plans / plan_name
+            plan_path = self.plan_path_for(task_file)
+            plan_name = plan_path.name
 
             created_time = datetime.utcnow().isoformat() + 'Z'
 
@@ -67,7 +180,10 @@ created: {created_time}
 - [ ] Log to Dashboard
 """
 
-            plan_path.write_text(plan_content, encoding='utf-8')
+            with self.metrics.timer("plan_write"):
+                atomic_write_text(plan_path, plan_content)
+            with self.metrics.timer("index_update"):
+                self.task_index.upsert(plan_path, {"created": created_time}, kind="plan")
             print(f"✓ Created plan: {plan_name}")
             return plan_name
 
@@ -78,8 +194,13 @@ created: {created_time}
     def move_to_done(self, file_path):
         """Move file from Needs_Action to Done."""
         try:
-            dest_path = self.done / file_path.name
-            shutil.move(str(file_path), str(dest_path))
+            metadata = self.read_metadata(file_path) if self.done_layout.sharded else None
+            with self.metrics.timer("move"):
+                dest_path = self.done_layout.place(file_path, metadata=metadata)
+            self.metadata_cache.forget(file_path)
+            self.intent_log.step(self._relative(file_path), done=self._relative(dest_path))
+            with self.metrics.timer("index_update"):
+                self.task_index.move(file_path, dest_path)
             print(f"✓ Moved to Done: {file_path.name}")
             return True
         except Exception as e:
@@ -87,30 +208,29 @@ created: {created_time}
             return False
 
     def update_dashboard(self, message):
-        """Append activity log to Dashboard.md."""
+        """Queue an activity entry for Dashboard.md (written by flush_dashboard)."""
+        with self._activity_lock:
+            self.pending_activity.append(message)
+        return True
+
+    def flush_dashboard(self):
+        """Write all queued activity entries to Dashboard.md in a single update."""
+        with self._activity_lock:
+            messages, self.pending_activity = self.pending_activity, []
+        if not messages:
+            return True
+
         try:
             if not self.dashboard.exists():
                 # Create dashboard if it doesn't exist
-                self.dashboard.write_text("# AI Employee Dashboard\n\n## Recent Activity\n", encoding='utf-8')
-
-            content = self.dashboard.read_text(encoding='utf-8')
-
-            # Find the Recent Activity section
-            if "## Recent Activity" in content:
-                timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M")
-                log_entry = f"   - [{timestamp}] {message}\n"
-
-                # Insert after "## Recent Activity" line
-                lines = content.split('\n')
-                new_lines = []
-                for i, line in enumerate(lines):
-                    new_lines.append(line)
-                    if line.strip() == "## Recent Activity":
-                        new_lines.append(log_entry.rstrip())
-
-                new_content = '\n'.join(new_lines)
-                self.dashboard.write_text(new_content, encoding='utf-8')
-                print(f"✓ Updated Dashboard: {message}")
+                atomic_write_text(self.dashboard, "# AI Employee Dashboard\n\n## Recent Activity\n")
+
+            with self.metrics.timer("dashboard_update"):
+                logged = log_many(messages, self.project_root)
+
+            if logged:
+                for message in messages:
+                    print(f"✓ Updated Dashboard: {message}")
                 return True
             else:
                 print("✗ Dashboard.md missing '## Recent Activity' section")
@@ -120,11 +240,12 @@ created: {created_time}
             print(f"✗ Error updating dashboard: {e}")
             return False
 
-    def process_file_drop(self, metadata_file):
+    def process_file_drop(self, metadata_file, metadata=None):
         """Process a file_drop type task (task-analyzer + basic-file-handler logic)."""
         print(f"\n📋 Processing: {metadata_file.name}")
 
-        metadata = self.read_metadata(metadata_file)
+        if metadata is None:
+            metadata = self.read_metadata(metadata_file)
 
         if metadata.get('type') == 'file_drop':
             original_name = metadata.get('original_name', 'unknown')
@@ -142,14 +263,32 @@ created: {created_time}
 
         return False
 
+    def process_task(self, md_file):
+        """Route a single task file to the handler registered for its type."""
+        return self.engine.run([md_file])[0]
+
+    def process_generic(self, md_file):
+        """Fallback for task types without a dedicated handler."""
+        print(f"\n📋 Processing: {md_file.name}")
+        plan_name = self.create_plan(md_file)
+        if self.move_to_done(md_file):
+            self.update_dashboard(f"Processed {md_file.name} → plan created, moved to Done")
+            return True
+        return False
+
     def scan_and_process(self):
         """Scan Needs_Action folder and process all pending tasks."""
         print("\n" + "=" * 60)
         print("Bronze Tier Orchestrator - Scanning for tasks...")
         print("=" * 60)
 
-        # Find all .md files in Needs_Action
-        md_files = list(self.needs_action.glob("*.md"))
+        # Finish whatever a crashed run (ours or another process's) left in flight
+        self.recover()
+
+        # Find all .md files in Needs_Action; skip the pass if nothing arrived and nothing is left to retry
+        with self.metrics.timer("scan"):
+            changes = self.needs_action_scanner.scan()
+        md_files = self.needs_action_scanner.paths() if changes or self.unfinished else []
 
         if not md_files:
             print("No tasks found in Needs_Action/")
@@ -157,32 +296,219 @@ created: {created_time}
 
         print(f"Found {len(md_files)} task(s) to process\n")
 
-        processed = 0
-        for md_file in md_files:
-            try:
-                metadata = self.read_metadata(md_file)
-
-                # Route to appropriate handler based on type
-                if metadata.get('type') == 'file_drop':
-                    if self.process_file_drop(md_file):
-                        processed += 1
-                else:
-                    # Generic handler for other types
-                    print(f"\n📋 Processing: {md_file.name}")
-                    plan_name = self.create_plan(md_file)
-                    if self.move_to_done(md_file):
-                        self.update_dashboard(f"Processed {md_file.name} → plan created, moved to Done")
-                        processed += 1
-
-            except Exception as e:
-                print(f"✗ Error processing {md_file.name}: {e}")
+        started = time.perf_counter()
+        self.scheduler.push_many(md_files)
+        processed = self.drain_scheduled()
+        elapsed = time.perf_counter() - started
+        self.unfinished = len(md_files) - processed
 
         print(f"\n{'=' * 60}")
         print(f"✓ Processed {processed}/{len(md_files)} tasks successfully")
+        if self.scheduler.delayed:
+            print(f"↷ {self.scheduler.delayed} failed task(s) waiting to retry")
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        print(f"  {elapsed:.3f}s with {self.workers} worker(s) ({rate:.1f} tasks/sec)")
+        self.print_latency_report()
         print("=" * 60)
 
         return processed
 
+    def drain_scheduled(self, incoming=None):
+        """
+        Process queued tasks in priority order, one batch at a time. With `incoming` (a queue
+        of new task paths), arrivals are scheduled between batches so urgent ones jump ahead.
+        """
+        processed = 0
+        while True:
+            if incoming is not None:
+                while True:
+                    try:
+                        path = incoming.get_nowait()
+                    except queue.Empty:
+                        break
+                    if path.exists():
+                        self.scheduler.push(path)
+
+            batch = self.scheduler.pop_batch(self.batch_size)
+            if not batch:
+                return processed
+            for task in batch:
+                self.metrics.observe(f"queue_latency_{task.priority}", task.dispatched - task.arrival)
+            processed += self.process_many([task.path for task in batch])
+
+    def print_latency_report(self):
+        report = self.scheduler.report(reset=True)
+        if report:
+            for line in format_report(report):
+                print(line)
+
+    def claim_tasks(self, md_files):
+        """Lease the task files no other process is working on; skip the rest."""
+        claimed = []
+        for md_file in md_files:
+            task = self._relative(md_file)
+            if not self.leases.claim(task):
+                continue
+            if not md_file.exists():
+                # Finished by another process between our scan and the claim
+                self.leases.release(task)
+                continue
+            claimed.append(md_file)
+
+        skipped = len(md_files) - len(claimed)
+        if skipped:
+            print(f"↷ Skipped {skipped} task(s) claimed or finished by another process")
+        return claimed
+
+    def start_task(self, md_file):
+        """Called right before a task's handler runs: renew its lease, or skip it if the lease was lost."""
+        task = self._relative(md_file)
+        if not self.leases.renew(task):
+            print(f"↷ Lease on {md_file.name} expired before it started; left to the process that took it over")
+            return False
+        # Only started tasks count an attempt if we crash; flushed, so it survives a process crash
+        self.intent_log.step(task, started=True)
+        return True
+
+    def process_many(self, md_files):
+        """Run task files through their handlers concurrently, then flush the dashboard once."""
+        md_files = self.claim_tasks(md_files)
+        if not md_files:
+            return 0
+        tasks = [self._relative(md_file) for md_file in md_files]
+        self.intent_log.begin_many({"task": task, "plan": self._relative(self.plan_path_for(md_file))}
+                                   for task, md_file in zip(tasks, md_files))
+
+        results = self.engine.run(md_files)
+        # Skipped tasks belong to another process now and were never attempted here
+        self.record_failures((md_file, self.engine.errors.get(md_file))
+                             for md_file, result in zip(md_files, results)
+                             if not result and md_file not in self.engine.skipped)
+
+        self.flush_dashboard()
+        # Tasks count as done only once their dashboard entry is written
+        self.intent_log.commit_many(task for task, result in zip(tasks, results) if result)
+        self.intent_log.abort_many(task for task, result in zip(tasks, results) if not result)
+        for task in tasks:
+            self.leases.release(task)
+        self.intent_log.reset_if_idle()
+        self.flush_metrics()
+        return sum(1 for result in results if result)
+
+    def record_failures(self, failures):
+        """Count a failed attempt for each (task file, error) still in Needs_Action/ and schedule its retry."""
+        retrying = []
+        for md_file, error in failures:
+            if not md_file.is_file():
+                continue
+            try:
+                with self.metrics.timer("retry_update"):
+                    new_path = self.retry.record_failure(md_file, error)
+                self.metadata_cache.forget(md_file)
+            except Exception as e:
+                print(f"✗ Error recording failure of {md_file.name}: {e}")
+                continue
+
+            if new_path != md_file:
+                self.task_index.move(md_file, new_path, status="failed")
+                self.update_dashboard(f"Gave up on {md_file.name} after {self.retry.max_attempts} "
+                                      f"attempts → moved to Failed")
+                print(f"✗ Moved to Failed after {self.retry.max_attempts} attempts: {md_file.name}")
+                self.metrics.incr("tasks_dead_lettered")
+            else:
+                self.metrics.incr("tasks_retried")
+                retrying.append(md_file)
+
+        # Back into the scheduler's delayed heap; watch mode may never see another event for them
+        self.scheduler.push_many(retrying)
+
+    def _find_done(self, intent):
+        """Where an interrupted task ended up in Done/, or None if it never got there."""
+        name = Path(intent["task"]).name
+        candidates = [self.done / name, self.done_layout.shard_dir() / name]
+        if intent.get("done"):
+            candidates.insert(0, self.project_root / intent["done"])
+        try:
+            began = datetime.strptime(intent.get("ts", "")[:19], "%Y-%m-%dT%H:%M:%S")
+            candidates.append(self.done_layout.shard_dir(began) / name)
+        except ValueError:
+            pass
+        for candidate in candidates:
+            if candidate.exists():
+                return candidate
+        return None
+
+    def recover(self):
+        """
+        Finish or roll back the tasks a crash left in flight, from the intent log alone.
+
+        - task still in Needs_Action/ whose handler had started: count the interrupted attempt
+          and let the scheduler retry it after the usual backoff, so a task that crashes the
+          orchestrator every time still ends up in Failed/ (plan writes are idempotent)
+        - task still in Needs_Action/ that never started (later in the crashed batch): abort
+          the intent and queue it again, without an attempt
+        - task already in Done/: bring the index up to date and log its dashboard entry
+        - task gone from both: delete the plan written for it
+        """
+        # Intents whose lease is still live belong to a running process, not a crashed one
+        pending = [intent for intent in self.intent_log.pending() if self.leases.claim(intent["task"])]
+        if not pending:
+            return 0
+
+        print(f"Recovering {len(pending)} interrupted task(s)...")
+        finished, rolled_back = [], []
+        for intent in pending:
+            task_path = self.project_root / intent["task"]
+            plan_path = self.project_root / intent["plan"]
+
+            if task_path.is_file():
+                if intent.get("started"):
+                    print(f"↷ Interrupted task counted as a failed attempt: {task_path.name}")
+                    self.record_failures([(task_path, "interrupted while processing (orchestrator stopped)")])
+                else:
+                    print(f"↻ Interrupted before it started, queued again: {task_path.name}")
+                    self.scheduler.push(task_path)
+                rolled_back.append(intent["task"])
+                continue
+
+            done_path = self._find_done(intent)
+            if done_path is not None:
+                self.task_index.move(task_path, done_path)
+                self.update_dashboard(f"Processed {task_path.name} → plan created, moved to Done")
+                print(f"✓ Finished interrupted task: {task_path.name}")
+                finished.append(intent["task"])
+            else:
+                if plan_path.exists():
+                    plan_path.unlink()
+                self.task_index.remove(plan_path)
+                print(f"✓ Rolled back interrupted task: {task_path.name}")
+                rolled_back.append(intent["task"])
+
+        self.flush_dashboard()
+        self.intent_log.commit_many(finished)
+        self.intent_log.abort_many(rolled_back)
+        for intent in pending:
+            self.leases.release(intent["task"])
+        self.intent_log.reset_if_idle()
+        print(f"✓ Recovery complete: {len(finished)} finished, {len(rolled_back)} rolled back\n")
+        return len(pending)
+
+    def flush_metrics(self):
+        try:
+            self.metrics.flush(self.project_root)
+        except OSError as e:
+            print(f"✗ Error writing metrics: {e}")
+
+    def close(self):
+        """Stop the handler pool and release the vault state this orchestrator holds open."""
+        self.engine.close()
+        self.needs_action_scanner.close()
+        self.leases.stop_heartbeat()
+        self.leases.release_all()
+        self.intent_log.close()
+        self.metadata_cache.close()
+        self.task_index.close()
+
     def run_loop(self, interval=60):
         """Run orchestrator in continuous loop."""
         print("Starting orchestrator in loop mode (Ctrl+C to stop)")
@@ -196,20 +522,145 @@ created: {created_time}
         except KeyboardInterrupt:
             print("\n\nStopping orchestrator...")
 
+    def _start_observer(self, task_queue):
+        """Subscribe to Needs_Action/ with watchdog, falling back to its polling observer."""
+        handler = NeedsActionHandler(task_queue)
+        for observer_class in (Observer, PollingObserver):
+            observer = observer_class()
+            observer.schedule(handler, str(self.needs_action), recursive=False)
+            try:
+                observer.start()
+                return observer
+            except OSError as e:
+                # e.g. inotify watch limit reached
+                print(f"✗ {observer_class.__name__} unavailable ({e}), trying polling")
+        return None
+
+    def _poll_needs_action(self, task_queue, stop_event, poll_interval):
+        """Fallback when watchdog is missing: queue task files as they appear or change."""
+        scanner = DirectoryScanner(self.needs_action, "*.md")
+        scanner.scan()
+        try:
+            while not stop_event.wait(poll_interval):
+                changes = scanner.scan()
+                for path in changes.added + changes.changed:
+                    task_queue.put(path)
+        finally:
+            scanner.close()
+
+    def run_watch(self, settle=0.05, poll_interval=1.0):
+        """Process tasks as soon as they land in Needs_Action/ instead of on a timer."""
+        print("Starting orchestrator in watch mode (Ctrl+C to stop)")
+
+        # Anything that arrived while we were down
+        self.scan_and_process()
+
+        task_queue = queue.Queue()
+        stop_event = threading.Event()
+        observer = self._start_observer(task_queue) if Observer is not None else None
+        if observer is None:
+            print(f"watchdog not available, polling Needs_Action/ every {poll_interval} seconds")
+            threading.Thread(target=self._poll_needs_action,
+                             args=(task_queue, stop_event, poll_interval), daemon=True).start()
+
+        print(f"Watching: {self.needs_action}\n")
+
+        last_recovery = time.monotonic()
+        try:
+            while True:
+                try:
+                    # Timeout keeps Ctrl+C responsive on Windows
+                    first = task_queue.get(timeout=1.0)
+                except queue.Empty:
+                    # Failed tasks whose backoff has run out
+                    release = self.scheduler.next_release()
+                    if release is not None and release <= time.time():
+                        self.drain_scheduled(task_queue)
+                    # Pick up tasks left in flight by another orchestrator that died
+                    if time.monotonic() - last_recovery >= RECOVERY_INTERVAL:
+                        last_recovery = time.monotonic()
+                        self.recover()
+                    continue
+
+                # Coalesce the created/modified events a single write produces
+                batch = {first}
+                deadline = time.monotonic() + settle
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.add(task_queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                self.scheduler.push_many(md_file for md_file in sorted(batch) if md_file.exists())
+                self.drain_scheduled(task_queue)
+
+        except KeyboardInterrupt:
+            print("\n\nStopping orchestrator...")
+            self.print_latency_report()
+        finally:
+            stop_event.set()
+            if observer is not None:
+                observer.stop()
+                observer.join()
+
 
 def main():
     """Main entry point."""
     project_root = Path(__file__).parent.parent if Path(__file__).parent.name == "scripts" else Path(__file__).parent
 
-    orchestrator = BronzeTierOrchestrator(project_root)
-
-    # Check command line arguments
-    if len(sys.argv) > 1 and sys.argv[1] == "--loop":
-        interval = int(sys.argv[2]) if len(sys.argv) > 2 else 60
-        orchestrator.run_loop(interval)
+    parser = argparse.ArgumentParser(description="Process tasks from Needs_Action/")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--loop", nargs="?", type=int, const=60, metavar="INTERVAL",
+                      help="rescan Needs_Action/ every INTERVAL seconds (default 60)")
+    mode.add_argument("--watch", action="store_true",
+                      help="process tasks as soon as they appear in Needs_Action/")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="threads for blocking handlers and file I/O (default 1)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, metavar="N",
+                        help="tasks dispatched per batch from the priority queue "
+                             f"(default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS, metavar="N",
+                        help="move a task to Failed/ after N failed attempts "
+                             f"(default {DEFAULT_MAX_ATTEMPTS})")
+    parser.add_argument("--plugin", action="append", default=[], metavar="MODULE",
+                        help="import MODULE (from the vault root) to register extra task handlers")
+    parser.add_argument("--lease-ttl", type=float, default=DEFAULT_TTL, metavar="SECONDS",
+                        help="how long a claimed task stays reserved if this process dies "
+                             f"(default {DEFAULT_TTL:.0f})")
+    parser.add_argument("--profile", action="store_true",
+                        help="run under cProfile and write the stats to Logs/")
+    args = parser.parse_args()
+
+    for module_name in args.plugin:
+        importlib.import_module(module_name)
+        print(f"✓ Loaded plugin {module_name}")
+
+    orchestrator = BronzeTierOrchestrator(project_root, workers=args.workers, lease_ttl=args.lease_ttl,
+                                          batch_size=args.batch_size, max_attempts=args.max_attempts)
+    if args.plugin:
+        print(f"  Task handlers: {', '.join(orchestrator.handlers.types())}")
+    if args.profile:
+        # cProfile sees only this thread, so handlers run here rather than on the pool
+        orchestrator.engine.inline = True
+
+    if args.watch:
+        run, run_args = orchestrator.run_watch, ()
+    elif args.loop is not None:
+        run, run_args = orchestrator.run_loop, (args.loop,)
     else:
         # Single run mode
-        orchestrator.scan_and_process()
+        run, run_args = orchestrator.scan_and_process, ()
+
+    try:
+        if args.profile:
+            profile_call(run, project_root, "orchestrator", *run_args)
+        else:
+            run(*run_args)
+    finally:
+        orchestrator.close()
 
 
 if __name__ == "__main__":
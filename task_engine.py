@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Task engine
+Asyncio core that routes each task to the handler registered for its frontmatter `type`.
+Every handler declares how many of its tasks may run at once, so a slow handler (say, one
+that talks to a mail server) only queues its own tasks and never the whole pipeline.
+Blocking handlers run on a shared thread pool through run_in_executor; async handlers run
+on the event loop directly.
+
+New task types plug in with a decorator, typically from a module passed to
+`orchestrator.py --plugin`:
+
+    from task_engine import task_handler
+
+    @task_handler("email", concurrency=2)
+    def handle_email(orchestrator, md_file, metadata):
+        ...
+        return True
+"""
+
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_TYPE = "*"
+
+# Returned in place of a handler's result when before_task declined the task
+_SKIPPED = object()
+
+
+class TaskHandler:
+    """
+    Handles one task type. Subclasses set task_type and concurrency and implement either
+    handle() (blocking, run in the executor) or handle_async() (a coroutine).
+
+    concurrency=None means "as many as the executor allows". priority is the scheduling
+    priority for tasks of this type that don't set one in their frontmatter.
+    """
+
+    task_type = DEFAULT_TYPE
+    concurrency = None
+    priority = None
+
+    def handle(self, context, md_file, metadata):
+        raise NotImplementedError
+
+    async def handle_async(self, context, md_file, metadata, loop, executor):
+        return await loop.run_in_executor(executor, self.handle, context, md_file, metadata)
+
+
+class FunctionHandler(TaskHandler):
+    """Adapts a plain function or coroutine function to TaskHandler."""
+
+    def __init__(self, func, task_type, concurrency=None, priority=None):
+        self.func = func
+        self.task_type = task_type
+        self.concurrency = concurrency
+        self.priority = priority
+        self.is_async = inspect.iscoroutinefunction(func)
+
+    def handle(self, context, md_file, metadata):
+        if self.is_async:
+            return asyncio.run(self.func(context, md_file, metadata))
+        return self.func(context, md_file, metadata)
+
+    async def handle_async(self, context, md_file, metadata, loop, executor):
+        if self.is_async:
+            return await self.func(context, md_file, metadata)
+        return await super().handle_async(context, md_file, metadata, loop, executor)
+
+
+class HandlerRegistry:
+    """Task type -> handler, with a fallback for types nobody registered."""
+
+    def __init__(self):
+        self._handlers = {}
+
+    def register(self, handler):
+        self._handlers[handler.task_type] = handler
+        return handler
+
+    def handler(self, task_type, concurrency=None, priority=None):
+        """Decorator registering a function (or coroutine function) for `task_type`."""
+        def decorate(func):
+            self.register(FunctionHandler(func, task_type, concurrency, priority))
+            return func
+        return decorate
+
+    def extend(self, other):
+        """Add (or override with) every handler registered in `other`."""
+        self._handlers.update(other._handlers)
+
+    def get(self, task_type):
+        return self._handlers.get(task_type) or self._handlers.get(DEFAULT_TYPE)
+
+    def types(self):
+        return sorted(self._handlers)
+
+    def priorities(self):
+        """Task type -> default scheduling priority, for handlers that declare one."""
+        return {task_type: handler.priority for task_type, handler in self._handlers.items()
+                if handler.priority}
+
+
+# Handlers registered by plugins before the orchestrator starts
+registry = HandlerRegistry()
+task_handler = registry.handler
+
+
+class TaskEngine:
+    """
+    Runs a batch of task files concurrently through their handlers.
+
+    `context` is passed to every handler (the orchestrator), `read_metadata` runs in the
+    executor to pick the handler, and `metrics` (optional) gets a task_total timer and
+    tasks_processed / tasks_failed counters plus one timer per task type. After run(),
+    `errors` maps each file whose handler raised (or that had no handler) to the error.
+
+    `before_task` (optional) is called with the task file right before its handler runs:
+    in the same executor job as a blocking handler, so it isn't called for tasks still
+    waiting for a thread. If it returns False the handler is not run and the file is listed
+    in `skipped`.
+
+    inline=True runs metadata reads and blocking handlers on the calling thread, one at a
+    time, instead of in the executor. cProfile only sees the thread it was started on, so
+    --profile needs this to see the handlers' work.
+    """
+
+    def __init__(self, registry, context, read_metadata, workers=4, metrics=None, before_task=None,
+                 inline=False):
+        self.registry = registry
+        self.context = context
+        self.read_metadata = read_metadata
+        self.workers = max(1, workers)
+        self.metrics = metrics
+        self.before_task = before_task
+        self.inline = inline
+        self.errors = {}
+        self.skipped = set()
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="task")
+        return self._executor
+
+    def run(self, md_files):
+        """Process `md_files`; returns one success flag per file, in order."""
+        self.errors = {}
+        self.skipped = set()
+        if not md_files:
+            return []
+        return asyncio.run(self.run_async(md_files))
+
+    async def run_async(self, md_files):
+        loop = asyncio.get_running_loop()
+        # Semaphores belong to the loop that uses them, so they are made per batch
+        limits = {}
+        for task_type in self.registry.types():
+            handler = self.registry.get(task_type)
+            if handler.concurrency:
+                limits[id(handler)] = asyncio.Semaphore(handler.concurrency)
+        return await asyncio.gather(*(self._run_task(md_file, loop, limits) for md_file in md_files))
+
+    async def _run_task(self, md_file, loop, limits):
+        started = time.perf_counter()
+        try:
+            metadata = await self._call(loop, self.read_metadata, md_file)
+            handler = self.registry.get(metadata.get('type'))
+            if handler is None:
+                print(f"✗ No handler for task type '{metadata.get('type')}': {md_file.name}")
+                self.errors[md_file] = f"no handler for task type '{metadata.get('type')}'"
+                processed = False
+            else:
+                limit = limits.get(id(handler))
+                if limit is None:
+                    processed = await self._dispatch(handler, md_file, metadata, loop)
+                else:
+                    async with limit:
+                        processed = await self._dispatch(handler, md_file, metadata, loop)
+                if self.metrics is not None and md_file not in self.skipped:
+                    self.metrics.observe(f"handler_{handler.task_type.replace('*', 'default')}",
+                                         time.perf_counter() - started)
+        except Exception as e:
+            print(f"✗ Error processing {md_file.name}: {e}")
+            self.errors[md_file] = e
+            processed = False
+
+        if md_file in self.skipped:
+            if self.metrics is not None:
+                self.metrics.incr("tasks_skipped")
+            return False
+        if self.metrics is not None:
+            self.metrics.observe("task_total", time.perf_counter() - started)
+            self.metrics.incr("tasks_processed" if processed else "tasks_failed")
+        return bool(processed)
+
+    @staticmethod
+    def _runs_in_executor(handler):
+        if isinstance(handler, FunctionHandler):
+            return not handler.is_async and type(handler).handle_async is FunctionHandler.handle_async
+        return type(handler).handle_async is TaskHandler.handle_async
+
+    async def _call(self, loop, func, *args):
+        if self.inline:
+            return func(*args)
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def _start_and_handle(self, handler, md_file, metadata):
+        if self.before_task is not None and not self.before_task(md_file):
+            return _SKIPPED
+        return handler.handle(self.context, md_file, metadata)
+
+    async def _dispatch(self, handler, md_file, metadata, loop):
+        if self._runs_in_executor(handler):
+            processed = await self._call(loop, self._start_and_handle, handler, md_file, metadata)
+        elif self.before_task is None or self.before_task(md_file):
+            # Coroutine handlers start on the loop straight away
+            processed = await handler.handle_async(self.context, md_file, metadata, loop, self.executor)
+        else:
+            processed = _SKIPPED
+        if processed is _SKIPPED:
+            self.skipped.add(md_file)
+            return False
+        return processed
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Task index
+SQLite index (.state/tasks.db) of task and plan files across Needs_Action/, Plans/, Done/,
+Archive/ and the vault root, with indexes on status, type and created. The watcher,
+orchestrator and skills update it as they create, move and archive files, so status
+queries don't need to open every plan. refresh() picks up files changed by anything else:
+the active folders (Needs_Action/, Plans/, the root) are listed and stat()ed every pass, so
+a plan edited in place in Obsidian shows its new status; Done/, Archive/ and Failed/ are
+listed only when they changed since the last pass (see dir_scanner.py).
+"""
+
+import fnmatch
+import posixpath
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from dir_scanner import DirectoryScanner, open_snapshots
+from metadata_cache import MetadataCache
+from vault_state import connect, state_dir
+
+
+DB_NAME = "tasks.db"
+
+# (folder, pattern, recursive, kind, active) scanned by rebuild() and refresh(); "" is the
+# vault root. Active folders hold files people edit in place, which keeps both the inode and
+# the folder mtime, so refresh() stat()s every file in them instead of trusting the snapshot.
+# Done/ and Archive/ may use the date-sharded layout (see archive_layout.py).
+INDEXED_LOCATIONS = (
+    ("Needs_Action", "*.md", False, "task", True),
+    ("Done", "*.md", True, "task", False),
+    ("Plans", "Plan_*.md", False, "plan", True),
+    ("", "Plan_*.md", False, "plan", True),
+    ("Archive", "*.md", True, "plan", False),
+    ("Failed", "*.md", False, "task", False),
+)
+
+
+class TaskIndex:
+    """Index of vault task/plan files keyed by their vault-relative path."""
+
+    def __init__(self, project_root, db_path=None):
+        self.project_root = Path(project_root).resolve()
+        self._lock = threading.RLock()
+        self.conn = connect(db_path or state_dir(self.project_root) / DB_NAME)
+        self._snapshots = None
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    path TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    folder TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    type TEXT,
+                    status TEXT,
+                    created TEXT,
+                    updated_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS tasks_folder_kind ON tasks(folder, kind);
+                CREATE INDEX IF NOT EXISTS tasks_status ON tasks(status);
+                CREATE INDEX IF NOT EXISTS tasks_type ON tasks(type);
+                CREATE INDEX IF NOT EXISTS tasks_created ON tasks(created);
+
+                CREATE TABLE IF NOT EXISTS index_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+
+    @classmethod
+    def for_vault(cls, project_root):
+        return cls(project_root)
+
+    def _relative(self, path):
+        path = Path(path)
+        if not path.is_absolute():
+            path = Path.cwd() / path
+        return path.resolve().relative_to(self.project_root).as_posix()
+
+    @staticmethod
+    def _folder_of(relative):
+        parent = Path(relative).parent.as_posix()
+        return "" if parent == "." else parent
+
+    @staticmethod
+    def _kind_of(relative):
+        name = Path(relative).name
+        return "plan" if name.startswith("Plan_") else "task"
+
+    def _row(self, relative, metadata, kind):
+        return (relative, Path(relative).name, self._folder_of(relative),
+                kind or self._kind_of(relative),
+                metadata.get("type"), metadata.get("status"),
+                metadata.get("created") or metadata.get("detected_at"),
+                datetime.utcnow().isoformat() + 'Z')
+
+    def upsert(self, path, metadata=None, kind=None):
+        """Add or refresh one file. `metadata` is its parsed frontmatter."""
+        row = self._row(self._relative(path), metadata or {}, kind)
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+
+    def move(self, old_path, new_path, **updates):
+        """
+        Record a move (and optional status/type changes) without re-reading the file.
+
+        A file the index didn't know about is added with just the given updates.
+        """
+        return self.move_many([(old_path, new_path, updates)]) == 1
+
+    def move_many(self, moves):
+        """
+        Record several (old_path, new_path, updates) moves in one transaction.
+
+        Returns how many of the moved files were already indexed.
+        """
+        known = 0
+        now = datetime.utcnow().isoformat() + 'Z'
+        with self._lock, self.conn:
+            for old_path, new_path, updates in moves:
+                old_relative = self._relative(old_path)
+                new_relative = self._relative(new_path)
+                row = self.conn.execute("SELECT * FROM tasks WHERE path = ?", (old_relative,)).fetchone()
+                if row is None:
+                    self.conn.execute("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                      self._row(new_relative, updates, updates.get("kind")))
+                    continue
+                known += 1
+                self.conn.execute("DELETE FROM tasks WHERE path = ?", (old_relative,))
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (new_relative, Path(new_relative).name, self._folder_of(new_relative),
+                     updates.get("kind", row["kind"]), updates.get("type", row["type"]),
+                     updates.get("status", row["status"]), updates.get("created", row["created"]),
+                     now),
+                )
+        return known
+
+    def remove(self, path):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM tasks WHERE path = ?", (self._relative(path),))
+
+    def query(self, folders=None, kind=None, status=None, task_type=None):
+        """Rows matching all given filters, oldest first."""
+        clauses, params = [], []
+        if folders is not None:
+            clauses.append(f"folder IN ({', '.join('?' for _ in folders)})")
+            params.extend(folders)
+        for column, value in (("kind", kind), ("status", status), ("type", task_type)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT * FROM tasks {where} ORDER BY created, name", params
+            ).fetchall()
+
+    def count(self, folders=None, kind=None, status=None, task_type=None):
+        return len(self.query(folders, kind, status, task_type))
+
+    def _scanners(self):
+        """(folder, scanner, kind, active) per indexed location, with snapshots kept in .state/snapshots.db."""
+        if self._snapshots is None:
+            self._snapshots = open_snapshots(self.project_root)
+        for folder, pattern, recursive, kind, active in INDEXED_LOCATIONS:
+            directory = self.project_root / folder if folder else self.project_root
+            yield folder, DirectoryScanner(directory, pattern, recursive, conn=self._snapshots,
+                                           scope=f"task_index:{folder}:{pattern}"), kind, active
+
+    def _read_rows(self, paths, kind, cache):
+        rows = {}
+        for path in paths:
+            try:
+                metadata = cache.get(path)
+            except (OSError, UnicodeDecodeError):
+                metadata = {}
+            relative = path.relative_to(self.project_root).as_posix()
+            rows[relative] = self._row(relative, metadata, kind)
+        return rows
+
+    def is_built(self):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM index_meta WHERE key = 'built_at'").fetchone()
+        return row is not None
+
+    def rebuild(self, metadata_cache=None):
+        """
+        Reconcile the index against the filesystem.
+
+        Returns (added_or_updated, removed).
+        """
+        cache = metadata_cache or MetadataCache.for_vault(self.project_root)
+        rows = {}
+
+        # A fresh listing of every location, which also becomes the baseline for refresh()
+        for _, scanner, kind, _ in self._scanners():
+            scanner.reset()
+            rows.update(self._read_rows(scanner.scan().added, kind, cache))
+
+        with self._lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                  list(rows.values()))
+            stale = [row["path"] for row in self.conn.execute("SELECT path FROM tasks")
+                     if row["path"] not in rows]
+            self.conn.executemany("DELETE FROM tasks WHERE path = ?", [(path,) for path in stale])
+            self.conn.execute("INSERT OR REPLACE INTO index_meta VALUES ('built_at', ?)",
+                              (datetime.utcnow().isoformat() + 'Z',))
+
+        if metadata_cache is None:
+            cache.close()
+        return len(rows), len(stale)
+
+    def refresh(self, metadata_cache=None):
+        """
+        Apply the files added, edited or removed since the last rebuild() or refresh().
+        Unchanged archive folders are not listed, so this is cheap enough to run before every
+        query.
+
+        Returns (added_or_updated, removed).
+        """
+        cache = metadata_cache or MetadataCache.for_vault(self.project_root)
+        rows, removed = {}, set()
+        for folder, scanner, kind, active in self._scanners():
+            changes = scanner.scan(full=active)
+            rows.update(self._read_rows(changes.added + changes.changed, kind, cache))
+            removed.update(path.relative_to(self.project_root).as_posix() for path in changes.removed)
+            # The orchestrator and skills index files directly, so a listed folder is also
+            # checked for index rows whose file is gone, not only for files that vanished
+            for listed in changes.listed:
+                indexed_folder = posixpath.join(folder, listed) if folder and listed else folder or listed
+                present = scanner.names_in(listed)
+                with self._lock:
+                    indexed = self.conn.execute("SELECT path, name FROM tasks WHERE folder = ?",
+                                                (indexed_folder,)).fetchall()
+                removed.update(row["path"] for row in indexed
+                               if row["name"] not in present and fnmatch.fnmatch(row["name"], scanner.pattern))
+
+        if rows or removed:
+            with self._lock, self.conn:
+                self.conn.executemany("DELETE FROM tasks WHERE path = ?", [(path,) for path in removed])
+                self.conn.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                      list(rows.values()))
+
+        if metadata_cache is None:
+            cache.close()
+        return len(rows), len(removed)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+            if self._snapshots is not None:
+                self._snapshots.close()
+                self._snapshots = None
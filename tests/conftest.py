@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The shared modules live in the repository root, as they do for scripts/
+sys.path.insert(0, str(ROOT))
+# Lets the tests import the orchestrator and watcher like the shared modules
+sys.path.insert(1, str(ROOT / "scripts"))
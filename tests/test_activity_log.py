@@ -0,0 +1,64 @@
+import os
+
+import activity_log
+from activity_log import ActivityJournal, log_activity, log_many, open_journal
+
+DASHBOARD = "# Dashboard\n\n## Recent Activity\n\n## Notes\n"
+
+
+def vault(tmp_path):
+    (tmp_path / "Dashboard.md").write_text(DASHBOARD, encoding='utf-8')
+    return tmp_path
+
+
+def count_fsyncs(monkeypatch):
+    calls = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(activity_log.os, "fsync", lambda fd: calls.append(fd) or real_fsync(fd))
+    return calls
+
+
+def test_append_many_follows_the_batch_schedule(tmp_path, monkeypatch):
+    fsyncs = count_fsyncs(monkeypatch)
+    journal = ActivityJournal(tmp_path / "activity.jsonl", fsync_every=5, fsync_interval=3600)
+
+    journal.append_many(["a", "b"])
+    journal.append("c")
+    assert fsyncs == [] and journal.unsynced == 3
+    journal.append_many(["d", "e"])
+    assert len(fsyncs) == 1 and journal.unsynced == 0
+
+    journal.append_many(["f"])
+    journal.close()
+    assert len(fsyncs) == 2
+    assert [entry["message"] for entry in journal.tail(10)] == ["a", "b", "c", "d", "e", "f"]
+
+
+def test_single_events_are_not_fsynced_one_by_one(tmp_path):
+    root = vault(tmp_path)
+    journal = open_journal(root)
+    journal.fsync_interval = 3600
+
+    for i in range(3):
+        assert log_activity(f"event {i}", root)
+    # The same journal carries the batch across calls
+    assert open_journal(root) is journal
+    assert journal.unsynced == 3
+    assert "event 2" in (root / "Dashboard.md").read_text(encoding='utf-8')
+
+    # What the exit hook does
+    activity_log._sync_journals()
+    assert journal.unsynced == 0
+
+
+def test_log_many_reopens_after_another_process_rolls_over(tmp_path):
+    root = vault(tmp_path)
+    log_many(["before"], root)
+
+    # Another process shrinks the journal with an atomic replace
+    other = ActivityJournal(root / "Logs" / "activity.jsonl", rollover_bytes=0)
+    other.rollover(keep=1)
+    log_many(["after"], root)
+
+    messages = [entry["message"] for entry in ActivityJournal(root / "Logs" / "activity.jsonl").tail(10)]
+    assert messages == ["before", "after"]
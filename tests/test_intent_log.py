@@ -0,0 +1,137 @@
+import pytest
+
+from frontmatter import read_metadata
+from intent_log import IntentLog
+from orchestrator import BronzeTierOrchestrator
+from vault_state import state_dir
+
+
+def intent(name):
+    return {"task": f"Needs_Action/{name}", "plan": f"Plans/Plan_{name}"}
+
+
+def write_task(root, name):
+    path = root / "Needs_Action" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("---\ntype: file_drop\noriginal_name: report.pdf\n"
+                    "detected_at: 2026-10-18T09:00:00Z\n---\n\n# Task\n", encoding='utf-8')
+    return path
+
+
+def test_pending_lists_open_intents_with_their_steps(tmp_path):
+    log = IntentLog(tmp_path / "intents.jsonl")
+    log.begin_many([intent("FILE_a.md"), intent("FILE_b.md"), intent("FILE_c.md")])
+    log.step("Needs_Action/FILE_a.md", started=True)
+    log.commit_many(["Needs_Action/FILE_b.md"])
+    log.abort_many(["Needs_Action/FILE_c.md"])
+
+    pending = log.pending()
+    assert [record["task"] for record in pending] == ["Needs_Action/FILE_a.md"]
+    assert pending[0]["started"] is True
+    assert pending[0]["plan"] == "Plans/Plan_FILE_a.md"
+    log.close()
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    log = IntentLog(tmp_path / "intents.jsonl")
+    log.begin_many([intent("FILE_a.md")])
+    log.close()
+    with open(tmp_path / "intents.jsonl", 'a', encoding='utf-8') as f:
+        f.write('{"op": "begin", "task": "Needs_Ac')
+
+    reopened = IntentLog(tmp_path / "intents.jsonl")
+    assert [record["task"] for record in reopened.pending()] == ["Needs_Action/FILE_a.md"]
+    reopened.close()
+
+
+def test_reset_waits_for_every_writer(tmp_path):
+    first = IntentLog(tmp_path / "intents.jsonl")
+    second = IntentLog(tmp_path / "intents.jsonl")
+    first.begin_many([intent("FILE_a.md")])
+    second.begin_many([intent("FILE_b.md")])
+    first.commit_many(["Needs_Action/FILE_a.md"])
+
+    # The other process's intent is still open
+    assert not first.reset_if_idle()
+    second.commit_many(["Needs_Action/FILE_b.md"])
+    assert first.reset_if_idle()
+    assert (tmp_path / "intents.jsonl").stat().st_size == 0
+    first.close()
+    second.close()
+
+
+@pytest.fixture
+def vault(tmp_path):
+    for folder in ("Needs_Action", "Done", "Plans"):
+        (tmp_path / folder).mkdir()
+    return tmp_path
+
+
+def crash_with(vault, intents, started=()):
+    """Leave an intent log behind as a process killed mid-batch would."""
+    log = IntentLog.for_vault(vault)
+    log.begin_many(intents)
+    for task in started:
+        log.step(task, started=True)
+    log.close()
+
+
+def recover(vault):
+    orchestrator = BronzeTierOrchestrator(vault)
+    try:
+        recovered = orchestrator.recover()
+        queued = [task.path for task in orchestrator.scheduler.pop_batch(10)]
+        return recovered, queued, orchestrator.scheduler.delayed
+    finally:
+        orchestrator.close()
+
+
+def test_recover_counts_an_attempt_only_for_started_tasks(vault):
+    started = write_task(vault, "FILE_a.md")
+    waiting = write_task(vault, "FILE_b.md")
+    (vault / "Plans" / "Plan_FILE_a.md").write_text("# Plan\n", encoding='utf-8')
+    crash_with(vault, [intent("FILE_a.md"), intent("FILE_b.md")], started=["Needs_Action/FILE_a.md"])
+
+    recovered, queued, delayed = recover(vault)
+
+    assert recovered == 2
+    metadata = read_metadata(started)
+    assert metadata["attempts"] == "1"
+    assert "interrupted" in metadata["last_error"]
+    assert "next_attempt_at" in metadata
+    # The started task waits out its backoff; the one that never ran goes straight back
+    assert delayed == 1
+    assert queued == [waiting]
+    assert "attempts" not in read_metadata(waiting)
+    assert (state_dir(vault) / "intents.jsonl").stat().st_size == 0
+
+
+def test_recover_finishes_moved_tasks_and_rolls_back_vanished_ones(vault):
+    (vault / "Done" / "FILE_a.md").write_text("---\ntype: file_drop\n---\n", encoding='utf-8')
+    (vault / "Plans" / "Plan_FILE_a.md").write_text("# Plan\n", encoding='utf-8')
+    orphan_plan = vault / "Plans" / "Plan_FILE_b.md"
+    orphan_plan.write_text("# Plan\n", encoding='utf-8')
+    crash_with(vault, [intent("FILE_a.md"), intent("FILE_b.md")], started=["Needs_Action/FILE_a.md"])
+
+    recovered, queued, delayed = recover(vault)
+
+    assert recovered == 2
+    assert queued == [] and delayed == 0
+    assert (vault / "Plans" / "Plan_FILE_a.md").exists()
+    assert not orphan_plan.exists()
+    assert "FILE_a.md" in (vault / "Dashboard.md").read_text(encoding='utf-8')
+    assert (state_dir(vault) / "intents.jsonl").stat().st_size == 0
+
+
+def test_recover_leaves_intents_of_a_live_process_alone(vault):
+    write_task(vault, "FILE_a.md")
+    crash_with(vault, [intent("FILE_a.md")], started=["Needs_Action/FILE_a.md"])
+    live = BronzeTierOrchestrator(vault)
+    try:
+        assert live.leases.claim("Needs_Action/FILE_a.md")
+        recovered, queued, delayed = recover(vault)
+    finally:
+        live.close()
+
+    assert recovered == 0
+    assert "attempts" not in read_metadata(vault / "Needs_Action" / "FILE_a.md")
@@ -0,0 +1,169 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from leases import HOST, LeaseManager, vault_lock
+
+
+def manager(tmp_path, ttl=60.0, owner="host:1"):
+    return LeaseManager(tmp_path / "leases", ttl=ttl, owner=owner)
+
+
+def test_claim_is_exclusive_until_released(tmp_path):
+    first, second = manager(tmp_path), manager(tmp_path, owner="host:2")
+
+    assert first.claim("Needs_Action/FILE_a.md")
+    assert not second.claim("Needs_Action/FILE_a.md")
+    assert first.holds("Needs_Action/FILE_a.md")
+    assert second.holder("Needs_Action/FILE_a.md")["owner"] == "host:1"
+
+    first.release("Needs_Action/FILE_a.md")
+    assert second.claim("Needs_Action/FILE_a.md")
+    assert not first.holds("Needs_Action/FILE_a.md")
+
+
+def test_expired_lease_is_broken_and_taken_over(tmp_path):
+    crashed, survivor = manager(tmp_path, ttl=0.05), manager(tmp_path, owner="host:2")
+    assert crashed.claim("task")
+    time.sleep(0.1)
+
+    assert crashed.holder("task") is None
+    assert survivor.claim("task")
+    assert survivor.holder("task")["owner"] == "host:2"
+
+
+def test_renew_extends_a_held_lease(tmp_path):
+    holder, other = manager(tmp_path, ttl=0.3), manager(tmp_path, owner="host:2")
+    assert holder.claim("task")
+    time.sleep(0.2)
+    assert holder.renew("task")
+    time.sleep(0.2)
+
+    # Past the original expiry, but inside the renewed one
+    assert not other.claim("task")
+
+
+def test_renew_fails_once_the_lease_was_taken_over(tmp_path):
+    slow, other = manager(tmp_path, ttl=0.05), manager(tmp_path, owner="host:2")
+    assert slow.claim("task")
+    time.sleep(0.1)
+    assert other.claim("task")
+
+    assert not slow.renew("task")
+    assert not slow.holds("task")
+    # The new holder's lease is untouched, and releasing ours doesn't remove it
+    slow.release("task")
+    assert other.holder("task")["owner"] == "host:2"
+
+
+def test_renew_does_not_revive_an_expired_lease(tmp_path):
+    slow = manager(tmp_path, ttl=0.05)
+    assert slow.claim("task")
+    time.sleep(0.1)
+
+    # Someone may be breaking it right now, so it counts as lost
+    assert not slow.renew("task")
+    assert not slow.holds("task")
+
+
+def test_heartbeat_keeps_leases_alive(tmp_path):
+    holder, other = manager(tmp_path, ttl=0.2), manager(tmp_path, owner="host:2")
+    assert holder.claim("task")
+    holder.start_heartbeat(interval=0.05)
+    try:
+        time.sleep(0.5)
+        assert not other.claim("task")
+    finally:
+        holder.stop_heartbeat()
+    assert holder.holds("task")
+
+
+def test_break_backs_off_when_a_fresh_lease_replaced_the_stale_one(tmp_path):
+    first, second = manager(tmp_path, ttl=0.05), manager(tmp_path, owner="host:2")
+    path = first._path("task")
+    assert first.claim("task")
+    stale = first._read(path)
+    time.sleep(0.1)
+
+    # Another process broke the stale lease and claimed it after we read it
+    assert second.claim("task")
+    assert not first._break(path, stale)
+    assert json.loads(path.read_text())["owner"] == "host:2"
+    assert not list(path.parent.glob("*.guard"))
+
+
+def test_lease_is_not_broken_or_renewed_while_guarded(tmp_path):
+    holder, other = manager(tmp_path, ttl=0.05), manager(tmp_path, owner="host:2")
+    path = holder._path("task")
+    assert holder.claim("task")
+    time.sleep(0.1)
+
+    # Another process is halfway through breaking or renewing it
+    guard = path.with_name(path.name + ".guard")
+    guard.touch()
+    assert not other.claim("task")
+    assert json.loads(path.read_text())["owner"] == "host:1"
+    guard.unlink()
+    assert other.claim("task")
+
+
+def test_stale_guard_is_cleared(tmp_path):
+    holder = manager(tmp_path)
+    path = holder._path("task")
+    assert holder.claim("task")
+    guard = path.with_name(path.name + ".guard")
+    guard.touch()
+    os.utime(guard, (time.time() - 60, time.time() - 60))
+
+    assert holder.renew("task")
+    assert not guard.exists()
+
+
+def test_torn_lease_file_is_judged_by_age(tmp_path):
+    holder = manager(tmp_path, ttl=0.05)
+    path = holder._path("task")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+
+    assert not holder.claim("task")
+    time.sleep(0.1)
+    assert holder.claim("task")
+
+
+def test_vault_lock_times_out_while_held(tmp_path):
+    with vault_lock(tmp_path, "dashboard"):
+        contender = vault_lock(tmp_path, "dashboard", timeout=0.05)
+        try:
+            contender.acquire()
+        except TimeoutError:
+            pass
+        else:
+            raise AssertionError("lock acquired while held")
+    with vault_lock(tmp_path, "dashboard", timeout=0.05):
+        pass
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="liveness is only probed on POSIX")
+def test_lease_of_a_killed_process_is_reclaimed_at_once(tmp_path):
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    crashed = manager(tmp_path, owner=f"{HOST}:{child.pid}")
+    survivor = manager(tmp_path, owner="host:2")
+    assert crashed.claim("task")
+    assert not survivor.claim("task")
+
+    child.kill()
+    child.wait()
+    # Well inside the ttl, but its owner is gone
+    assert crashed.holder("task") is None
+    assert survivor.claim("task")
+    assert survivor.holder("task")["owner"] == "host:2"
+
+
+def test_leases_of_other_hosts_are_left_to_expire(tmp_path):
+    remote = manager(tmp_path, owner="elsewhere:999999999")
+    assert remote.claim("task")
+    assert not manager(tmp_path, owner="host:2").claim("task")
@@ -0,0 +1,89 @@
+import pytest
+
+from frontmatter import read_metadata
+from retry_policy import MAX_DELAY, RetryPolicy, error_summary, format_utc
+
+NOW = 1_800_000_000.0
+
+
+def policy(tmp_path, **kwargs):
+    return RetryPolicy(tmp_path, jitter=0, clock=lambda: NOW, **kwargs)
+
+
+def write_task(root, name="FILE_report.pdf.md"):
+    path = root / "Needs_Action" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("---\ntype: file_drop\nstatus: pending\n---\n\n# Task\nbody stays\n", encoding='utf-8')
+    return path
+
+
+def test_backoff_doubles_from_thirty_seconds_up_to_six_hours(tmp_path):
+    retry = policy(tmp_path)
+
+    assert [retry.delay(attempts) for attempts in range(1, 6)] == [30, 60, 120, 240, 480]
+    assert retry.delay(10) == 30 * 2 ** 9
+    assert retry.delay(11) == MAX_DELAY == 6 * 60 * 60
+    assert retry.delay(40) == MAX_DELAY
+
+
+def test_jitter_stays_within_bounds(tmp_path):
+    retry = RetryPolicy(tmp_path, jitter=0.1)
+    delays = [retry.delay(3) for _ in range(200)]
+    assert all(108 <= delay <= 132 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_failure_is_recorded_in_the_frontmatter(tmp_path):
+    retry = policy(tmp_path)
+    task = write_task(tmp_path)
+
+    assert retry.record_failure(task, PermissionError("Permission denied: 'Plans/x.md'")) == task
+    metadata = read_metadata(task)
+    assert metadata["attempts"] == "1"
+    assert metadata["last_error"] == "Permission denied: 'Plans/x.md'"
+    assert metadata["last_failed_at"] == format_utc(NOW)
+    assert metadata["next_attempt_at"] == format_utc(NOW + 30)
+    assert metadata["status"] == "pending"
+
+    retry.record_failure(task, "second")
+    metadata = read_metadata(task)
+    assert metadata["attempts"] == "2"
+    assert metadata["next_attempt_at"] == format_utc(NOW + 60)
+    assert task.read_text(encoding='utf-8').endswith("# Task\nbody stays\n")
+
+
+def test_dead_letters_to_failed_after_max_attempts(tmp_path):
+    retry = policy(tmp_path, max_attempts=3)
+    task = write_task(tmp_path)
+
+    for _ in range(2):
+        assert retry.record_failure(task, "boom") == task
+    failed = retry.record_failure(task, ValueError("bad input"))
+
+    assert failed == tmp_path / "Failed" / task.name
+    assert not task.exists()
+    metadata = read_metadata(failed)
+    assert metadata["attempts"] == "3"
+    assert metadata["status"] == "failed"
+    assert metadata["last_error"] == "bad input"
+    assert metadata["last_failed_at"] == format_utc(NOW)
+
+
+def test_attempts_count_ignores_garbage():
+    assert RetryPolicy.attempts({}) == 0
+    assert RetryPolicy.attempts({"attempts": "4"}) == 4
+    assert RetryPolicy.attempts({"attempts": "many"}) == 0
+
+
+@pytest.mark.parametrize("error, summary", [
+    (None, "task handler reported failure"),
+    (KeyError(), "KeyError"),
+    ("line one\n  line two", "line one line two"),
+])
+def test_error_summary_is_one_line(error, summary):
+    assert error_summary(error) == summary
+
+
+def test_error_summary_is_truncated():
+    summary = error_summary("x" * 500)
+    assert len(summary) == 200 and summary.endswith("…")
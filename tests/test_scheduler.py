@@ -0,0 +1,153 @@
+from retry_policy import format_utc
+from scheduler import DEFAULT_SLA, TaskScheduler
+
+NOW = 1_800_000_000.0
+
+
+class Clock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def at(offset):
+    """Frontmatter timestamp `offset` seconds from NOW."""
+    return format_utc(NOW + offset)
+
+
+def scheduler(tasks, clock=None, type_priorities=None):
+    """A scheduler over {path: frontmatter}."""
+    return TaskScheduler(tasks.__getitem__, type_priorities, clock=clock or Clock())
+
+
+def order(sched, size=100):
+    return [task.path for task in sched.pop_batch(size)]
+
+
+def test_earliest_deadline_first_across_priorities():
+    tasks = {
+        "low_old": {"priority": "low", "detected_at": at(-7 * 86400 + 60)},
+        "normal": {"detected_at": at(-60)},
+        "urgent": {"priority": "urgent", "detected_at": at(0)},
+        "high": {"priority": "high", "detected_at": at(-30 * 60)},
+    }
+    sched = scheduler(tasks)
+    sched.push_many(tasks)
+
+    # Deadlines: low_old +60s, urgent +5m, high +30m, normal +24h-60s
+    assert order(sched) == ["low_old", "urgent", "high", "normal"]
+
+
+def test_numeric_priorities_and_type_defaults():
+    tasks = {
+        "email": {"type": "email", "detected_at": at(0)},
+        "zero": {"priority": "0", "detected_at": at(0)},
+        "drop": {"type": "file_drop", "detected_at": at(0)},
+    }
+    sched = scheduler(tasks, type_priorities={"email": "high"})
+    sched.push_many(["drop", "email", "zero"])
+
+    assert order(sched) == ["zero", "email", "drop"]
+
+
+def test_due_overrides_a_later_sla_deadline():
+    tasks = {
+        "urgent": {"priority": "urgent", "detected_at": at(0)},
+        "due_soon": {"priority": "low", "detected_at": at(0), "due": at(60)},
+        "due_late": {"priority": "urgent", "detected_at": at(0), "due": at(86400)},
+    }
+    sched = scheduler(tasks)
+    sched.push_many(tasks)
+
+    assert sched.classify("due_soon").due == NOW + 60
+    # A due date later than the SLA doesn't relax it
+    assert sched.classify("due_late").due == NOW + DEFAULT_SLA["urgent"]
+    assert order(sched) == ["due_soon", "urgent", "due_late"]
+
+
+def test_low_priority_ages_past_a_stream_of_urgent_tasks():
+    clock = Clock()
+    tasks = {"low": {"priority": "low", "detected_at": at(0)}}
+    sched = scheduler(tasks, clock)
+    sched.push("low")
+
+    dispatched = []
+    for minute in range(8 * 24 * 60):
+        clock.now = NOW + minute * 60
+        name = f"urgent_{minute}"
+        tasks[name] = {"priority": "urgent", "detected_at": format_utc(clock.now)}
+        sched.push(name)
+        dispatched.extend(order(sched, size=1))
+        if "low" in dispatched:
+            break
+
+    # Dispatched once its 7-day deadline came before the newest urgent ones', not never
+    assert "low" in dispatched
+    assert clock.now - NOW <= DEFAULT_SLA["low"]
+
+
+def test_retries_wait_in_the_delayed_heap_until_due():
+    clock = Clock()
+    tasks = {
+        "ready": {"detected_at": at(-60)},
+        "retry_later": {"priority": "urgent", "detected_at": at(-60), "next_attempt_at": at(120)},
+        "retry_sooner": {"priority": "urgent", "detected_at": at(-60), "next_attempt_at": at(30)},
+        "retry_due": {"detected_at": at(-120), "next_attempt_at": at(-1)},
+    }
+    sched = scheduler(tasks, clock)
+    sched.push_many(tasks)
+
+    assert sched.delayed == 2
+    assert sched.next_release() == NOW + 30
+    assert order(sched) == ["retry_due", "ready"]
+
+    clock.now = NOW + 30
+    assert order(sched) == ["retry_sooner"]
+    assert sched.next_release() == NOW + 120
+
+    clock.now = NOW + 200
+    assert order(sched) == ["retry_later"]
+    assert sched.delayed == 0 and sched.next_release() is None
+
+
+def test_arrivals_are_slotted_in_between_batches():
+    tasks = {f"normal_{i}": {"detected_at": at(i)} for i in range(4)}
+    sched = scheduler(tasks)
+    sched.push_many(tasks)
+
+    assert order(sched, size=2) == ["normal_0", "normal_1"]
+    tasks["urgent"] = {"priority": "urgent", "detected_at": at(10)}
+    sched.push("urgent")
+    assert order(sched, size=2) == ["urgent", "normal_2"]
+    assert order(sched, size=2) == ["normal_3"]
+
+
+def test_a_queued_path_is_pushed_once():
+    tasks = {"task": {"detected_at": at(0)}}
+    sched = scheduler(tasks)
+    sched.push("task")
+    assert sched.push("task") is None
+    assert len(sched) == 1
+
+    assert order(sched) == ["task"]
+    # Dispatched, so it may be queued again
+    assert sched.push("task") is not None
+
+
+def test_report_counts_latency_and_late_dispatches():
+    clock = Clock()
+    tasks = {
+        "late": {"priority": "urgent", "detected_at": at(-600)},
+        "on_time": {"priority": "urgent", "detected_at": at(-60)},
+    }
+    sched = scheduler(tasks, clock)
+    sched.push_many(tasks)
+    order(sched)
+
+    report = sched.report(reset=True)
+    assert report["urgent"]["dispatched"] == 2
+    assert report["urgent"]["late"] == 1
+    assert report["urgent"]["max_s"] == 600
+    assert sched.report() == {}
@@ -2,22 +2,29 @@
 """
 update-dashboard-activity skill
 Appends a new line to Dashboard.md under ## Recent Activity with timestamp and short description.
+Pass --profile to run under cProfile.
 """
 
 import sys
 from datetime import datetime
 from pathlib import Path
 
+# Imported first: the startup stage it records includes the imports below
+from instrumentation import Metrics, profile_call
+from activity_log import log_activity
+
 
 def update_dashboard_activity(description: str):
     """
-    Appends a new line to Dashboard.md under ## Recent Activity with timestamp and description.
+    Records an activity event and refreshes ## Recent Activity in Dashboard.md with timestamp and description.
 
     Args:
         description (str): Short description of what was processed
     """
     project_root = Path.cwd()
     dashboard_path = project_root / "Dashboard.md"
+    metrics = Metrics("update_dashboard_activity")
+    metrics.mark_ready()
 
     # Check if Dashboard.md exists
     if not dashboard_path.exists():
@@ -27,55 +34,30 @@ def update_dashboard_activity(description: str):
     # Get current timestamp
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
 
-    # Read existing content
-    with open(dashboard_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Find the ## Recent Activity section
-    if "## Recent Activity" not in content:
+    # Record the event in the activity journal and render the newest entries into the dashboard
+    with metrics.timer("dashboard_update"):
+        logged = log_activity(description, project_root)
+    metrics.flush(project_root)
+    if not logged:
         print(f"Error: ## Recent Activity section not found in {dashboard_path}")
         return False
 
-    # Prepare the new activity line
-    new_activity = f"   - [{timestamp}] {description}\n"
-
-    # Split content to insert the new activity line
-    lines = content.split('\n')
-    new_content_lines = []
-
-    for i, line in enumerate(lines):
-        new_content_lines.append(line)
-        if line.strip() == "## Recent Activity":
-            # Add the new activity right after the header
-            # Check if there are already activities below
-            if i + 1 < len(lines) and lines[i + 1].strip() != "":
-                # Insert before the next non-empty line
-                # Find where the activity list ends
-                insert_idx = i + 1
-                while insert_idx < len(lines) and lines[insert_idx].startswith("   - "):
-                    insert_idx += 1
-                # Insert at the end of the existing list
-                new_content_lines = new_content_lines[:insert_idx] + [new_activity.rstrip()] + new_content_lines[insert_idx:]
-            else:
-                # If no activities exist yet, just add the new one
-                new_content_lines.append(new_activity.rstrip())
-
-    # Write updated content back to file
-    with open(dashboard_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(new_content_lines))
-
     print(f"Activity logged: [{timestamp}] {description}")
     return True
 
 
 def main():
-    if len(sys.argv) < 2:
+    args = [arg for arg in sys.argv[1:] if arg != "--profile"]
+    if not args:
         print("Usage: python update-dashboard-activity.py \"description of what was processed\"")
         print("Example: python update-dashboard-activity.py \"Processed FILE_test.txt -> plan created and moved to Done\"")
         sys.exit(1)
 
-    description = sys.argv[1]
-    update_dashboard_activity(description)
+    description = args[0]
+    if "--profile" in sys.argv[1:]:
+        profile_call(update_dashboard_activity, Path.cwd(), "update_dashboard_activity", description)
+    else:
+        update_dashboard_activity(description)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Vault state
+Location and connection helpers for the SQLite indexes kept under .state/ in the vault.
+The folder is hidden so Obsidian ignores it; everything in it can be rebuilt from the vault.
+"""
+
+import sqlite3
+from pathlib import Path
+
+
+STATE_DIR_NAME = ".state"
+
+
+def state_dir(project_root):
+    """Return the vault's .state/ folder, creating it if needed."""
+    path = Path(project_root) / STATE_DIR_NAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def connect(db_path):
+    """Open a SQLite database shared between threads and processes."""
+    conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn